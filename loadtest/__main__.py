@@ -0,0 +1,110 @@
+"""Нагрузочный тест вебхуков Алисы, Маруси и Салюта
+
+Запуск в том же процессе, с SQLite и локальным API расписания:
+    python -m loadtest --conversations 2000 --concurrency 500 --output report.json
+
+Запуск против запущенного сервера (он должен смотреть на API расписания с теми же группами):
+    python -m loadtest --url http://localhost:8000 --output report.json
+
+Сравнение с отчётом прошлого коммита:
+    python -m loadtest --baseline old.json --output new.json
+
+Медленное и нестабильное API расписания:
+    python -m loadtest --upstream-latency lognormal:300:0.8 --upstream-error-rate 0.05 --upstream-timeout-rate 0.01
+"""
+import argparse
+import asyncio
+import platform
+import subprocess
+import sys
+
+import httpx
+import orjson
+
+from .conversations import PLATFORMS, generate
+from .report import compare
+from .runner import InProcessTarget, run_load
+from .schedule_api import ScheduleApiStandIn, add_fault_arguments, faults_from_args
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m loadtest', description='Нагрузочный тест вебхуков навыка')
+    parser.add_argument('--conversations', type=int, default=2000, help='количество разговоров')
+    parser.add_argument('--concurrency', type=int, default=500, help='одновременных разговоров')
+    parser.add_argument('--seed', type=int, default=1, help='начальное значение генератора разговоров')
+    parser.add_argument('--groups', type=int, default=500, help='количество групп в API расписания')
+    parser.add_argument('--platforms', default=','.join(PLATFORMS), help='платформы через запятую')
+    parser.add_argument('--returning', type=float, default=0.5, help='доля вернувшихся пользователей')
+    parser.add_argument('--think-time', type=float, default=0.0, help='пауза между репликами, с')
+    parser.add_argument('--timeout', type=float, default=10.0, help='время ожидания ответа, с')
+    parser.add_argument('--url', help='адрес запущенного сервера вместо приложения в том же процессе')
+    parser.add_argument('--output', help='файл для отчёта JSON, по умолчанию stdout')
+    parser.add_argument('--baseline', help='отчёт JSON для сравнения')
+    parser.add_argument('--upstream-fixtures', help='каталог фикстур API расписания')
+    add_fault_arguments(parser, prefix='upstream-')
+    return parser.parse_args()
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+async def main(args: argparse.Namespace) -> dict:
+    platforms = tuple(name.strip() for name in args.platforms.split(',') if name.strip())
+    faults = faults_from_args(args, prefix='upstream-')
+    api = ScheduleApiStandIn(args.groups, args.upstream_fixtures, faults)
+    conversations = generate(args.conversations, args.seed, api.groups, platforms, args.returning)
+
+    target = None
+    if args.url is None:
+        target = InProcessTarget(api)
+        client = await target.start(conversations, args.concurrency)
+    else:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+
+    try:
+        recorder, duration = await run_load(client, conversations, args.concurrency, args.think_time, args.timeout)
+        server = target.stats if target is not None else None
+    finally:
+        await client.aclose()
+        if target is not None:
+            await target.stop()
+
+    return {
+        'config': {
+            'conversations': args.conversations,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+            'groups': args.groups,
+            'platforms': list(platforms),
+            'returning': args.returning,
+            'think_time': args.think_time,
+            'target': args.url or 'in-process',
+            'upstream': faults.describe() if args.url is None else None,
+            'commit': current_commit(),
+            'python': platform.python_version(),
+        },
+        **recorder.report(duration),
+        'server': server,
+    }
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    report = asyncio.run(main(args))
+    output = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+    if args.output:
+        with open(args.output, 'wb') as file:
+            file.write(output + b'\n')
+    else:
+        sys.stdout.write(output.decode() + '\n')
+
+    if args.baseline:
+        with open(args.baseline, 'rb') as file:
+            baseline = orjson.loads(file.read())
+        print('\n'.join(compare(baseline, report)), file=sys.stderr)
@@ -0,0 +1,284 @@
+import random
+
+from typing import Any, NamedTuple, Optional, Union
+
+from src.core.dialog.reply import LOADING_TEXT, SCHEDULE_UNAVAILABLE_TEXT
+from src.core.sber import intents as sber_intents
+from src.core.yandex import intents as yandex_intents
+
+PLATFORMS = ('alice', 'marusia', 'sber')
+
+PLATFORM_PATHS = {
+    'alice': '/api/v1/alice',
+    'marusia': '/api/v1/marusia',
+    'sber': '/api/v1/sber',
+}
+
+# Платформа в базе данных пользователей
+PLATFORM_NAMES = {
+    'alice': 'YANDEX',
+    'marusia': 'VK',
+    'sber': 'SBER',
+}
+
+# Ответы, которыми навык сообщает, что не смог ответить. Сцена у них обычная,
+# поэтому в отчёте они отличаются по тексту и считаются ошибками
+FAILED_REPLIES = {
+    LOADING_TEXT: 'loading',
+    SCHEDULE_UNAVAILABLE_TEXT: 'unavailable',
+}
+
+WELCOME = 'welcome'
+GROUP_SET = 'group_set'
+GROUP_CONFIRM = 'group_confirm'
+GROUP_REJECT = 'group_reject'
+SCHEDULE_COUNT = 'schedule_count'
+SCHEDULE_LIST = 'schedule_list'
+HELP = 'help'
+
+# День расписания: число - смещение от сегодня, строка - день недели
+DAYS: tuple[Union[int, str], ...] = (0, 1, 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday')
+
+DAY_WORDS = {
+    0: ('сегодня', 'на сегодня'),
+    1: ('завтра', 'на завтра'),
+    'Monday': ('в понедельник', 'на понедельник'),
+    'Tuesday': ('во вторник', 'на вторник'),
+    'Wednesday': ('в среду', 'на среду'),
+    'Thursday': ('в четверг', 'на четверг'),
+    'Friday': ('в пятницу', 'на пятницу'),
+    'Saturday': ('в субботу', 'на субботу'),
+}
+
+ALICE_INTENTS = {
+    GROUP_SET: yandex_intents.USER_STUDY_GROUP_SET,
+    GROUP_CONFIRM: yandex_intents.CONFIRM,
+    GROUP_REJECT: yandex_intents.REJECT,
+    SCHEDULE_COUNT: yandex_intents.SCHEDULE_COUNT,
+    SCHEDULE_LIST: yandex_intents.SCHEDULE_LIST,
+    HELP: yandex_intents.HELP,
+}
+
+SBER_INTENTS = {
+    WELCOME: sber_intents.RUN_APP,
+    GROUP_SET: sber_intents.USER_STUDY_GROUP_SET,
+    GROUP_CONFIRM: sber_intents.CONFIRM,
+    GROUP_REJECT: sber_intents.REJECT,
+    SCHEDULE_COUNT: sber_intents.SCHEDULE_COUNT,
+    SCHEDULE_LIST: sber_intents.SCHEDULE_LIST,
+    HELP: sber_intents.HELP[0],
+}
+
+
+# Сцена, которой навык должен ответить на шаг разговора. Приветствие зависит от того, знает ли навык пользователя
+STEP_SCENES = {
+    GROUP_SET: 'GroupManager',
+    GROUP_CONFIRM: 'GroupManager',
+    GROUP_REJECT: 'GroupManager',
+    SCHEDULE_COUNT: 'Schedule',
+    SCHEDULE_LIST: 'Schedule',
+    HELP: 'Helper',
+}
+
+
+class Step(NamedTuple):
+    name: str
+    text: str
+    day: Optional[Union[int, str]] = None
+    # Ожидаемая сцена ответа, None - не проверяется
+    scene: Optional[str] = None
+
+
+class Conversation(NamedTuple):
+    platform: str
+    user_id: str
+    group: str
+    # Пользователь уже есть в базе с группой group
+    returning: bool
+    steps: tuple[Step, ...]
+
+
+def group_utterance(group: str) -> str:
+    """Группа так, как её распознаёт голосовой ассистент: "икбо - 01 - 20" """
+    return group.lower().replace('-', ' - ')
+
+
+def schedule_step(name: str, day: Union[int, str]) -> Step:
+    count_words, list_words = DAY_WORDS[day]
+
+    if name == SCHEDULE_COUNT:
+        return Step(name, f'сколько пар {count_words}', day, STEP_SCENES[name])
+    return Step(name, f'расписание {list_words}', day, STEP_SCENES[name])
+
+
+def dialog_step(name: str, text: str) -> Step:
+    return Step(name, text, scene=STEP_SCENES[name])
+
+
+def generate(count: int, seed: int, groups: list[str], platforms: tuple[str, ...] = PLATFORMS,
+             returning_share: float = 0.5) -> list[Conversation]:
+    """Генерирует одни и те же разговоры для одинаковых аргументов
+
+    Новые пользователи называют группу (иногда с ошибкой и повтором), подтверждают её
+    и спрашивают расписание. Вернувшиеся пользователи сразу спрашивают расписание,
+    часть разговоров - просьба о помощи.
+
+    Args:
+        count (int): Количество разговоров.
+        seed (int): Начальное значение генератора случайных чисел.
+        groups (list[str]): Группы, которые знает API расписания.
+        platforms (tuple[str, ...]): Платформы, между которыми делятся разговоры.
+        returning_share (float): Доля вернувшихся пользователей.
+    """
+    rng = random.Random(seed)
+    conversations = []
+
+    for index in range(count):
+        platform = platforms[index % len(platforms)]
+        group = rng.choice(groups)
+        returning = rng.random() < returning_share
+        steps = [Step(WELCOME, '', scene='WelcomeDefault' if returning else 'Welcome')]
+
+        if not returning:
+            if rng.random() < 0.1:
+                steps.append(dialog_step(HELP, 'помощь'))
+
+            steps.append(dialog_step(GROUP_SET, group_utterance(group)))
+            if rng.random() < 0.2:
+                steps.append(dialog_step(GROUP_REJECT, 'нет'))
+                steps.append(dialog_step(GROUP_SET, group_utterance(group)))
+            steps.append(dialog_step(GROUP_CONFIRM, 'да'))
+
+        for _ in range(rng.randint(1, 3)):
+            steps.append(schedule_step(rng.choice((SCHEDULE_COUNT, SCHEDULE_LIST)), rng.choice(DAYS)))
+
+        conversations.append(Conversation(platform, f'loadtest-{seed}-{index}', group, returning, tuple(steps)))
+
+    return conversations
+
+
+def _day_nlu(day: Union[int, str], slot: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    if isinstance(day, int):
+        entities = [{'type': 'YANDEX.DATETIME', 'value': {'day': day, 'day_is_relative': True}}]
+        return {slot: {'type': 'YANDEX.DATETIME', 'value': 'YandexDatetime'}}, entities
+
+    return {slot: {'type': 'DayOfWeek', 'value': day}}, []
+
+
+def alice_payload(conversation: Conversation, message_id: int, step: Step, state: dict[str, Any]) -> dict[str, Any]:
+    intents: dict[str, Any] = {}
+    entities: list[dict[str, Any]] = []
+    intent = ALICE_INTENTS.get(step.name)
+
+    if step.day is not None:
+        # Количество пар приходит в слоте "type", список пар - в слоте "when"
+        slots, entities = _day_nlu(step.day, 'type' if step.name == SCHEDULE_COUNT else 'when')
+        intents[intent] = {'slots': slots}
+    elif intent is not None:
+        intents[intent] = {'slots': {}}
+
+    user_id = conversation.user_id
+    return {
+        'meta': {
+            'locale': 'ru-RU',
+            'timezone': 'Europe/Moscow',
+            'client_id': 'ru.yandex.searchplugin/7.16 (none none; android 4.4.2)',
+            'interfaces': {'screen': {}},
+        },
+        'version': '1.0',
+        'session': {
+            'message_id': message_id,
+            'new': message_id == 0,
+            'session_id': f'{user_id}-session',
+            'skill_id': 'loadtest',
+            'user': {'user_id': user_id},
+            'application': {'application_id': user_id},
+            'user_id': user_id,
+        },
+        'request': {
+            'command': step.text,
+            'original_utterance': step.text,
+            'nlu': {'tokens': step.text.split(), 'entities': entities, 'intents': intents},
+            'markup': {'dangerous_context': False},
+            'type': 'SimpleUtterance',
+        },
+        'state': {'session': state, 'user': {}, 'application': {}},
+    }
+
+
+def marusia_payload(conversation: Conversation, message_id: int, step: Step, state: dict[str, Any]) -> dict[str, Any]:
+    user_id = conversation.user_id
+    return {
+        'meta': {'client_id': 'MailRu-VC/1.0', 'locale': 'ru_RU', 'timezone': 'Europe/Moscow', 'interfaces': {'screen': {}}},
+        'version': '1.0',
+        'session': {
+            'session_id': f'{user_id}-session',
+            'user_id': user_id,
+            'skill_id': 'loadtest',
+            'new': message_id == 0,
+            'message_id': message_id,
+            'application': {'application_id': user_id, 'application_type': 'mobile'},
+        },
+        'request': {
+            'command': step.text,
+            'original_utterance': step.text,
+            'type': 'SimpleUtterance',
+            'nlu': {'tokens': step.text.split(), 'entities': []},
+        },
+        'state': {'session': state, 'user': {}},
+    }
+
+
+def sber_payload(conversation: Conversation, message_id: int, step: Step, state: dict[str, Any]) -> dict[str, Any]:
+    intent = SBER_INTENTS.get(step.name, '')
+    intents: dict[str, Any] = {}
+    entities: list[dict[str, Any]] = []
+
+    if step.day is not None:
+        slots, entities = _day_nlu(step.day, 'when')
+        intents[intent] = {'slots': slots}
+
+    return {
+        'messageName': 'MESSAGE_TO_SKILL',
+        'sessionId': f'{conversation.user_id}-session',
+        'messageId': message_id,
+        'uuid': {'userId': conversation.user_id, 'userChannel': 'B2C', 'sub': conversation.user_id},
+        'payload': {
+            'projectName': 'loadtest',
+            'device': {'platformType': 'ANDROID', 'surface': 'COMPANION'},
+            'intent': intent,
+            'new_session': message_id == 0,
+            'message': {'original_text': step.text},
+        },
+        'request': {
+            'command': step.text,
+            'nlu': {'intents': intents, 'entities': entities},
+        },
+    }
+
+
+PAYLOADS = {
+    'alice': alice_payload,
+    'marusia': marusia_payload,
+    'sber': sber_payload,
+}
+
+
+def response_scene(platform: str, body: dict[str, Any]) -> Optional[str]:
+    """Сцена, которой ответил навык"""
+    if platform == 'sber':
+        return body.get('payload', {}).get('intent')
+    return body.get('session_state', {}).get('scene')
+
+
+def response_text(platform: str, body: dict[str, Any]) -> Optional[str]:
+    """Текст ответа навыка"""
+    if platform == 'sber':
+        items = body.get('payload', {}).get('items') or [{}]
+        return items[0].get('bubble', {}).get('text')
+    return body.get('response', {}).get('text')
+
+
+def failed_reply(platform: str, body: dict[str, Any]) -> Optional[str]:
+    """Метка ответа, которым навык сообщил, что не смог ответить, или None для обычного ответа"""
+    return FAILED_REPLIES.get(response_text(platform, body))
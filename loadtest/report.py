@@ -0,0 +1,104 @@
+import math
+
+from collections import Counter
+from typing import Any, Optional
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """Перцентиль по ближайшему рангу, values должны быть отсортированы"""
+    if not values:
+        return 0.0
+
+    return values[max(math.ceil(rank / 100 * len(values)) - 1, 0)]
+
+
+class Series:
+    """Задержки и ошибки одной группы запросов
+
+    Ответ не той сценой, которую ожидает шаг разговора, считается отдельно от ошибок:
+    навык ответил, но диалог пошёл не туда. Ответы о том, что расписание загружается
+    или недоступно, считаются ошибками и попадают в responses под своей меткой.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.unexpected = 0
+        self.scenes: Counter[str] = Counter()
+
+    def add(self, latency: float, scene: Optional[str], ok: bool, expected: Optional[str] = None) -> None:
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+        elif expected is not None and scene != expected:
+            self.unexpected += 1
+        self.scenes[scene or 'error'] += 1
+
+    def summary(self, duration: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+
+        return {
+            'requests': requests,
+            'errors': self.errors,
+            'error_rate': round(self.errors / requests, 6) if requests else 0.0,
+            'unexpected': self.unexpected,
+            'unexpected_rate': round(self.unexpected / requests, 6) if requests else 0.0,
+            'rps': round(requests / duration, 2) if duration else 0.0,
+            'latency_ms': {
+                **{f'p{rank}': round(percentile(latencies, rank) * 1000, 3) for rank in PERCENTILES},
+                'mean': round(sum(latencies) / requests * 1000, 3) if requests else 0.0,
+                'max': round(latencies[-1] * 1000, 3) if requests else 0.0,
+            },
+            'responses': dict(sorted(self.scenes.items())),
+        }
+
+
+class Recorder:
+    """Собирает результаты запросов: все вместе, по платформам и по шагам разговора"""
+
+    def __init__(self) -> None:
+        self.total = Series()
+        self.platforms: dict[str, Series] = {}
+        self.steps: dict[str, Series] = {}
+
+    def record(self, platform: str, step: str, latency: float, scene: Optional[str], ok: bool,
+               expected: Optional[str] = None) -> None:
+        for series in (self.total, self.platforms.setdefault(platform, Series()), self.steps.setdefault(step, Series())):
+            series.add(latency, scene, ok, expected)
+
+    def report(self, duration: float) -> dict[str, Any]:
+        return {
+            'duration_s': round(duration, 3),
+            'total': self.total.summary(duration),
+            'platforms': {name: series.summary(duration) for name, series in sorted(self.platforms.items())},
+            'scenes': {name: series.summary(duration) for name, series in sorted(self.steps.items())},
+        }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Строки сравнения двух отчётов: RPS, p95, доля ошибок и неожиданных сцен по каждому шагу разговора"""
+    lines = [f'{"scene":<16}  {"rps":>26}  {"p95 ms":>28}  {"errors":>18}  {"unexpected":>18}']
+    rows = [('total', baseline['total'], current['total'])]
+    rows += [(name, baseline['scenes'].get(name), summary) for name, summary in current['scenes'].items()]
+
+    for name, before, after in rows:
+        if before is None:
+            lines.append(f'{name:<16}  {"new":>26}')
+            continue
+
+        lines.append(
+            f'{name:<16}  '
+            f'{_delta(before["rps"], after["rps"]):>26}  '
+            f'{_delta(before["latency_ms"]["p95"], after["latency_ms"]["p95"]):>28}  '
+            f'{before["error_rate"]:>7.2%} -> {after["error_rate"]:<7.2%}  '
+            f'{before.get("unexpected_rate", 0.0):>7.2%} -> {after["unexpected_rate"]:<7.2%}')
+
+    return lines
+
+
+def _delta(before: float, after: float) -> str:
+    change = (after - before) / before * 100 if before else 0.0
+    return f'{before:.1f} -> {after:.1f} ({change:+.1f}%)'
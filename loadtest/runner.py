@@ -0,0 +1,161 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+from typing import Any, Optional
+
+import httpx
+import orjson
+
+from .conversations import PAYLOADS, PLATFORM_NAMES, PLATFORM_PATHS, Conversation, failed_reply, response_scene
+from .report import Recorder
+from .schedule_api import ScheduleApiStandIn
+
+# Окружение приложения в том же процессе: без Postgres, снимков и общего кэша,
+# чтобы повторные запуски начинались с одинакового состояния
+IN_PROCESS_ENV = {
+    'DATABASE_HOST': 'localhost',
+    'DATABASE_PORT': '5432',
+    'DATABASE_NAME': 'loadtest',
+    'DATABASE_USER': 'loadtest',
+    'DATABASE_PASSWORD': 'loadtest',
+    'SNAPSHOT_DIR': '',
+    'SHARED_CACHE_BACKEND': 'none',
+    'LOG_LEVEL': 'WARNING',
+}
+
+HEADERS = {'content-type': 'application/json'}
+
+
+async def run_conversation(client: httpx.AsyncClient, conversation: Conversation, recorder: Recorder,
+                           think_time: float, timeout: float) -> None:
+    build = PAYLOADS[conversation.platform]
+    path = PLATFORM_PATHS[conversation.platform]
+    state: dict[str, Any] = {}
+
+    for message_id, step in enumerate(conversation.steps):
+        content = orjson.dumps(build(conversation, message_id, step, state))
+        scene = None
+        ok = False
+
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(client.post(path, content=content, headers=HEADERS), timeout)
+            if response.status_code == 200:
+                body = orjson.loads(response.content)
+                failed = failed_reply(conversation.platform, body)
+                scene = failed or response_scene(conversation.platform, body)
+                state = body.get('session_state', state)
+                ok = failed is None
+        except (asyncio.TimeoutError, httpx.HTTPError, orjson.JSONDecodeError):
+            pass
+        latency = time.perf_counter() - started
+
+        recorder.record(conversation.platform, step.name, latency, scene, ok, step.scene)
+
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+async def run_load(client: httpx.AsyncClient, conversations: list[Conversation], concurrency: int,
+                   think_time: float = 0, timeout: float = 10) -> tuple[Recorder, float]:
+    """Проигрывает разговоры, не больше concurrency одновременно, и возвращает результаты и длительность"""
+    recorder = Recorder()
+    queue = iter(conversations)
+
+    async def worker():
+        for conversation in queue:
+            await run_conversation(client, conversation, recorder, think_time, timeout)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return recorder, time.perf_counter() - started
+
+
+class InProcessTarget:
+    """Приложение FastAPI в том же процессе с SQLite вместо Postgres и локальным API расписания
+
+    Вернувшиеся пользователи из разговоров заранее записываются в базу.
+    Приложение импортируется только в start, после того как окружение указывает на замены.
+
+    Args:
+        api (ScheduleApiStandIn): Замена API расписания.
+    """
+
+    def __init__(self, api: ScheduleApiStandIn) -> None:
+        self.api = api
+
+        self._directory: Optional[str] = None
+        self._engine = None
+        self._app = None
+
+    async def start(self, conversations: list[Conversation], concurrency: int) -> httpx.AsyncClient:
+        os.environ['SCHEDULE_API_URL'] = await self.api.start()
+        for key, value in IN_PROCESS_ENV.items():
+            os.environ.setdefault(key, value)
+
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        from src.app import app
+        from src.core.config import DATABASE_POOL_SIZE
+        from src.database.database import Base, User, get_db
+
+        self._directory = tempfile.mkdtemp(prefix='loadtest-')
+        self._engine = create_async_engine(
+            f'sqlite+aiosqlite:///{os.path.join(self._directory, "loadtest.db")}',
+            poolclass=AsyncAdaptedQueuePool, pool_size=DATABASE_POOL_SIZE, connect_args={'timeout': 30})
+        session_factory = sessionmaker(bind=self._engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with self._engine.begin() as connection:
+            await connection.exec_driver_sql('PRAGMA journal_mode=WAL')
+            await connection.run_sync(Base.metadata.create_all)
+
+        async with session_factory() as db:
+            db.add_all([
+                User(user_id=conversation.user_id, group=conversation.group, platform=PLATFORM_NAMES[conversation.platform])
+                for conversation in conversations if conversation.returning
+            ])
+            await db.commit()
+
+        async def get_test_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = get_test_db
+        self._app = app
+
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url='http://loadtest')
+
+    async def stop(self) -> None:
+        from src.core.session import close_session
+        from src.database.database import get_db
+
+        if self._app is not None:
+            self._app.dependency_overrides.pop(get_db, None)
+        await close_session()
+
+        if self._engine is not None:
+            await self._engine.dispose()
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+        await self.api.stop()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        from src.core.dialog.engine import dialog_engine
+        from src.services.schedule.answers import answer_cache
+        from src.services.schedule.client import schedule_api
+
+        return {
+            'dialog': dialog_engine.stats,
+            'schedule_api': schedule_api.stats,
+            'answer_cache': answer_cache.stats,
+            'stand_in': self.api.stats,
+        }
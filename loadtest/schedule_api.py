@@ -0,0 +1,403 @@
+"""Локальная замена API расписания для тестов и нагрузочного тестирования
+
+Запуск отдельным сервером:
+    python -m loadtest.schedule_api serve --port 8081 --groups 2000 --latency lognormal:40:0.6 --error-rate 0.02
+
+Запись ответов настоящего API в фикстуры:
+    python -m loadtest.schedule_api record --source https://schedule.mirea.ninja/api/schedule --fixtures fixtures
+"""
+import argparse
+import asyncio
+import hashlib
+import math
+import os
+import random
+import threading
+
+from collections import Counter
+from typing import Any, NamedTuple, Optional
+
+import orjson
+
+from aiohttp import ClientSession, web
+
+API_PATH = '/api/schedule'
+
+GROUP_PREFIXES = ('ИКБО', 'ИВБО', 'ИНБО', 'ИМБО', 'КМБО', 'БСБО', 'ХББО', 'УПБО', 'ГИБО', 'ЭЭБО')
+GROUP_YEARS = ('20', '21', '22', '23', '19')
+
+LESSONS = (
+    ('Математический анализ', 'лк'),
+    ('Математический анализ', 'пр'),
+    ('Физика', 'лк'),
+    ('Физика', 'лаб'),
+    ('Программирование на Python', 'пр'),
+    ('Базы данных', 'лк'),
+    ('Базы данных', 'лаб'),
+    ('Иностранный язык', 'пр'),
+    ('Физическая культура и спорт', 'пр'),
+    ('Дискретная математика', 'лк'),
+)
+
+GROUPS_FIXTURE = 'groups.json'
+
+
+def make_groups(count: int) -> list[str]:
+    """Названия групп в формате API расписания, первая всегда ИКБО-01-20"""
+    groups = []
+
+    for year in GROUP_YEARS:
+        for prefix in GROUP_PREFIXES:
+            for number in range(1, 31):
+                groups.append(f'{prefix}-{number:02d}-{year}')
+                if len(groups) == count:
+                    return groups
+
+    return groups
+
+
+def make_schedule(group: str) -> dict:
+    """Расписание группы на неделю, одинаковое при каждом запуске"""
+    rng = random.Random(group)
+    schedule = {}
+
+    for day in range(1, 7):
+        lessons = []
+
+        for _ in range(rng.randint(0, 6)):
+            slot = []
+            if rng.random() < 0.8:
+                name, types = rng.choice(LESSONS)
+                weeks = rng.choice(([], list(range(1, 18, 2)), list(range(2, 19, 2))))
+                slot.append({'name': name, 'types': types, 'weeks': weeks, 'rooms': [f'А-{rng.randint(1, 450)}']})
+            lessons.append(slot)
+
+        schedule[str(day)] = {'lessons': lessons}
+
+    return {'group': group, 'schedule': schedule}
+
+
+class Latency:
+    """Распределение задержки ответа
+
+    Описание задаётся строкой, параметры в миллисекундах:
+    "50" или "fixed:50", "uniform:10:100", "normal:50:10" (среднее и отклонение),
+    "lognormal:40:0.6" (медиана и сигма), "exponential:50" (среднее).
+    """
+
+    KINDS = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+
+    def __init__(self, kind: str = 'fixed', *params: float) -> None:
+        if kind not in self.KINDS or len(params) not in (0, self.KINDS[kind]):
+            raise ValueError(f'unknown latency distribution: {kind}:{params}')
+
+        self.kind = kind
+        self.params = params or (0.0,) * self.KINDS[kind]
+
+    @classmethod
+    def parse(cls, spec: str) -> 'Latency':
+        kind, *params = (spec or '0').split(':')
+
+        if not params and kind not in cls.KINDS:
+            return cls('fixed', float(kind))
+
+        return cls(kind, *(float(param) for param in params))
+
+    def sample(self, rng: random.Random) -> float:
+        """Возвращает задержку в секундах"""
+        first, *rest = self.params
+
+        if self.kind == 'uniform':
+            value = rng.uniform(first, rest[0])
+        elif self.kind == 'normal':
+            value = rng.gauss(first, rest[0])
+        elif self.kind == 'lognormal':
+            value = first * math.exp(rng.gauss(0, rest[0]))
+        elif self.kind == 'exponential':
+            value = rng.expovariate(1 / first) if first > 0 else 0.0
+        else:
+            value = first
+
+        return max(value, 0.0) / 1000
+
+    def __str__(self) -> str:
+        return ':'.join([self.kind, *(f'{param:g}' for param in self.params)])
+
+
+class Faults(NamedTuple):
+    """Задержки и сбои, которые замена API добавляет к ответам
+
+    Для каждого запроса сбой выбирается генератором случайных чисел, начальное значение которого
+    зависит от seed, пути и номера запроса к этому пути. Поэтому N-й запрос расписания группы
+    получает один и тот же сбой при любом порядке одновременных запросов.
+    """
+
+    latency: Latency = Latency()
+    # Доля ответов с кодом error_status
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Доля запросов, которые висят timeout секунд и завершаются 504
+    timeout_rate: float = 0.0
+    timeout: float = 30.0
+    # Доля ответов, которые отдаются частями по drip_chunk байт с паузой drip_delay секунд
+    drip_rate: float = 0.0
+    drip_chunk: int = 1024
+    drip_delay: float = 0.05
+    seed: int = 0
+
+    def describe(self) -> dict[str, Any]:
+        return {**self._asdict(), 'latency': str(self.latency)}
+
+
+class ScheduleApiStandIn:
+    """Замена API расписания: /groups и /{group}/full_schedule
+
+    Ответы берутся из фикстур (groups.json и {group}.json, например записанных командой record),
+    а чего в фикстурах нет, генерируется. На условный запрос с актуальным ETag сервер отвечает 304.
+    Задержки и сбои задаются faults и могут меняться на ходу.
+
+    Args:
+        groups (int): Количество сгенерированных групп, если в фикстурах нет groups.json.
+        fixtures (str, optional): Каталог фикстур.
+        faults (Faults, optional): Задержки и сбои.
+    """
+
+    def __init__(self, groups: int, fixtures: Optional[str] = None, faults: Faults = Faults()) -> None:
+        self.fixtures = fixtures
+        self.faults = faults
+        self.groups = self._load_groups(groups)
+
+        self.requests = 0
+        self.not_modified = 0
+        self.failures: Counter[str] = Counter()
+
+        self._known = set(self.groups)
+        self._bodies: dict[str, tuple[bytes, str]] = {}
+        self._counts: Counter[str] = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def body(self, key: str) -> tuple[bytes, str]:
+        cached = self._bodies.get(key)
+
+        if cached is None:
+            body = self._read_fixture(f'{key}.json') if key != 'groups' else None
+            if body is None:
+                payload = {'groups': self.groups} if key == 'groups' else make_schedule(key)
+                body = orjson.dumps(payload)
+            cached = self._bodies[key] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+        return cached
+
+    def application(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(f'{API_PATH}/groups', self._groups)
+        app.router.add_get(f'{API_PATH}/{{group}}/full_schedule', self._schedule)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Запускает сервер в текущем цикле событий и возвращает адрес для SCHEDULE_API_URL"""
+        self._runner = web.AppRunner(self.application(), access_log=None, shutdown_timeout=1.0)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+        host, port = self._runner.addresses[0][:2]
+        return f'http://{host}:{port}{API_PATH}'
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Запускает сервер в отдельном потоке со своим циклом событий, например для тестов"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='schedule-api-stand-in', daemon=True)
+        self._thread.start()
+
+        return asyncio.run_coroutine_threadsafe(self.start(host, port), self._loop).result()
+
+    def stop_thread(self) -> None:
+        if self._thread is not None:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._thread = self._loop = None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'groups': len(self.groups),
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            **{name: self.failures[name] for name in ('errors', 'timeouts', 'dripped')},
+        }
+
+    async def _groups(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, 'groups')
+
+    async def _schedule(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, request.match_info['group'])
+
+    async def _respond(self, request: web.Request, key: str) -> web.StreamResponse:
+        faults = self.faults
+        self.requests += 1
+        self._counts[key] += 1
+        rng = random.Random(f'{faults.seed}:{key}:{self._counts[key]}')
+
+        delay = faults.latency.sample(rng)
+        failure = rng.random()
+        drip = rng.random() < faults.drip_rate
+
+        if failure < faults.timeout_rate:
+            self.failures['timeouts'] += 1
+            await asyncio.sleep(faults.timeout)
+            raise web.HTTPGatewayTimeout()
+
+        await asyncio.sleep(delay)
+
+        if failure < faults.timeout_rate + faults.error_rate:
+            self.failures['errors'] += 1
+            return web.Response(status=faults.error_status)
+
+        if key != 'groups' and key not in self._known:
+            raise web.HTTPNotFound()
+
+        body, etag = self.body(key)
+
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={'ETag': etag})
+
+        if not drip:
+            return web.Response(body=body, content_type='application/json', headers={'ETag': etag})
+
+        self.failures['dripped'] += 1
+        response = web.StreamResponse(headers={'ETag': etag, 'Content-Type': 'application/json'})
+        response.content_length = len(body)
+        await response.prepare(request)
+
+        for start in range(0, len(body), faults.drip_chunk):
+            await response.write(body[start:start + faults.drip_chunk])
+            await asyncio.sleep(faults.drip_delay)
+
+        await response.write_eof()
+        return response
+
+    def _load_groups(self, count: int) -> list[str]:
+        body = self._read_fixture(GROUPS_FIXTURE)
+        if body is not None:
+            return orjson.loads(body)['groups']
+
+        return make_groups(count)
+
+    def _read_fixture(self, name: str) -> Optional[bytes]:
+        if self.fixtures is None:
+            return None
+
+        try:
+            with open(os.path.join(self.fixtures, name), 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+
+async def record_fixtures(source: str, directory: str, limit: int) -> int:
+    """Сохраняет ответы API расписания в фикстуры и возвращает количество записанных групп
+
+    Args:
+        source (str): Адрес API расписания.
+        directory (str): Каталог фикстур.
+        limit (int): Сколько первых групп записать.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    async with ClientSession(raise_for_status=True) as session:
+        async with session.get(f'{source}/groups') as response:
+            groups_body = await response.read()
+
+        groups = orjson.loads(groups_body)['groups'][:limit]
+        with open(os.path.join(directory, GROUPS_FIXTURE), 'wb') as file:
+            file.write(orjson.dumps({'groups': groups}))
+
+        for group in groups:
+            async with session.get(f'{source}/{group}/full_schedule') as response:
+                body = await response.read()
+            with open(os.path.join(directory, f'{group}.json'), 'wb') as file:
+                file.write(body)
+
+    return len(groups)
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser, prefix: str = '') -> None:
+    """Аргументы командной строки для Faults, prefix нужен, чтобы не пересекаться с аргументами нагрузочного теста"""
+    parser.add_argument(f'--{prefix}latency', default='0', help='распределение задержки, например lognormal:40:0.6')
+    parser.add_argument(f'--{prefix}error-rate', type=float, default=0.0, help='доля ответов с ошибкой')
+    parser.add_argument(f'--{prefix}error-status', type=int, default=500, help='код ответа с ошибкой')
+    parser.add_argument(f'--{prefix}timeout-rate', type=float, default=0.0, help='доля зависающих запросов')
+    parser.add_argument(f'--{prefix}timeout', type=float, default=30.0, help='сколько секунд висит запрос')
+    parser.add_argument(f'--{prefix}drip-rate', type=float, default=0.0, help='доля ответов, отдаваемых частями')
+    parser.add_argument(f'--{prefix}drip-delay', type=float, default=0.05, help='пауза между частями, с')
+    parser.add_argument(f'--{prefix}fault-seed', type=int, default=0, help='начальное значение генератора сбоев')
+
+
+def faults_from_args(args: argparse.Namespace, prefix: str = '') -> Faults:
+    prefix = prefix.replace('-', '_')
+
+    def value(name: str) -> Any:
+        return getattr(args, prefix + name)
+
+    return Faults(
+        latency=Latency.parse(value('latency')),
+        error_rate=value('error_rate'),
+        error_status=value('error_status'),
+        timeout_rate=value('timeout_rate'),
+        timeout=value('timeout'),
+        drip_rate=value('drip_rate'),
+        drip_delay=value('drip_delay'),
+        seed=value('fault_seed'),
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    stand_in = ScheduleApiStandIn(args.groups, args.fixtures, faults_from_args(args))
+    url = await stand_in.start(args.host, args.port)
+    print(f'schedule api stand-in: {url} ({len(stand_in.groups)} groups)', flush=True)
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stand_in.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m loadtest.schedule_api', description='Замена API расписания')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='запустить сервер')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8081)
+    serve_parser.add_argument('--groups', type=int, default=500, help='количество сгенерированных групп')
+    serve_parser.add_argument('--fixtures', help='каталог фикстур')
+    add_fault_arguments(serve_parser)
+
+    record_parser = commands.add_parser('record', help='записать ответы API расписания в фикстуры')
+    record_parser.add_argument('--source', required=True, help='адрес API расписания')
+    record_parser.add_argument('--fixtures', required=True, help='каталог фикстур')
+    record_parser.add_argument('--limit', type=int, default=500, help='сколько групп записать')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        print(f'recorded {asyncio.run(record_fixtures(args.source, args.fixtures, args.limit))} groups')
+    else:
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import logging
+
+from typing import Any, Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.status import HTTP_200_OK
+from starlette.requests import Request
+
+from ....core.dialog.engine import dialog_engine
+from ....core.metrics import METRICS, render_samples
+from ....core.session import get_pool_stats
+from ....crud.user import user_cache
+from ....services.fallback import fallback_reporter
+from ....services.schedule.answers import answer_cache
+from ....services.schedule.client import schedule_api
+from ....services.schedule.groups import group_directory
+from ....services.schedule.prefetch import schedule_prefetcher
+from ....utils.logging_utils import LoggingUtils
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+SCHEDULE_EVENTS = ('stale_served', 'revalidated', 'restored', 'shared_adopted')
+CONDITIONAL_EVENTS = ('revalidations', 'not_modified', 'unchanged')
+
+
+def collect_caches() -> Iterable[str]:
+    caches = {
+        'schedule': schedule_api.stats['cache'],
+        'user': user_cache.stats,
+        'answer': answer_cache.stats,
+    }
+
+    yield from render_samples(
+        'voice_cache_requests_total', 'Обращения к кэшам воркера', 'counter',
+        [({'cache': name, 'result': result}, stats[key])
+         for name, stats in caches.items() for result, key in (('hit', 'hits'), ('miss', 'misses'))])
+    yield from render_samples(
+        'voice_cache_hit_ratio', 'Доля попаданий в кэши воркера', 'gauge',
+        [({'cache': name}, stats['hit_ratio']) for name, stats in caches.items()])
+    yield from render_samples(
+        'voice_cache_entries', 'Количество записей в кэшах воркера', 'gauge',
+        [({'cache': name}, stats['size']) for name, stats in caches.items()])
+
+
+def collect_schedule_api() -> Iterable[str]:
+    stats = schedule_api.stats
+    breaker = stats['breaker']
+    conditional = stats['conditional']
+
+    yield from render_samples(
+        'voice_schedule_inflight', 'Загрузки расписаний, которые выполняются сейчас', 'gauge',
+        [({}, stats['inflight']['inflight'])])
+    yield from render_samples(
+        'voice_schedule_events_total', 'События кэша расписаний', 'counter',
+        [({'event': event}, stats[event]) for event in SCHEDULE_EVENTS]
+        + [({'event': event}, conditional[event]) for event in CONDITIONAL_EVENTS])
+    yield from render_samples(
+        'voice_schedule_bytes_saved_total', 'Байты, не скачанные благодаря ответам 304', 'counter',
+        [({}, conditional['bytes_saved'])])
+    yield from render_samples(
+        'voice_schedule_breaker_state', 'Текущее состояние размыкателя цепи API расписания', 'gauge',
+        (({'state': state}, breaker['state'] == state) for state in ('closed', 'open', 'half_open')))
+    yield from render_samples(
+        'voice_schedule_breaker_transitions_total', 'Переходы размыкателя цепи API расписания', 'counter',
+        (({'state': state}, breaker[state]) for state in ('opened', 'half_opened', 'closed')))
+    yield from render_samples(
+        'voice_schedule_breaker_rejected_total', 'Обращения к API расписания, отклонённые размыкателем', 'counter',
+        [({}, breaker['rejected'])])
+
+    shared = stats['shared']
+    if shared is not None:
+        yield from render_samples(
+            'voice_shared_cache_requests_total', 'Обращения к общему кэшу воркеров', 'counter',
+            (({'backend': shared['backend'], 'result': result}, shared[result])
+             for result in ('hits', 'misses', 'sets', 'errors')))
+        yield from render_samples(
+            'voice_shared_cache_hit_latency_seconds', 'Время попадания в общий кэш воркеров', 'gauge',
+            (({'backend': shared['backend'], 'stat': stat}, shared[f'hit_latency_{stat}_ms'] / 1000)
+             for stat in ('avg', 'max')))
+
+
+def collect_runtime() -> Iterable[str]:
+    pool = get_pool_stats()
+    engine = dialog_engine.stats
+    prefetcher = schedule_prefetcher.stats
+    fallback = fallback_reporter.stats
+
+    yield from render_samples(
+        'voice_http_pool_connections', 'Соединения пула HTTP-сессии', 'gauge',
+        (({'state': state}, pool[state]) for state in ('in_use', 'idle', 'waiting')))
+    yield from render_samples(
+        'voice_deadline_misses_total', 'Запросы, не успевшие к сроку ответа платформы', 'counter',
+        (({'platform': platform}, count) for platform, count in engine['deadline_misses'].items()))
+    yield from render_samples(
+        'voice_late_requests_total', 'Запросы, дорабатывавшие в фоне после срока ответа', 'counter',
+        [({'result': 'completed'}, engine['late_completed']), ({'result': 'failed'}, engine['late_failed'])])
+    yield from render_samples(
+        'voice_prefetch_total', 'Фоновые загрузки расписаний', 'counter',
+        [({'result': 'refreshed'}, prefetcher['refreshed']), ({'result': 'failed'}, prefetcher['failed'])])
+    yield from render_samples(
+        'voice_groups_loaded', 'Количество групп в справочнике', 'gauge',
+        [({}, len(group_directory.groups))])
+    yield from render_samples(
+        'voice_fallback_utterances_total', 'Нераспознанные фразы для сводки', 'counter',
+        (({'result': result}, fallback[result]) for result in ('reported', 'dropped')))
+    yield from render_samples(
+        'voice_fallback_reports_total', 'Отправки сводки нераспознанных фраз', 'counter',
+        (({'result': result}, fallback[result]) for result in ('sent', 'failed')))
+    yield from render_samples(
+        'voice_log_records_dropped_total', 'Записи лога, отброшенные из-за переполнения очереди', 'counter',
+        [({}, LoggingUtils.dropped())])
+
+
+def render_metrics() -> str:
+    lines: list[Any] = []
+
+    for metric in METRICS:
+        lines.extend(metric.render())
+
+    for collector in (collect_caches, collect_schedule_api, collect_runtime):
+        lines.extend(collector())
+
+    return '\n'.join(lines) + '\n'
+
+
+@router.get(
+    "/metrics",
+    tags=["Metrics"],
+    status_code=HTTP_200_OK,
+)
+async def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,13 +1,16 @@
 import logging
 import collections
+import time
 
 from typing import Awaitable
 
 from fastapi import APIRouter, Depends
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from starlette.status import HTTP_200_OK
 from starlette.requests import Request
 
+from ....core.config import ALICE_RESPONSE_BUDGET, MARUSIA_RESPONSE_BUDGET, SBER_RESPONSE_BUDGET
+from ....core.metrics import PHASE_SERIALIZATION, measure
 from ....services.yandex import alice
 from ....services.vk import marusia
 from ....services.sber import sber
@@ -16,19 +19,30 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def json_response(response) -> Response:
+    """Заранее сериализованные ответы сцен отдаются как есть, без повторного кодирования"""
+    with measure(PHASE_SERIALIZATION):
+        if isinstance(response, bytes):
+            return Response(content=response, media_type="application/json")
+
+        return ORJSONResponse(content=response)
+
+
 @router.post(
     "/alice",
     tags=["Alice"],
     status_code=HTTP_200_OK,
 )
-async def alice_webhook(request: Request,  service: Awaitable[alice.AliceVoiceAssistantService] = Depends(alice.get_alice_voice_assistant_service)) -> ORJSONResponse:
+async def alice_webhook(request: Request,  service: Awaitable[alice.AliceVoiceAssistantService] = Depends(alice.get_alice_voice_assistant_service)) -> Response:
+
+    deadline = time.monotonic() + ALICE_RESPONSE_BUDGET
 
     if isinstance(service, collections.abc.Awaitable):
         service = await service
 
-    response = await service.parse_request_and_routing(request=request)
+    response = await service.parse_request_and_routing(request=request, deadline=deadline)
 
-    return ORJSONResponse(content=response)
+    return json_response(response)
 
 
 @router.post(
@@ -36,14 +50,16 @@ async def alice_webhook(request: Request,  service: Awaitable[alice.AliceVoiceAs
     tags=["Marusia"],
     status_code=HTTP_200_OK,
 )
-async def marusia_webhook(request: Request,  service: Awaitable[marusia.MarusaVoiceAssistantService] = Depends(marusia.get_marusa_voice_assistant_service)) -> ORJSONResponse:
+async def marusia_webhook(request: Request,  service: Awaitable[marusia.MarusaVoiceAssistantService] = Depends(marusia.get_marusa_voice_assistant_service)) -> Response:
+
+    deadline = time.monotonic() + MARUSIA_RESPONSE_BUDGET
 
     if isinstance(service, collections.abc.Awaitable):
         service = await service
 
-    response = await service.parse_request_and_routing(request=request)
+    response = await service.parse_request_and_routing(request=request, deadline=deadline)
 
-    return ORJSONResponse(content=response)
+    return json_response(response)
 
 
 @router.post(
@@ -51,11 +67,13 @@ async def marusia_webhook(request: Request,  service: Awaitable[marusia.MarusaVo
     tags=["Sber"],
     status_code=HTTP_200_OK,
 )
-async def sber_webhook(request: Request,  service: Awaitable[sber.SberVoiceAssistantService] = Depends(sber.get_sber_voice_assistant_service)) -> ORJSONResponse:
+async def sber_webhook(request: Request,  service: Awaitable[sber.SberVoiceAssistantService] = Depends(sber.get_sber_voice_assistant_service)) -> Response:
+
+    deadline = time.monotonic() + SBER_RESPONSE_BUDGET
 
     if isinstance(service, collections.abc.Awaitable):
         service = await service
 
-    response = await service.parse_request_and_routing(request=request)
+    response = await service.parse_request_and_routing(request=request, deadline=deadline)
 
-    return ORJSONResponse(content=response)
+    return json_response(response)
@@ -2,7 +2,9 @@ from fastapi import APIRouter
 
 from .endpoints.voice import router as voice_router
 from .endpoints.uptime import router as uptime_router
+from .endpoints.metrics import router as metrics_router
 
 router = APIRouter()
 router.include_router(voice_router)
-router.include_router(uptime_router)
\ No newline at end of file
+router.include_router(uptime_router)
+router.include_router(metrics_router)
\ No newline at end of file
@@ -1,20 +1,18 @@
-import logging
-
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.v1.routes import router as api_router
 from .core.config import PROJECT_NAME, API_V1_PREFIX
-from .database.database import init_db
+from .core.metrics import MetricsMiddleware
+from .core.session import open_session, close_session
+from .database.database import init_db, close_db
+from .services.fallback import fallback_reporter
+from .services.schedule.groups import group_directory
+from .services.schedule.prefetch import schedule_prefetcher, start_prefetcher
+from .services.schedule.shared import shared_cache
+from .utils.logging_utils import LoggingUtils
 
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(threadName)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler("logs.log", mode='w', encoding='UTF-8'),
-        logging.StreamHandler()
-    ]
-)
+LoggingUtils.setup()
 
 app = FastAPI(title=PROJECT_NAME)
 
@@ -25,7 +23,18 @@ app.add_middleware(
     allow_methods=["POST"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix=API_V1_PREFIX)
 app.add_event_handler("startup", init_db)
+app.add_event_handler("startup", open_session)
+app.add_event_handler("startup", group_directory.warm_up)
+app.add_event_handler("startup", start_prefetcher)
+app.add_event_handler("startup", fallback_reporter.start)
+app.add_event_handler("shutdown", schedule_prefetcher.stop)
+app.add_event_handler("shutdown", fallback_reporter.stop)
+app.add_event_handler("shutdown", close_session)
+app.add_event_handler("shutdown", shared_cache.close)
+app.add_event_handler("shutdown", close_db)
+app.add_event_handler("shutdown", LoggingUtils.shutdown)
 
@@ -9,6 +9,8 @@ from ...core.yandex.state import STATE_REQUEST_KEY
 logger = logging.getLogger(__name__)
 
 class SberRequest():
+    platform = 'SBER'
+
     def __init__(self, request_body: dict[str, Any], session: ClientSession, db: Session) -> None:
         self.request_body = request_body
         self.session = session
@@ -1,14 +1,18 @@
 import logging
 
-from typing import Any
+from functools import cached_property
+from typing import Any, Optional
 from aiohttp import ClientSession
 
 from ...database.database import Session
+from ...core.vk.matcher import IntentMatch, matcher
 from ...core.yandex.state import STATE_REQUEST_KEY
 
 logger = logging.getLogger(__name__)
 
 class MarusiaRequest():
+    platform = 'VK'
+
     def __init__(self, request_body: dict[str, Any], session: ClientSession, db: Session) -> None:
         self.request_body = request_body
         self.session = session
@@ -29,6 +33,22 @@ class MarusiaRequest():
     def application_id(self):
         return self.request_body.get('session', {}).get('application', {}).get('application_id', '')
 
+    @cached_property
+    def match(self) -> Optional[IntentMatch]:
+        return matcher.match(self.command)
+
+    @property
+    def intents(self):
+        if self.match is None:
+            return {}
+        return {self.match.intent: self.match.slots}
+
+    @property
+    def slots(self):
+        if self.match is None:
+            return {}
+        return self.match.slots
+
     @property
     def entities(self):
         return self.request_body['request'].get('nlu', {}).get('entities', {})
@@ -45,6 +65,14 @@ class MarusiaRequest():
     def command(self):
         return self.request_body.get('request', {}).get('command')
     
+    @property
+    def new(self):
+        return self.request_body.get('session', {}).get('new')
+
     @property
     def get_group(self):
         return self.request_body.get('state', {}).get(STATE_REQUEST_KEY, {}).get('group')
+
+    @property
+    def get_scene(self):
+        return self.request_body.get('state', {}).get(STATE_REQUEST_KEY, {}).get('scene')
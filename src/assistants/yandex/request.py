@@ -9,6 +9,8 @@ from ...core.yandex.state import STATE_REQUEST_KEY
 logger = logging.getLogger(__name__)
 
 class AliceRequest():
+    platform = 'YANDEX'
+
     def __init__(self, request_body: dict[str, Any], session: ClientSession, db: Session) -> None:
         self.request_body = request_body
         self.session = session
@@ -68,3 +70,7 @@ class AliceRequest():
     @property
     def get_group(self):
         return self.request_body.get('state', {}).get(STATE_REQUEST_KEY, {}).get('group')
+
+    @property
+    def get_scene(self):
+        return self.request_body.get('state', {}).get(STATE_REQUEST_KEY, {}).get('scene')
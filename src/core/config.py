@@ -15,4 +15,87 @@ DATABASE_PASSWORD = os.environ.get('DATABASE_PASSWORD')
 DATABASE_PORT = os.environ.get('DATABASE_PORT')
 
 SKILL_ID = os.environ.get('SKILL_ID')
-VK_API_KEY = os.environ.get('VK_API_KEY')
\ No newline at end of file
+VK_API_KEY = os.environ.get('VK_API_KEY')
+
+# Сколько секунд есть на ответ платформе. Если ответ не готов, отдаётся "расписание загружается",
+# а запрос дорабатывает в фоне и заполняет кэш
+ALICE_RESPONSE_BUDGET = float(os.environ.get('ALICE_RESPONSE_BUDGET', 2.5))
+MARUSIA_RESPONSE_BUDGET = float(os.environ.get('MARUSIA_RESPONSE_BUDGET', 2.5))
+SBER_RESPONSE_BUDGET = float(os.environ.get('SBER_RESPONSE_BUDGET', 2.5))
+
+# Сколько секунд помнить группу, которую пользователь Салюта назвал, но ещё не подтвердил
+SBER_PENDING_GROUP_TTL = float(os.environ.get('SBER_PENDING_GROUP_TTL', 300))
+SBER_PENDING_GROUP_SIZE = int(os.environ.get('SBER_PENDING_GROUP_SIZE', 20000))
+
+HTTP_POOL_LIMIT = int(os.environ.get('HTTP_POOL_LIMIT', 100))
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get('HTTP_POOL_LIMIT_PER_HOST', 30))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get('HTTP_KEEPALIVE_TIMEOUT', 30))
+HTTP_DNS_CACHE_TTL = int(os.environ.get('HTTP_DNS_CACHE_TTL', 300))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 1.5))
+HTTP_TOTAL_TIMEOUT = float(os.environ.get('HTTP_TOTAL_TIMEOUT', 5))
+
+SCHEDULE_CACHE_TTL = float(os.environ.get('SCHEDULE_CACHE_TTL', 3600))
+SCHEDULE_CACHE_SIZE = int(os.environ.get('SCHEDULE_CACHE_SIZE', 2048))
+# Сколько секунд после истечения расписание ещё отдаётся, пока обновляется в фоне
+SCHEDULE_STALE_TTL = float(os.environ.get('SCHEDULE_STALE_TTL', 24 * 3600))
+SCHEDULE_BREAKER_FAILURES = int(os.environ.get('SCHEDULE_BREAKER_FAILURES', 5))
+SCHEDULE_BREAKER_RESET = float(os.environ.get('SCHEDULE_BREAKER_RESET', 30))
+# Каталог снимков ответов API расписания, общий для воркеров. Пустое значение отключает снимки
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', 'snapshots')
+SNAPSHOT_MAX_AGE = float(os.environ.get('SNAPSHOT_MAX_AGE', 7 * 24 * 3600))
+
+# Общий кэш воркеров: none, mmap - один сервер, redis - несколько серверов
+SHARED_CACHE_BACKEND = os.environ.get('SHARED_CACHE_BACKEND', 'none')
+SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH', '/dev/shm/voice-helper-cache')
+SHARED_CACHE_SLOTS = int(os.environ.get('SHARED_CACHE_SLOTS', 4096))
+SHARED_CACHE_SLOT_SIZE = int(os.environ.get('SHARED_CACHE_SLOT_SIZE', 64 * 1024))
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_TIMEOUT = float(os.environ.get('REDIS_TIMEOUT', 0.2))
+
+GROUPS_REFRESH_INTERVAL = float(os.environ.get('GROUPS_REFRESH_INTERVAL', 6 * 3600))
+
+DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 10))
+DATABASE_MAX_OVERFLOW = int(os.environ.get('DATABASE_MAX_OVERFLOW', 10))
+DATABASE_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 2))
+DATABASE_POOL_RECYCLE = int(os.environ.get('DATABASE_POOL_RECYCLE', 1800))
+
+USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 60))
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 20000))
+
+ANSWER_CACHE_SIZE = int(os.environ.get('ANSWER_CACHE_SIZE', 20000))
+
+# Начала семестров в формате MM-DD. Первая учебная неделя - неделя, на которую приходится начало семестра
+SEMESTER_START_AUTUMN = os.environ.get('SEMESTER_START_AUTUMN', '09-01')
+SEMESTER_START_SPRING = os.environ.get('SEMESTER_START_SPRING', '02-09')
+# Праздничные дни через запятую: YYYY-MM-DD для конкретной даты или MM-DD для ежегодных
+CALENDAR_HOLIDAYS = [day.strip() for day in os.environ.get('CALENDAR_HOLIDAYS', '').split(',') if day.strip()]
+
+# Фоновое обновление расписаний групп пользователей
+PREFETCH_ENABLED = os.environ.get('PREFETCH_ENABLED', 'true').lower() == 'true'
+PREFETCH_INTERVAL = float(os.environ.get('PREFETCH_INTERVAL', 300))
+PREFETCH_CONCURRENCY = int(os.environ.get('PREFETCH_CONCURRENCY', 2))
+PREFETCH_PACE = float(os.environ.get('PREFETCH_PACE', 0.2))
+PREFETCH_REFRESH_AHEAD = float(os.environ.get('PREFETCH_REFRESH_AHEAD', 600))
+PREFETCH_GROUPS_LIMIT = int(os.environ.get('PREFETCH_GROUPS_LIMIT', 2000))
+
+# Логи пишет отдельный поток. LOG_FORMAT: text или json, LOG_ROTATION: size или time.
+# RotatingFileHandler не умеет ротировать один файл из нескольких процессов, поэтому по умолчанию
+# у каждого воркера свой файл с {pid} в имени. Общий файл без {pid} подходит только для одного процесса
+LOG_FILE = os.environ.get('LOG_FILE', 'logs.{pid}.log')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_ROTATION = os.environ.get('LOG_ROTATION', 'size')
+LOG_ROTATE_BYTES = int(os.environ.get('LOG_ROTATE_BYTES', 50 * 1024 * 1024))
+LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN', 'midnight')
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+# Доли записей по логгерам, например "httpx=0.1,src.core.dialog=0.5"
+LOG_SAMPLING = os.environ.get('LOG_SAMPLING', '')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+# Сводка нераспознанных фраз: none, log, file, discord или db
+FALLBACK_REPORT_SINK = os.environ.get('FALLBACK_REPORT_SINK', 'log')
+FALLBACK_REPORT_INTERVAL = float(os.environ.get('FALLBACK_REPORT_INTERVAL', 300))
+FALLBACK_REPORT_MAX_ENTRIES = int(os.environ.get('FALLBACK_REPORT_MAX_ENTRIES', 1000))
+FALLBACK_REPORT_TOP = int(os.environ.get('FALLBACK_REPORT_TOP', 20))
+FALLBACK_REPORT_FILE = os.environ.get('FALLBACK_REPORT_FILE', 'fallback.log')
+DISCORD_WEBHOOK_URL = os.environ.get('DISCORD_WEBHOOK_URL', '')
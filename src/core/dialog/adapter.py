@@ -0,0 +1,43 @@
+import orjson
+
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+from .reply import Reply
+from .request import DialogRequest
+from .scenes import PREPARED_REPLIES
+
+
+class PlatformAdapter(ABC):
+    """Переводит запрос платформы в DialogRequest, а Reply - в ответ платформы
+
+    Тело ответов из PREPARED_REPLIES не зависит от запроса, поэтому сериализуется
+    один раз при создании адаптера. В готовые байты подставляются только поля запроса.
+    """
+
+    def __init__(self) -> None:
+        self._prepared = {reply: orjson.dumps(self.render_body(reply)) for reply in PREPARED_REPLIES}
+
+    @abstractmethod
+    def to_dialog(self, request) -> DialogRequest:
+        ...
+
+    @abstractmethod
+    def render_body(self, reply: Reply) -> dict[str, Any]:
+        """Собирает часть ответа, которая не зависит от запроса"""
+        ...
+
+    def attach(self, body: dict[str, Any], request) -> dict[str, Any]:
+        """Дополняет тело ответа полями, которые платформа ожидает скопированными из запроса"""
+        return body
+
+    def splice(self, body: bytes, request) -> bytes:
+        """То же, что attach, для заранее сериализованного тела ответа"""
+        return body
+
+    def respond(self, reply: Reply, request) -> Union[bytes, dict[str, Any]]:
+        prepared = self._prepared.get(reply)
+        if prepared is not None:
+            return self.splice(prepared, request)
+
+        return self.attach(self.render_body(reply), request)
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.metrics import PHASE_ROUTING, measure_exclusive, set_scene
+from ...crud.user import get_or_create_user
+from ...utils.task_utils import TaskUtils
+from . import intents
+from .reply import Reply
+from .request import DialogRequest
+from .scenes import LOADING_REPLIES, SCENES, Schedule, Welcome, WelcomeDefault
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_INTENTS = frozenset(intents.SCHEDULE_INTENTS)
+
+
+class DialogEngine:
+    """Диалог навыка, общий для Алисы, Маруси и Салюта
+
+    Принимает DialogRequest от адаптера платформы и возвращает Reply,
+    который адаптер упаковывает в ответ своей платформы.
+    """
+
+    def __init__(self) -> None:
+        self.deadline_misses: Counter[str] = Counter()
+        self.late_completed = 0
+        self.late_failed = 0
+
+    async def handle_before(self, request: DialogRequest, deadline: Optional[float]) -> Reply:
+        """Обрабатывает запрос, но не дольше, чем до deadline по time.monotonic()
+
+        Если ответ не готов к сроку, возвращается заранее подготовленный ответ "расписание загружается",
+        а обработка продолжается в фоне и заполняет кэши для повторного вопроса.
+        Поэтому обработка идёт в своей сессии базы данных: сессия запроса закрывается вместе с ответом.
+        """
+        with measure_exclusive(PHASE_ROUTING):
+            reply = await self._handle_before(request, deadline)
+
+        set_scene(reply.scene)
+        return reply
+
+    async def _handle_before(self, request: DialogRequest, deadline: Optional[float]) -> Reply:
+        if deadline is None:
+            return await self.handle(request)
+
+        task = asyncio.ensure_future(self._handle_in_own_session(request))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            # Тайм-аут внутри самой обработки, например от aiohttp, не считается пропуском срока
+            if task.done():
+                raise
+
+        self.deadline_misses[request.platform] += 1
+        logger.warning(f'{request.platform} response deadline missed, finishing in background')
+
+        task.add_done_callback(self._count_late)
+        TaskUtils.spawn(task)
+
+        reply = LOADING_REPLIES.get(request.scene) or LOADING_REPLIES[Welcome.id()]
+
+        # Готовый ответ не знает группу из состояния сессии, а без неё следующий запрос её потеряет
+        return reply if request.group is None else reply._replace(group=request.group)
+
+    async def _handle_in_own_session(self, request: DialogRequest) -> Reply:
+        if request.db is None:
+            return await self.handle(request)
+
+        async with AsyncSession(bind=request.db.bind, expire_on_commit=False) as db:
+            return await self.handle(request._replace(db=db))
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'deadline_misses': dict(self.deadline_misses),
+            'late_completed': self.late_completed,
+            'late_failed': self.late_failed,
+        }
+
+    def _count_late(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None:
+            self.late_failed += 1
+        else:
+            self.late_completed += 1
+
+    async def handle(self, request: DialogRequest) -> Reply:
+        if request.scene is None and request.user_id != '':
+            return await self.greet(request)
+
+        current_scene = SCENES.get(request.scene) or SCENES[Welcome.id()]
+        next_scene = current_scene.move(request)
+
+        if next_scene is not None:
+            return await next_scene.reply(request)
+        else:
+            return current_scene.fallback(request)
+
+    async def greet(self, request: DialogRequest) -> Reply:
+        """Первый запрос сессии: регистрирует нового пользователя или приветствует вернувшегося"""
+        user = {
+            "user_id": request.user_id,
+            "group": "",
+            "platform": request.platform
+        }
+
+        user, created = await get_or_create_user(user, request.db)
+
+        if created:
+            return await SCENES[Welcome.id()].reply(request)
+        elif request.new and not SCHEDULE_INTENTS.isdisjoint(request.intents):
+            return await SCENES[Schedule.id()].reply(request)
+        elif not user.group:
+            return await SCENES[Welcome.id()].reply(request)
+        else:
+            return await SCENES[WelcomeDefault.id()].reply(request)
+
+
+dialog_engine = DialogEngine()
@@ -0,0 +1,31 @@
+# Интенты диалога, общие для всех платформ.
+# Адаптеры платформ переводят в них интенты Алисы, Маруси и Салюта.
+
+HELP = 'help'
+
+CONFIRM = 'confirm'
+REJECT = 'reject'
+
+USER_STUDY_GROUP_SET = 'user_study_group_set'
+USER_STUDY_GROUP_UPDATE = 'user_study_group_update'
+
+USER_STUDY_GROUP_INTENTS = [
+    CONFIRM,
+    REJECT,
+    USER_STUDY_GROUP_SET,
+    USER_STUDY_GROUP_UPDATE
+]
+
+SCHEDULE_COUNT = 'schedule_count'
+SCHEDULE_LIST = 'schedule_list'
+
+SCHEDULE_INTENTS = [
+    SCHEDULE_COUNT,
+    SCHEDULE_LIST
+]
+
+EXIT = 'exit'
+
+EXIT_INTENTS = [
+    EXIT
+]
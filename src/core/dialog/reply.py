@@ -0,0 +1,32 @@
+from typing import NamedTuple, Optional
+
+# Эмоции, которые платформы с аватаром могут показать вместе с ответом
+EMOTION_INTEREST = 'interest'
+EMOTION_THINKING = 'thinking'
+
+# Ответы, которыми навык сообщает, что не смог ответить на запрос. Нагрузочный тест
+# отличает их по тексту, поэтому тексты лежат здесь, а не в сценах с их зависимостями
+LOADING_TEXT = 'Загружаю расписание. Спросите ещё раз через пару секунд'
+SCHEDULE_UNAVAILABLE_TEXT = 'Не получилось загрузить расписание. Попробуйте спросить ещё раз через минуту'
+
+
+class Reply(NamedTuple):
+    """Ответ диалога, не зависящий от платформы. Конверт платформы собирает её адаптер
+
+    Args:
+        scene (str): Сцена, которая станет текущей после ответа.
+        text (str): Текст ответа.
+        tts (str): Текст для синтеза речи.
+        buttons (tuple[str, ...]): Подписи кнопок-подсказок.
+        group (str, optional): Группа, которую нужно сохранить в состоянии сессии.
+        exit (bool): Завершить сессию после ответа.
+        emotion (str, optional): Эмоция аватара.
+    """
+
+    scene: str
+    text: str
+    tts: str
+    buttons: tuple[str, ...] = ()
+    group: Optional[str] = None
+    exit: bool = False
+    emotion: Optional[str] = None
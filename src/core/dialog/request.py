@@ -0,0 +1,37 @@
+import datetime
+
+from typing import Any, NamedTuple, Optional
+
+from aiohttp import ClientSession
+
+from ...database.database import Session
+
+
+class DialogRequest(NamedTuple):
+    """Запрос к диалогу, не зависящий от платформы
+
+    Args:
+        platform (str): Платформа пользователя: YANDEX, VK или SBER.
+        user_id (str): Идентификатор пользователя на платформе.
+        command (str): Нормализованный платформой текст команды.
+        original_text (str): Текст команды в том виде, в котором его сказал пользователь.
+        intents (tuple[str, ...]): Интенты из src/core/dialog/intents.py.
+        slots (dict[str, Any]): Слоты дня: "day" - смещение от сегодня, "when" - день недели ("Monday").
+        scene (str, optional): Сцена, сохранённая в состоянии сессии.
+        group (str, optional): Группа, сохранённая в состоянии сессии.
+        new (bool): Признак первого запроса в сессии.
+        now (datetime.datetime): Московское время получения запроса, одно на весь запрос.
+    """
+
+    platform: str
+    user_id: str
+    command: str
+    original_text: str
+    intents: tuple[str, ...]
+    slots: dict[str, Any]
+    scene: Optional[str]
+    group: Optional[str]
+    new: bool
+    now: datetime.datetime
+    session: ClientSession
+    db: Session
@@ -0,0 +1,407 @@
+import logging
+
+from types import MappingProxyType
+from typing import Awaitable, Callable, NamedTuple, Optional
+from abc import ABC
+from datetime import date, timedelta
+
+from ...crud.user import get_user, upsert_user
+from ...services.fallback import fallback_reporter
+from ...services.schedule.answers import ANSWER_COUNT, ANSWER_LIST, answer_cache
+from ...services.schedule.client import ScheduleUnavailableError, schedule_api
+from ...services.schedule.groups import GroupDirectory, group_directory
+from ...services.schedule.semester import semester_calendar
+from ...services.schedule.timetable import Timetable
+
+from . import intents
+from .reply import EMOTION_INTEREST, EMOTION_THINKING, LOADING_TEXT, SCHEDULE_UNAVAILABLE_TEXT, Reply
+from .request import DialogRequest
+
+logger = logging.getLogger(__name__)
+
+MAX_TEXT_LENGTH = 1024
+
+WEEKDAYS = {
+    "Monday": 0,
+    "Tuesday": 1,
+    "Wednesday": 2,
+    "Thursday": 3,
+    "Friday": 4,
+    "Saturday": 5,
+    "Sunday": 6,
+}
+
+DAY_NAMES = {
+    "1": "Понедельник",
+    "2": "Вторник",
+    "3": "Среду",
+    "4": "Четверг",
+    "5": "Пятницу",
+    "6": "Субботу",
+    "7": "Воскресенье",
+}
+
+RELATIVE_DAYS = {
+    0: "Сегодня",
+    1: "Завтра"
+}
+
+LESSON_TYPES = {
+    "лк": "Лекция",
+    "пр": "Практика",
+    "лаб": "Лабораторная работа",
+    "": ""
+}
+
+MENU_BUTTONS = (
+    'Расписание на сегодня',
+    'Расписание на завтра',
+    'Сколько пар сегодня',
+    'Расписание на понедельник',
+    'Изменить группу'
+)
+
+
+class BaseScene(ABC):
+    """Сцена диалога
+
+    Сцены не хранят состояние запроса и создаются один раз при импорте модуля, см. SCENES.
+    """
+
+    # Интенты, при которых диалог остаётся в текущей сцене
+    local_intents: frozenset[str] = frozenset()
+
+    def __init__(self):
+        self.intents_dict = {}
+
+    @classmethod
+    def id(cls):
+        return cls.__name__
+
+    @property
+    def intents_handler(self) -> dict[str, Callable[[DialogRequest], Awaitable[Reply]]]:
+        return self.intents_dict
+
+    async def reply(self, request: DialogRequest) -> Reply:
+        for intent in request.intents:
+            handler = self.intents_handler.get(intent)
+            if handler is not None:
+                return await handler(request)
+
+        return self.fallback(request)
+
+    def move(self, request: DialogRequest):
+        if not self.local_intents.isdisjoint(request.intents):
+            return self
+        return self.handle_global_intents(request)
+
+    def handle_global_intents(self, request: DialogRequest):
+        transition = None
+
+        for intent in request.intents:
+            candidate = GLOBAL_TRANSITIONS.get(intent)
+            if candidate is not None and (transition is None or candidate.rank < transition.rank):
+                transition = candidate
+
+        if transition is not None:
+            return transition.scene
+
+    def fallback(self, request: DialogRequest) -> Reply:
+        fallback_reporter.report(request.platform, request.original_text)
+        return FALLBACK_REPLIES[self.id()]
+
+    @classmethod
+    def make_reply(cls, text, tts=None, buttons=(), group=None, exit=False, emotion=None) -> Reply:
+
+        if len(text) > MAX_TEXT_LENGTH:
+            text = text[:MAX_TEXT_LENGTH]
+
+        if tts is None:
+            tts = text.replace('\n', ', ')
+
+        return Reply(cls.id(), text, tts, tuple(buttons), group, exit, emotion)
+
+    async def get_schedule_request(self, request: DialogRequest, group: str) -> Timetable:
+        return await schedule_api.get_schedule(request.session, group)
+
+    async def get_groups_request(self, request: DialogRequest) -> GroupDirectory:
+        return await group_directory.get(request.session)
+
+
+class Welcome(BaseScene):
+
+    async def reply(self, request: DialogRequest) -> Reply:
+        return STATIC_REPLIES[self.id()]
+
+
+class WelcomeDefault(BaseScene):
+
+    async def reply(self, request: DialogRequest) -> Reply:
+        return STATIC_REPLIES[self.id()]
+
+
+class GoodBye(BaseScene):
+
+    def __init__(self):
+
+        self.intents_dict = {
+            intents.EXIT: self.exit,
+        }
+
+    async def exit(self, request: DialogRequest) -> Reply:
+        return STATIC_REPLIES[self.id()]
+
+
+class Helper(BaseScene):
+
+    async def reply(self, request: DialogRequest) -> Reply:
+        return STATIC_REPLIES[self.id()]
+
+
+class GroupManager(BaseScene):
+    local_intents = frozenset(intents.USER_STUDY_GROUP_INTENTS)
+
+    def __init__(self):
+
+        self.intents_dict = {
+            intents.USER_STUDY_GROUP_SET: self.user_group_set,
+            intents.USER_STUDY_GROUP_UPDATE: self.user_group_update,
+            intents.CONFIRM: self.user_group_confirm,
+            intents.REJECT: self.user_group_reject
+        }
+
+    async def user_group_confirm(self, request: DialogRequest) -> Reply:
+        user_group = request.group
+
+        # Группа для подтверждения не дошла, например в Салюте, который не хранит состояние сессии
+        if user_group is None:
+            return USER_GROUP_REJECT_REPLY
+
+        if request.user_id != '':
+            user = {
+                "user_id": request.user_id,
+                "group": user_group,
+                "platform": request.platform
+            }
+
+            await upsert_user(user, request.db)
+
+        text = f'Отлично, я запомнила, что вы из {user_group}. Для просмотра расписания скажите "Расписание на сегодня" или "Расписание на понедельник"\nДля просмотра помощи скажите "Помощь".\nЧтобы изменить группу скажите "Изменить группу"'
+        return self.make_reply(text, tts=text, buttons=(
+            'Расписание на сегодня',
+            'Расписание на завтра',
+            'Сколько пар сегодня',
+            'Помощь',
+            'Что ты умеешь?',
+            'Изменить группу',
+        ))
+
+    async def user_group_reject(self, request: DialogRequest) -> Reply:
+        return USER_GROUP_REJECT_REPLY
+
+    async def user_group_set(self, request: DialogRequest) -> Reply:
+        groups = await self.get_groups_request(request)
+        user_group = groups.resolve(request.command)
+        text = f"Ваша группа {user_group}, верно?"
+
+        return self.make_reply(text, tts=text, group=user_group, buttons=('Да', 'Нет'))
+
+    async def user_group_update(self, request: DialogRequest) -> Reply:
+        return USER_GROUP_UPDATE_REPLY
+
+
+class Schedule(BaseScene):
+    local_intents = frozenset(intents.SCHEDULE_INTENTS)
+
+    def __init__(self):
+        self.intents_dict = {
+            intents.SCHEDULE_COUNT: self.schedule_info_count,
+            intents.SCHEDULE_LIST: self.schedule_info_list,
+        }
+
+    async def reply(self, request: DialogRequest) -> Reply:
+        try:
+            return await super().reply(request)
+        except ScheduleUnavailableError as e:
+            logger.warning(f'schedule unavailable: {e}')
+            return SCHEDULE_UNAVAILABLE_REPLY
+
+    def __resolve_day(self, request: DialogRequest) -> tuple[date, Optional[str]]:
+        """Возвращает дату расписания и "Сегодня"/"Завтра" для относительных дней"""
+        today = request.now.date()
+
+        if 'day' in request.slots:
+            offset = request.slots['day']
+            return today + timedelta(days=offset), RELATIVE_DAYS[offset]
+
+        return self.__get_nearest_date(today, WEEKDAYS[request.slots.get('when', '')]), None
+
+    def __get_week(self, schedule_day: date) -> Optional[int]:
+        """Возвращает учебную неделю даты или None, если в этот день занятий нет"""
+        calendar_day = semester_calendar.day(schedule_day)
+
+        if calendar_day.holiday:
+            return None
+
+        return calendar_day.week
+
+    def __convert_to_str(self, lessons_count: int) -> str:
+
+        lesson_a = "пара"
+        lesson_b = "пары"
+        lesson_c = "пар"
+
+        if lessons_count == 1:
+            return lesson_a
+        elif lessons_count >= 2 and lessons_count <= 4:
+            return lesson_b
+        elif lessons_count >= 5 or lessons_count == 0:
+            return lesson_c
+
+    def __get_schedule_list(self, timetable: Timetable, group: str, schedule_day: date) -> str:
+        week = self.__get_week(schedule_day)
+        lessons = () if week is None else timetable.lessons(str(schedule_day.isoweekday()), week)
+
+        if len(lessons) == 0:
+            return "Пар нет! Отдыхайте!"
+
+        schedule_text = f"Расписание для группы {group} на {schedule_day.strftime('%d.%m.%Y')}\n\n"
+
+        for lesson in lessons:
+            schedule_text += f"{lesson.number}-ая пара. {lesson.name}. {LESSON_TYPES.get(lesson.types, lesson.types)}\n"
+
+        return schedule_text
+
+    def __get_schedule_count_text(self, timetable: Timetable, schedule_day: date, relative_day: Optional[str]) -> str:
+        day = str(schedule_day.isoweekday())
+        week = self.__get_week(schedule_day)
+        lessons_count = 0 if week is None else timetable.count(day, week)
+        ru_ending = self.__convert_to_str(lessons_count)
+
+        if relative_day is not None:
+
+            if lessons_count == 0:
+                return f"{relative_day} у вас нет пар! Отдыхайте!"
+
+            return f"{relative_day} у вас {lessons_count} {ru_ending}"
+
+        day = DAY_NAMES[day]
+        preposition = "Во" if day == "Вторник" else "В"
+
+        if lessons_count == 0:
+            return f"{preposition} {day.lower()} пар нет! Отдыхайте"
+
+        return f"{preposition} {day.lower()} у вас {lessons_count} {ru_ending}"
+
+    def __get_nearest_date(self, today: date, weekday: int) -> date:
+        days_ahead = weekday - today.weekday()
+
+        if days_ahead <= 0:
+            days_ahead += 7
+
+        return today + timedelta(days_ahead)
+
+    def __sunday_text(self, relative_day: Optional[str]) -> str:
+        if relative_day is None:
+            return "В воскресенье пар нет, можно отдыхать!"
+        elif relative_day == "Сегодня":
+            return "Сегодня воскресенье, пар нет, можно отдыхать!"
+        else:
+            return "Завтра воскресенье, пар нет, можно отдыхать"
+
+    async def __get_timetable(self, request: DialogRequest) -> tuple[str, Timetable]:
+        user = await get_user(request.user_id, request.platform, request.db)
+        return user.group, await self.get_schedule_request(request, group=user.group)
+
+    async def schedule_info_count(self, request: DialogRequest) -> Reply:
+        schedule_day, relative_day = self.__resolve_day(request)
+
+        if schedule_day.isoweekday() == 7:
+            text = self.__sunday_text(relative_day)
+            return self.make_reply(text, tts=text)
+
+        group, timetable = await self.__get_timetable(request)
+        answer_key = (group, schedule_day, ANSWER_COUNT, relative_day)
+        answer = answer_cache.get(answer_key, timetable)
+
+        if answer is None:
+            text = self.__get_schedule_count_text(timetable, schedule_day, relative_day)
+            answer = answer_cache.set(answer_key, timetable, text)
+
+        return self.make_reply(answer.text, tts=answer.tts)
+
+    async def schedule_info_list(self, request: DialogRequest) -> Reply:
+        schedule_day, relative_day = self.__resolve_day(request)
+
+        if schedule_day.isoweekday() == 7:
+            text = self.__sunday_text(relative_day)
+            return self.make_reply(text, tts=text)
+
+        group, timetable = await self.__get_timetable(request)
+        answer_key = (group, schedule_day, ANSWER_LIST)
+        answer = answer_cache.get(answer_key, timetable)
+
+        if answer is None:
+            text = self.__get_schedule_list(timetable, group, schedule_day)
+            answer = answer_cache.set(answer_key, timetable, text)
+
+        return self.make_reply(answer.text, tts=answer.tts)
+
+
+SCENES = MappingProxyType({
+    scene.id(): scene for scene in (Welcome(), WelcomeDefault(), Helper(), GoodBye(), GroupManager(), Schedule())
+})
+
+
+class Transition(NamedTuple):
+    rank: int
+    scene: BaseScene
+
+
+def _transitions(*routes: tuple[list[str], type[BaseScene]]) -> MappingProxyType:
+    """Собирает таблицу переходов интент -> сцена. Чем раньше маршрут, тем выше его приоритет"""
+    table = {}
+    for rank, (route_intents, scene) in enumerate(routes):
+        for intent in route_intents:
+            table.setdefault(intent, Transition(rank, SCENES[scene.id()]))
+    return MappingProxyType(table)
+
+
+GLOBAL_TRANSITIONS = _transitions(
+    ([intents.HELP], Helper),
+    (intents.SCHEDULE_INTENTS, Schedule),
+    (intents.USER_STUDY_GROUP_INTENTS, GroupManager),
+    (intents.EXIT_INTENTS, GoodBye),
+)
+
+
+STATIC_REPLIES = MappingProxyType({
+    Welcome.id(): Welcome.make_reply(
+        'Привет! Теперь я умею показывать расписание РТУ МИРЭА. Для начала скажите мне свою группу.',
+        emotion=EMOTION_INTEREST),
+    WelcomeDefault.id(): WelcomeDefault.make_reply(
+        'Привет! Какое расписание вы хотите посмотреть?', buttons=MENU_BUTTONS, emotion=EMOTION_INTEREST),
+    Helper.id(): Helper.make_reply(
+        'Я могу показать расписание твоей группы. Или, например, сказать количество пар сегодня', buttons=MENU_BUTTONS),
+    GoodBye.id(): GoodBye.make_reply(
+        'До свидания, обращайтесь ко мне ещё!', exit=True),
+})
+
+USER_GROUP_REJECT_REPLY = GroupManager.make_reply('Давайте попробуем еще раз. Назовите вашу группу')
+USER_GROUP_UPDATE_REPLY = GroupManager.make_reply('Хорошо, назовите новую группу и я её запомню')
+SCHEDULE_UNAVAILABLE_REPLY = Schedule.make_reply(SCHEDULE_UNAVAILABLE_TEXT, emotion=EMOTION_THINKING)
+
+FALLBACK_TEXT = 'Не понимаю. Попробуйте сформулировать иначе. Скажите "Помощь" или "Что ты умеешь" и я помогу'
+
+FALLBACK_REPLIES = MappingProxyType({
+    scene.id(): scene.make_reply(FALLBACK_TEXT, emotion=EMOTION_THINKING) for scene in SCENES.values()
+})
+
+# Ответы на запросы, которые не успели обработаться за отведённое платформой время
+LOADING_REPLIES = MappingProxyType({
+    scene.id(): scene.make_reply(LOADING_TEXT, emotion=EMOTION_THINKING) for scene in SCENES.values()
+})
+
+# Ответы, которые адаптеры платформ сериализуют один раз при импорте
+PREPARED_REPLIES = (*STATIC_REPLIES.values(), USER_GROUP_REJECT_REPLY, USER_GROUP_UPDATE_REPLY, SCHEDULE_UNAVAILABLE_REPLY,
+                    *FALLBACK_REPLIES.values(), *LOADING_REPLIES.values())
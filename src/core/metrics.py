@@ -0,0 +1,243 @@
+import bisect
+import contextvars
+import functools
+import time
+
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from .config import API_V1_PREFIX
+
+# Границы корзин в секундах, с запасом вокруг сроков ответа платформ
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 1.5, 2, 2.5, 3, 4.5, 10)
+
+PHASE_DB = 'db'
+PHASE_UPSTREAM = 'upstream'
+PHASE_ROUTING = 'routing'
+PHASE_SERIALIZATION = 'serialization'
+
+PLATFORM_PATHS = {
+    f'{API_V1_PREFIX}/alice': 'alice',
+    f'{API_V1_PREFIX}/marusia': 'marusia',
+    f'{API_V1_PREFIX}/sber': 'sber',
+}
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ''
+
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Гистограмма в формате Prometheus с набором меток
+
+    Args:
+        name (str): Имя метрики.
+        help (str): Описание метрики.
+        labels (tuple[str, ...]): Имена меток.
+        buckets (tuple[float, ...]): Верхние границы корзин.
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{_labels(self.labels + ("le",), labels + (bound,))} {cumulative}'
+
+            yield f'{self.name}_bucket{_labels(self.labels + ("le",), labels + ("+Inf",))} {count}'
+            yield f'{self.name}_sum{_labels(self.labels, labels)} {total}'
+            yield f'{self.name}_count{_labels(self.labels, labels)} {count}'
+
+
+class Counter:
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], kind: str = 'counter') -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.kind = kind
+
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} {self.kind}'
+
+        for labels, value in self._values.items():
+            yield f'{self.name}{_labels(self.labels, labels)} {value}'
+
+
+class Gauge(Counter):
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]) -> None:
+        super().__init__(name, help, labels, kind='gauge')
+
+
+def render_samples(name: str, help: str, kind: str, samples: Iterable[tuple[dict[str, Any], float]]) -> Iterable[str]:
+    """Метрика, значения которой вычисляются в момент запроса /metrics"""
+    yield f'# HELP {name} {help}'
+    yield f'# TYPE {name} {kind}'
+
+    for labels, value in samples:
+        names = tuple(labels)
+        yield f'{name}{_labels(names, tuple(labels[label] for label in names))} {float(value)}'
+
+
+REQUEST_DURATION = Histogram(
+    'voice_request_duration_seconds', 'Время обработки запроса платформы', ('platform', 'scene'))
+REQUEST_PHASE = Histogram(
+    'voice_request_phase_seconds', 'Время этапа обработки запроса', ('platform', 'scene', 'phase'))
+REQUESTS = Counter(
+    'voice_requests_total', 'Количество запросов платформ', ('platform', 'status'))
+IN_FLIGHT = Gauge(
+    'voice_requests_in_flight', 'Запросы платформ, которые обрабатываются сейчас', ('platform',))
+
+METRICS = (REQUEST_DURATION, REQUEST_PHASE, REQUESTS, IN_FLIGHT)
+
+
+class RequestTimings:
+    """Время этапов одного запроса платформы, накапливается через measure и timed"""
+
+    def __init__(self, platform: str) -> None:
+        self.platform = platform
+        self.scene = 'unknown'
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar('request_timings', default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+
+def set_scene(scene: str) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.scene = scene
+
+
+@contextmanager
+def measure(phase: str):
+    """Добавляет время выполнения блока к этапу текущего запроса платформы"""
+    timings = _timings.get()
+
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+@contextmanager
+def measure_exclusive(phase: str, nested: tuple[str, ...] = (PHASE_DB, PHASE_UPSTREAM)):
+    """То же, что measure, но без времени вложенных этапов, замеренных внутри блока"""
+    timings = _timings.get()
+
+    if timings is None:
+        yield
+        return
+
+    nested_before = sum(timings.phases.get(name, 0.0) for name in nested)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        nested_time = sum(timings.phases.get(name, 0.0) for name in nested) - nested_before
+        timings.add(phase, max(time.perf_counter() - started - nested_time, 0.0))
+
+
+def timed(phase: str):
+    """Декоратор корутины: время её выполнения добавляется к этапу текущего запроса платформы"""
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with measure(phase):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """ASGI-промежуточный слой, который замеряет запросы к вебхукам платформ
+
+    Остальные пути пропускаются без замеров.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        platform = PLATFORM_PATHS.get(scope.get('path')) if scope['type'] == 'http' else None
+
+        if platform is None:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(platform)
+        token = _timings.set(timings)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        IN_FLIGHT.inc(platform)
+        started = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.inc(platform, value=-1)
+            _timings.reset(token)
+
+            REQUESTS.inc(platform, str(status))
+            REQUEST_DURATION.observe(elapsed, platform, timings.scene)
+            for phase, seconds in timings.phases.items():
+                REQUEST_PHASE.observe(seconds, platform, timings.scene, phase)
@@ -0,0 +1,113 @@
+from types import MappingProxyType
+from typing import Any
+
+from ...assistants.sber.request import SberRequest
+from ...core.dialog import intents as dialog_intents
+from ...core.dialog.adapter import PlatformAdapter
+from ...core.dialog.reply import EMOTION_INTEREST, EMOTION_THINKING, Reply
+from ...core.dialog.request import DialogRequest
+from ...core.dialog.scenes import Welcome
+from ...core.sber import intents
+from ...utils.response_utils import ReponseUtils
+from ...utils.schedule_utils import ScheduleUtils
+
+INTENTS = MappingProxyType({
+    **{phrase: dialog_intents.HELP for phrase in intents.HELP},
+    intents.WHAT_CAN_YOU_DO: dialog_intents.HELP,
+    intents.CONFIRM: dialog_intents.CONFIRM,
+    intents.REJECT: dialog_intents.REJECT,
+    intents.USER_STUDY_GROUP_SET: dialog_intents.USER_STUDY_GROUP_SET,
+    intents.USER_STUDY_GROUP_UPDATE: dialog_intents.USER_STUDY_GROUP_UPDATE,
+    intents.SCHEDULE_COUNT: dialog_intents.SCHEDULE_COUNT,
+    intents.SCHEDULE_LIST: dialog_intents.SCHEDULE_LIST,
+    intents.EXIT: dialog_intents.EXIT,
+})
+
+EMOTIONS = MappingProxyType({
+    EMOTION_INTEREST: "zainteresovannost",
+    EMOTION_THINKING: "zadumalsa",
+})
+
+
+class SberAdapter(PlatformAdapter):
+
+    def to_dialog(self, request: SberRequest) -> DialogRequest:
+        intent = INTENTS.get(request.intent)
+
+        return DialogRequest(
+            platform=request.platform,
+            user_id=request.sub or request.user_id,
+            command=request.command or '',
+            original_text=request.original_text,
+            intents=() if intent is None else (intent,),
+            slots=self.slots(request) if intent in dialog_intents.SCHEDULE_INTENTS else {},
+            # Ало, это Герман Греф? А почему Sber.Salut не умеет хранить состояние?
+            # Без сохранённой сцены приветствие только на запуск навыка, остальные интенты разбираются от Welcome
+            scene=None if request.intent in (None, '', intents.RUN_APP) else Welcome.id(),
+            group=None,
+            new=False,
+            now=ScheduleUtils.now_date(),
+            session=request.session,
+            db=request.db,
+        )
+
+    @staticmethod
+    def slots(request: SberRequest) -> dict[str, Any]:
+        day = request.slots.get('when', '')
+
+        if day == "YandexDatetime":
+            return {'day': request.entities[0]['value']['day']}
+
+        return {'when': day}
+
+    def render_body(self, reply: Reply) -> dict[str, Any]:
+        response = {
+            'pronounceText': reply.tts,
+            'items': [
+                {
+                    'bubble': {
+                        "text": reply.text
+                    }
+                }
+            ],
+            'intent': reply.scene,
+            'auto_listening': False,
+        }
+
+        if reply.buttons:
+            response['suggestions'] = {
+                'buttons': [ReponseUtils.button_sber(title=title, action=title) for title in reply.buttons]
+            }
+
+        if reply.emotion is not None:
+            response['emotion'] = {
+                'emotionId': EMOTIONS[reply.emotion]
+            }
+
+        return response
+
+    @staticmethod
+    def request_fields(request: SberRequest) -> dict[str, Any]:
+        return {
+            'messageName': 'ANSWER_TO_USER',
+            'sessionId': request["sessionId"],
+            'messageId': request["messageId"],
+            'uuid': request['uuid'],
+        }
+
+    def attach(self, body: dict[str, Any], request: SberRequest) -> dict[str, Any]:
+        body['projectName'] = request['payload']['projectName']
+        body['device'] = request['payload']['device']
+        return {**self.request_fields(request), 'payload': body}
+
+    def splice(self, body: bytes, request: SberRequest) -> bytes:
+        """Дополняет заранее сериализованный payload полями запроса и оборачивает его в ANSWER_TO_USER"""
+        payload = ReponseUtils.splice_json(body, {
+            'projectName': request['payload']['projectName'],
+            'device': request['payload']['device'],
+        })
+
+        return ReponseUtils.splice_json(b'{}', self.request_fields(request), raw={'payload': payload})
+
+
+sber_adapter = SberAdapter()
@@ -1,5 +1,8 @@
 # TODO: Add all intents for Sber
 
+# Интент запуска навыка
+RUN_APP = 'run_app'
+
 HELP = ['помощь', 'что ты умеешь']
 WHAT_CAN_YOU_DO = 'YANDEX.WHAT_CAN_YOU_DO'
 
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from ...core.config import SBER_PENDING_GROUP_TTL, SBER_PENDING_GROUP_SIZE
+from ...services.schedule.shared import SharedCache, shared_cache
+from ...utils.cache_utils import TTLCache
+
+
+class PendingGroups:
+    """Группы, которые пользователи Салюта назвали, но ещё не подтвердили
+
+    Салют не хранит состояние сессии, поэтому названная группа запоминается на сервере до ответа "да".
+    Следующий запрос может прийти в другой воркер, поэтому группа пишется и в общий кэш воркеров, если он настроен.
+
+    Args:
+        cache (TTLCache): Кэш воркера.
+        shared (SharedCache): Общий кэш воркеров.
+    """
+
+    def __init__(self, cache: TTLCache, shared: SharedCache) -> None:
+        self.cache = cache
+        self.shared = shared
+
+    async def get(self, user_id: str) -> Optional[str]:
+        group = self.cache.get(user_id)
+
+        if group is None and self.shared.name != 'none':
+            value = await self.shared.get(self._key(user_id))
+            group = value.decode() if value is not None else None
+
+        return group
+
+    async def set(self, user_id: str, group: str) -> None:
+        self.cache.set(user_id, group)
+
+        if self.shared.name != 'none':
+            await self.shared.set(self._key(user_id), group.encode(), ttl=self.cache.ttl)
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f'sber-group:{user_id}'
+
+
+pending_groups = PendingGroups(TTLCache(maxsize=SBER_PENDING_GROUP_SIZE, ttl=SBER_PENDING_GROUP_TTL), shared_cache)
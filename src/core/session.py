@@ -1,4 +1,101 @@
-from aiohttp import ClientSession
+import asyncio
+import logging
+
+from typing import Optional
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from .config import (HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT,
+                     HTTP_DNS_CACHE_TTL, HTTP_CONNECT_TIMEOUT, HTTP_TOTAL_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_session() -> ClientSession:
+    connector = TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    timeout = ClientTimeout(total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    return ClientSession(connector=connector, timeout=timeout)
+
+
+def _is_usable(session: Optional[ClientSession]) -> bool:
+    if session is None or session.closed:
+        return False
+
+    # Сессия привязана к циклу событий, в котором была создана
+    return _session_loop is asyncio.get_running_loop()
+
+
+async def _discard_session(session: ClientSession) -> None:
+    """Закрывает сессию, оставшуюся от прошлого цикла событий
+
+    Соединения пула принадлежат старому циклу, поэтому дожидаться их закрытия в текущем нельзя:
+    транспорты закрываются сразу, а сессия отвязывается от пула.
+    """
+    connector = session.connector
+    session.detach()
+
+    if connector is not None and not connector.closed:
+        try:
+            await connector.close()
+        except RuntimeError:
+            # Ожидание закрытия соединений привязано к старому циклу событий
+            pass
+
+
+async def open_session() -> None:
+    """Создаёт общую для воркера HTTP-сессию с пулом соединений"""
+    global _session, _session_loop
+
+    if not _is_usable(_session):
+        if _session is not None and not _session.closed:
+            await _discard_session(_session)
+
+        _session = _create_session()
+        _session_loop = asyncio.get_running_loop()
+        logger.info(f'http session opened: {get_pool_stats()}')
+
+
+async def close_session() -> None:
+    """Закрывает общую HTTP-сессию и все соединения пула"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+    _session = None
+    _session_loop = None
+
 
 async def get_session() -> ClientSession:
-    return ClientSession()
\ No newline at end of file
+    if not _is_usable(_session):
+        await open_session()
+
+    return _session
+
+
+def get_pool_stats() -> dict[str, int]:
+    """Возвращает статистику пула соединений: занятые, свободные и ожидающие"""
+    if _session is None or _session.closed:
+        return {'limit': HTTP_POOL_LIMIT, 'limit_per_host': HTTP_POOL_LIMIT_PER_HOST, 'in_use': 0, 'idle': 0, 'waiting': 0}
+
+    connector = _session.connector
+
+    acquired = getattr(connector, '_acquired', ())
+    conns = getattr(connector, '_conns', {})
+    waiters = getattr(connector, '_waiters', {})
+
+    return {
+        'limit': connector.limit,
+        'limit_per_host': connector.limit_per_host,
+        'in_use': len(acquired),
+        'idle': sum(len(pool) for pool in conns.values()),
+        'waiting': sum(len(queue) for queue in waiters.values()),
+    }
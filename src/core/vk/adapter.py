@@ -0,0 +1,66 @@
+from typing import Any
+
+from ...assistants.vk.request import MarusiaRequest
+from ...core.dialog.adapter import PlatformAdapter
+from ...core.dialog.reply import Reply
+from ...core.dialog.request import DialogRequest
+from ...core.vk.state import STATE_RESPONSE_KEY
+from ...utils.response_utils import ReponseUtils
+from ...utils.schedule_utils import ScheduleUtils
+
+
+class MarusiaAdapter(PlatformAdapter):
+
+    def to_dialog(self, request: MarusiaRequest) -> DialogRequest:
+        return DialogRequest(
+            platform=request.platform,
+            user_id=request.user_id or request.application_id,
+            command=request.command or '',
+            original_text=request.original_utterance,
+            intents=tuple(request.intents),
+            slots=request.slots,
+            scene=request.get_scene,
+            group=request.get_group,
+            new=bool(request.new),
+            now=ScheduleUtils.now_date(),
+            session=request.session,
+            db=request.db,
+        )
+
+    def render_body(self, reply: Reply) -> dict[str, Any]:
+        response = {
+            'text': reply.text,
+            'tts': reply.tts,
+            'end_session': reply.exit,
+        }
+
+        if reply.buttons:
+            response['buttons'] = [ReponseUtils.button_vk(title) for title in reply.buttons]
+
+        return {
+            'response': response,
+            STATE_RESPONSE_KEY: {
+                'scene': reply.scene,
+                'group': reply.group
+            },
+        }
+
+    @staticmethod
+    def request_fields(request: MarusiaRequest) -> dict[str, Any]:
+        """Поля ответа, которые Маруся ожидает скопированными из запроса"""
+        derived_session_fields = ['session_id', 'user_id', 'message_id']
+
+        return {
+            'version': request['version'],
+            'session': {derived_key: request['session'][derived_key] for derived_key in derived_session_fields},
+        }
+
+    def attach(self, body: dict[str, Any], request: MarusiaRequest) -> dict[str, Any]:
+        body.update(self.request_fields(request))
+        return body
+
+    def splice(self, body: bytes, request: MarusiaRequest) -> bytes:
+        return ReponseUtils.splice_json(body, self.request_fields(request))
+
+
+marusia_adapter = MarusiaAdapter()
@@ -1,11 +1,26 @@
 # TODO: Add all intents for VK Group
 
-HELP = ['помощь', 'что ты умеешь']
+# Маруся не присылает распознанные интенты, поэтому навык определяет их сам:
+# фразы ниже компилируются в src/core/vk/matcher.py в интенты диалога
 
-CONFIRM = ['да', 'согласен', 'верно', 'правильно']
-REJECT = ['нет', 'не согласен', 'неверно', 'неправильно']
+from ..dialog.intents import (
+    HELP,
+    CONFIRM,
+    REJECT,
+    USER_STUDY_GROUP_SET,
+    USER_STUDY_GROUP_UPDATE,
+    SCHEDULE_COUNT,
+    SCHEDULE_LIST,
+    EXIT,
+)
 
-USER_STUDY_GROUP_SET = [
+HELP_PHRASES = ['помощь', 'что ты умеешь']
+
+CONFIRM_PHRASES = ['да', 'согласен', 'верно', 'правильно']
+REJECT_PHRASES = ['нет', 'не согласен', 'неверно', 'неправильно']
+
+# Начала названий групп: команда, которая начинается с одного из них, считается названием группы
+USER_STUDY_GROUP_PREFIXES = [
     'ТДБО',
     'ТШБО',
     'ТХБО',
@@ -127,16 +142,9 @@ USER_STUDY_GROUP_SET = [
     'ЩККО',
     'ЩБКО',
 ]
-USER_STUDY_GROUP_UPDATE = ['изменить группу', 'сменить группу', 'поменять группу']
-
-USER_STUDY_GROUP_INTENTS = [
-    CONFIRM,
-    REJECT,
-    USER_STUDY_GROUP_SET,
-    USER_STUDY_GROUP_UPDATE
-]
+USER_STUDY_GROUP_UPDATE_PHRASES = ['изменить группу', 'сменить группу', 'поменять группу']
 
-SCHEDULE_COUNT = [
+SCHEDULE_COUNT_PHRASES = [
     'сколько пар сегодня',
     'сколько пар завтра',
     'сколько пар в понедельник',
@@ -193,7 +201,7 @@ SCHEDULE_COUNT = [
     'количество занятий в воскресенье'
 ]
 
-SCHEDULE_LIST = [
+SCHEDULE_LIST_PHRASES = [
     'какие пары завтра',
     'какие занятия завтра',
     'какие уроки завтра',
@@ -238,12 +246,7 @@ SCHEDULE_LIST = [
     'расписание на воскресенье'
 ]
 
-SCHEDULE_INTENTS = [
-    SCHEDULE_COUNT,
-    SCHEDULE_LIST
-]
-
-EXIT_INTENTS = [
+EXIT_PHRASES = [
     'пока',
     'завершить',
     'до свидания',
@@ -0,0 +1,101 @@
+import re
+
+from typing import Any, NamedTuple, Optional
+
+from ...core.vk import intents
+
+_TOKEN = re.compile(r'[a-zа-я]+|\d+')
+
+# Слова, из которых извлекается слот дня: "day" - смещение от сегодня, "when" - день недели
+WHEN_SLOTS = {
+    'сегодня': {'day': 0},
+    'завтра': {'day': 1},
+    'понедельник': {'when': 'Monday'},
+    'вторник': {'when': 'Tuesday'},
+    'среду': {'when': 'Wednesday'},
+    'четверг': {'when': 'Thursday'},
+    'пятницу': {'when': 'Friday'},
+    'субботу': {'when': 'Saturday'},
+    'воскресенье': {'when': 'Sunday'},
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Разбивает фразу на слова и числа: "ИКБО-01-20?" -> ["икбо", "01", "20"]"""
+    return _TOKEN.findall(text.lower().replace('ё', 'е'))
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    slots: dict[str, Any]
+
+
+class IntentMatcher:
+    """Определитель интентов по тексту команды
+
+    Фразы целиком хранятся в словаре по нормализованному тексту, а начала команд -
+    в префиксном дереве по словам. Поиск проходит по словам команды один раз,
+    поэтому его стоимость не зависит от количества фраз.
+    """
+
+    def __init__(self) -> None:
+        self._phrases: dict[str, IntentMatch] = {}
+        self._prefixes: dict[str, Any] = {}
+
+    def add_phrases(self, intent: str, phrases: list[str]) -> None:
+        """Добавляет фразы, которые должны совпасть с командой целиком
+
+        Слоты дня извлекаются из самих фраз при компиляции, а не при каждом запросе.
+        """
+        for phrase in phrases:
+            tokens = tokenize(phrase)
+
+            slots = {}
+            for token in tokens:
+                slots.update(WHEN_SLOTS.get(token, {}))
+
+            self._phrases.setdefault(' '.join(tokens), IntentMatch(intent, slots))
+
+    def add_prefixes(self, intent: str, prefixes: list[str]) -> None:
+        """Добавляет начала команд, например первые буквы названия группы"""
+        for prefix in prefixes:
+            node = self._prefixes
+            for token in tokenize(prefix):
+                node = node.setdefault(token, {})
+
+            node.setdefault(None, IntentMatch(intent, {}))
+
+    def match(self, command: Optional[str]) -> Optional[IntentMatch]:
+        tokens = tokenize(command or '')
+
+        found = self._phrases.get(' '.join(tokens))
+        if found is not None:
+            return found
+
+        node = self._prefixes
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                break
+
+            found = node.get(None, found)
+
+        return found
+
+
+def compile_matcher() -> IntentMatcher:
+    matcher = IntentMatcher()
+
+    matcher.add_phrases(intents.HELP, intents.HELP_PHRASES)
+    matcher.add_phrases(intents.SCHEDULE_COUNT, intents.SCHEDULE_COUNT_PHRASES)
+    matcher.add_phrases(intents.SCHEDULE_LIST, intents.SCHEDULE_LIST_PHRASES)
+    matcher.add_phrases(intents.USER_STUDY_GROUP_UPDATE, intents.USER_STUDY_GROUP_UPDATE_PHRASES)
+    matcher.add_phrases(intents.CONFIRM, intents.CONFIRM_PHRASES)
+    matcher.add_phrases(intents.REJECT, intents.REJECT_PHRASES)
+    matcher.add_phrases(intents.EXIT, intents.EXIT_PHRASES)
+    matcher.add_prefixes(intents.USER_STUDY_GROUP_SET, intents.USER_STUDY_GROUP_PREFIXES)
+
+    return matcher
+
+
+matcher = compile_matcher()
@@ -0,0 +1,86 @@
+from types import MappingProxyType
+from typing import Any
+
+from ...assistants.yandex.request import AliceRequest
+from ...core.dialog import intents as dialog_intents
+from ...core.dialog.adapter import PlatformAdapter
+from ...core.dialog.reply import Reply
+from ...core.dialog.request import DialogRequest
+from ...core.yandex import intents
+from ...core.yandex.state import STATE_RESPONSE_KEY
+from ...utils.response_utils import ReponseUtils
+from ...utils.schedule_utils import ScheduleUtils
+
+INTENTS = MappingProxyType({
+    intents.HELP: dialog_intents.HELP,
+    intents.WHAT_CAN_YOU_DO: dialog_intents.HELP,
+    intents.CONFIRM: dialog_intents.CONFIRM,
+    intents.REJECT: dialog_intents.REJECT,
+    intents.USER_STUDY_GROUP_SET: dialog_intents.USER_STUDY_GROUP_SET,
+    intents.USER_STUDY_GROUP_UPDATE: dialog_intents.USER_STUDY_GROUP_UPDATE,
+    intents.SCHEDULE_COUNT: dialog_intents.SCHEDULE_COUNT,
+    intents.SCHEDULE_LIST: dialog_intents.SCHEDULE_LIST,
+    intents.EXIT: dialog_intents.EXIT,
+})
+
+SCHEDULE_INTENTS = frozenset(intents.SCHEDULE_INTENTS)
+
+
+class AliceAdapter(PlatformAdapter):
+
+    def to_dialog(self, request: AliceRequest) -> DialogRequest:
+        request_intents = request.intents
+
+        return DialogRequest(
+            platform=request.platform,
+            user_id=request.user_id or request.application_id,
+            command=request.command or '',
+            original_text=request.original_utterance,
+            intents=tuple(INTENTS[intent] for intent in request_intents if intent in INTENTS),
+            slots=self.slots(request) if not SCHEDULE_INTENTS.isdisjoint(request_intents) else {},
+            scene=request.get_scene,
+            group=request.get_group,
+            new=bool(request.new),
+            now=ScheduleUtils.now_date(),
+            session=request.session,
+            db=request.db,
+        )
+
+    @staticmethod
+    def slots(request: AliceRequest) -> dict[str, Any]:
+        """Переводит слот дня из Яндекс.Диалогов в слоты диалога
+
+        Количество пар приходит в слоте "type", список пар - в слоте "when".
+        Относительные даты ("сегодня", "завтра") распознаются сущностью YANDEX.DATETIME.
+        """
+        slots = request.slots
+        day = slots.get('when', slots.get('type', ''))
+
+        if day == "YandexDatetime":
+            return {'day': request.entities[0]['value']['day']}
+
+        return {'when': day}
+
+    def render_body(self, reply: Reply) -> dict[str, Any]:
+        response = {
+            'text': reply.text,
+            'tts': reply.tts,
+        }
+
+        if reply.buttons:
+            response['buttons'] = [ReponseUtils.button_alice(title, hide=True) for title in reply.buttons]
+
+        if reply.exit:
+            response['end_session'] = True
+
+        return {
+            'response': response,
+            'version': "1.0",
+            STATE_RESPONSE_KEY: {
+                'scene': reply.scene,
+                'group': reply.group
+            },
+        }
+
+
+alice_adapter = AliceAdapter()
@@ -0,0 +1,25 @@
+import datetime
+
+from typing import Iterable
+
+from ..database.database import FallbackUtterance, Session
+
+
+async def add_fallback_utterances(db: Session, entries: Iterable) -> None:
+    """Сохраняет сводку нераспознанных фраз, одна строка на фразу
+
+    Args:
+        db (Session): Сессия базы данных.
+        entries (Iterable[FallbackEntry]): Записи сводки.
+    """
+    db.add_all([
+        FallbackUtterance(
+            text=entry.text,
+            count=entry.count,
+            platforms=','.join(sorted(entry.platforms)),
+            first_seen=datetime.datetime.fromtimestamp(entry.first_seen),
+            last_seen=datetime.datetime.fromtimestamp(entry.last_seen),
+        )
+        for entry in entries
+    ])
+    await db.commit()
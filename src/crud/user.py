@@ -1,31 +1,202 @@
+import uuid
+
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, select, update, true, false
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..core.config import USER_CACHE_TTL, USER_CACHE_SIZE
+from ..core.metrics import PHASE_DB, timed
 from ..database.database import User, Session
+from ..services.schedule.shared import SharedCache, shared_cache
+from ..utils.cache_utils import TTLCache
+
+USER_KEY = ['platform', 'user_id']
+
+
+class UserProfile(NamedTuple):
+    user_id: str
+    group: str
+    platform: str
+
+
+class CachedProfile(NamedTuple):
+    profile: UserProfile
+    # Версия пользователя в общем кэше воркеров на момент чтения профиля из базы
+    version: Optional[bytes]
+
+
+# Кэш профилей пользователей воркера с ключом (platform, user_id).
+# Профили без группы не кэшируются: пользователь вот-вот её назовёт, возможно через другой воркер.
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# При смене группы воркер записывает в общий кэш новую версию пользователя, а остальные воркеры
+# сверяют с ней профиль из своего кэша. Без общего кэша другие воркеры видят старую группу до USER_CACHE_TTL.
+user_versions: SharedCache = shared_cache
+
+
+def _insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        return postgresql.insert(User)
+    return sqlite.insert(User)
+
+
+def _user_filter(user_id: str, platform: str):
+    return (User.platform == platform, User.user_id == user_id)
+
+
+def _remember(profile: UserProfile, version: Optional[bytes] = None) -> UserProfile:
+    if profile.group:
+        user_cache.set((profile.platform, profile.user_id), CachedProfile(profile, version))
+    else:
+        user_cache.pop((profile.platform, profile.user_id))
+
+    return profile
+
+
+def _version_key(user_id: str, platform: str) -> str:
+    return f'user:{platform}:{user_id}'
+
+
+async def _cached(user_id: str, platform: str) -> tuple[Optional[UserProfile], Optional[bytes]]:
+    """Профиль из кэша воркера, если другой воркер не менял его после чтения, и текущая версия пользователя"""
+    version = None
+    if user_versions.name != 'none':
+        version = await user_versions.get(_version_key(user_id, platform))
+
+    cached = user_cache.get((platform, user_id))
+    if cached is not None and cached.version == version:
+        return cached.profile, version
+
+    return None, version
+
 
+async def _changed(profile: UserProfile) -> UserProfile:
+    """Запоминает новую группу пользователя и сообщает остальным воркерам, что их копия устарела"""
+    version = None
+    if user_versions.name != 'none':
+        version = uuid.uuid4().hex.encode()
+        await user_versions.set(_version_key(profile.user_id, profile.platform), version, ttl=USER_CACHE_TTL)
 
+    return _remember(profile, version)
+
+
+def invalidate_user(user_id: str, platform: str) -> None:
+    user_cache.pop((platform, user_id))
+
+
+@timed(PHASE_DB)
 async def create_user(user, db: Session):
+    statement = _insert(db).values(
+        user_id=user['user_id'], group=user['group'], platform=user['platform']
+    ).on_conflict_do_nothing(index_elements=USER_KEY)
 
-    if db.query(User).filter(User.user_id == user['user_id']).first() == None:
-        new_user = User(user_id = user['user_id'], group = user['group'], platform = user['platform'])
-        db.add(new_user)
-        db.commit()
+    result = await db.execute(statement)
+    await db.commit()
+
+    if result.rowcount == 1:
+        _remember(UserProfile(user['user_id'], user['group'], user['platform']))
         return True
     else:
         return False
 
+@timed(PHASE_DB)
+async def get_or_create_user(user, db: Session):
+    """Возвращает пользователя и признак того, что он был создан этим вызовом
+
+    В PostgreSQL поиск и создание выполняются одним запросом по уникальному индексу (platform, user_id).
+    """
+    profile, version = await _cached(user['user_id'], user['platform'])
+    if profile is not None:
+        return profile, False
+
+    if db.bind.dialect.name != 'postgresql':
+        profile = await get_user(user['user_id'], user['platform'], db)
+        if profile is not None:
+            return profile, False
+
+        await create_user(user, db)
+        return UserProfile(user['user_id'], user['group'], user['platform']), True
+
+    inserted = postgresql.insert(User).values(
+        user_id=user['user_id'], group=user['group'], platform=user['platform']
+    ).on_conflict_do_nothing(index_elements=USER_KEY).returning(
+        User.user_id, User.group, User.platform, true().label('created')
+    ).cte('inserted')
+
+    statement = select(inserted).union_all(
+        select(User.user_id, User.group, User.platform, false().label('created'))
+        .where(*_user_filter(user['user_id'], user['platform']))
+    )
+
+    row = (await db.execute(statement)).first()
+    await db.commit()
+
+    if row is None:
+        # Пользователя одновременно создал другой запрос: его строка не видна в снимке этого запроса,
+        # но видна следующему
+        return await get_user(user['user_id'], user['platform'], db), False
+
+    return _remember(UserProfile(row.user_id, row.group, row.platform), version), row.created
+
+@timed(PHASE_DB)
 async def update_user(user, db: Session):
-    dbuser = db.query(User).filter(User.user_id == user['user_id']).first()
-    if dbuser is not None:
-        dbuser.group = user['group']
-        db.commit()
+    statement = update(User).where(
+        *_user_filter(user['user_id'], user['platform'])
+    ).values(group=user['group']).execution_options(synchronize_session=False)
+
+    result = await db.execute(statement)
+    await db.commit()
+
+    if result.rowcount > 0:
+        await _changed(UserProfile(user['user_id'], user['group'], user['platform']))
         return True
     else:
-       return False
+        invalidate_user(user['user_id'], user['platform'])
+        return False
+
+@timed(PHASE_DB)
+async def upsert_user(user, db: Session):
+    statement = _insert(db).values(
+        user_id=user['user_id'], group=user['group'], platform=user['platform']
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=USER_KEY, set_={'group': statement.excluded.group})
+
+    await db.execute(statement)
+    await db.commit()
+
+    await _changed(UserProfile(user['user_id'], user['group'], user['platform']))
 
-async def get_user(user_id: str, db: Session):
-    return db.query(User).filter(User.user_id == user_id).first()
+@timed(PHASE_DB)
+async def get_user(user_id: str, platform: str, db: Session) -> Optional[UserProfile]:
+    profile, version = await _cached(user_id, platform)
+    if profile is not None:
+        return profile
+
+    result = await db.execute(
+        select(User.user_id, User.group, User.platform).where(*_user_filter(user_id, platform)))
+    row = result.first()
+
+    if row is None:
+        return None
+
+    return _remember(UserProfile(row.user_id, row.group, row.platform), version)
 
 
 async def delete_user(user_id: str, db: Session):
     pass
 
 async def get_users(db: Session):
-    return db.query(User).all()
+    result = await db.execute(select(User))
+    return result.scalars().all()
+
+async def get_active_groups(db: Session, limit: int) -> list[str]:
+    """Возвращает группы пользователей, начиная с групп с наибольшим числом пользователей"""
+    users_count = func.count(User.id)
+
+    result = await db.execute(
+        select(User.group).where(User.group != '').group_by(User.group)
+        .order_by(users_count.desc(), func.max(User.id).desc()).limit(limit))
+
+    return list(result.scalars())
@@ -1,26 +1,36 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Index, DateTime
 
-from ..core.config import DATABASE_HOST, DATABASE_PORT, DATABASE_USER, DATABASE_NAME, DATABASE_PASSWORD
+from ..core.config import (DATABASE_HOST, DATABASE_PORT, DATABASE_USER, DATABASE_NAME, DATABASE_PASSWORD,
+                           DATABASE_POOL_SIZE, DATABASE_MAX_OVERFLOW, DATABASE_POOL_TIMEOUT, DATABASE_POOL_RECYCLE)
 
-engine_postrgesql = create_engine(
-    f'postgresql+psycopg2://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}')
-Session = sessionmaker(bind=engine_postrgesql)
-Base = declarative_base(bind=engine_postrgesql)
+engine_postrgesql = create_async_engine(
+    f'postgresql+asyncpg://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}',
+    pool_size=DATABASE_POOL_SIZE,
+    max_overflow=DATABASE_MAX_OVERFLOW,
+    pool_timeout=DATABASE_POOL_TIMEOUT,
+    pool_recycle=DATABASE_POOL_RECYCLE,
+    pool_pre_ping=True)
+Session = sessionmaker(bind=engine_postrgesql, class_=AsyncSession, expire_on_commit=False)
+Base = declarative_base()
 
 
-def get_db():
-    db = Session()
-    try:
+async def get_db():
+    async with Session() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
-    Base.metadata.create_all(engine_postrgesql)
+async def init_db():
+    from .migrate import upgrade_schema
+
+    async with engine_postrgesql.begin() as connection:
+        await upgrade_schema(connection)
+
+
+async def close_db():
+    await engine_postrgesql.dispose()
 
 
 class User(Base):
@@ -29,3 +39,18 @@ class User(Base):
     user_id = Column(String(512))
     group = Column(String(10))
     platform = Column(String(512))
+
+    __table_args__ = (
+        Index('ix_user_platform_user_id', 'platform', 'user_id', unique=True),
+    )
+
+
+class FallbackUtterance(Base):
+    """Нераспознанная фраза за период сводки"""
+    __tablename__ = "fallback_utterance"
+    id = Column(Integer, primary_key=True)
+    text = Column(String(512))
+    count = Column(Integer)
+    platforms = Column(String(64))
+    first_seen = Column(DateTime)
+    last_seen = Column(DateTime)
@@ -1,10 +1,51 @@
-from .database import User
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateIndex
 
-def migrate_test(db):
+from .database import Base, User
+
+# Ключ транзакционной advisory-блокировки, под которой воркеры по очереди обновляют схему
+SCHEMA_LOCK_KEY = 4_213_377_001
+
+
+async def upgrade_schema(connection: AsyncConnection):
+    """Создаёт таблицы и добавляет уникальный индекс (platform, user_id) в уже существующую таблицу пользователей
+
+    Вызывается при старте каждого воркера. В PostgreSQL обновление выполняется под advisory-блокировкой
+    до конца транзакции, поэтому воркеры не создают таблицы и индекс одновременно.
+    Дубликаты удаляются только один раз, пока индекса ещё нет: остаётся самая новая запись пользователя
+    с группой, а если группы нет ни в одной записи - самая новая запись.
+    """
+    if connection.dialect.name != 'postgresql':
+        await connection.run_sync(Base.metadata.create_all)
+
+        for index in User.__table__.indexes:
+            await connection.run_sync(lambda sync_connection, index=index: index.create(sync_connection, checkfirst=True))
+        return
+
+    await connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': SCHEMA_LOCK_KEY})
+    await connection.run_sync(Base.metadata.create_all)
+
+    for index in User.__table__.indexes:
+        exists = await connection.scalar(text('SELECT to_regclass(:name)'), {'name': index.name})
+        if exists is not None:
+            continue
+
+        await connection.execute(text(
+            'DELETE FROM "user" WHERE id IN ('
+            'SELECT id FROM ('
+            'SELECT id, row_number() OVER ('
+            "PARTITION BY platform, user_id ORDER BY COALESCE(\"group\", '') <> '' DESC, id DESC"
+            ') AS position FROM "user"'
+            ') AS ranked WHERE position > 1)'))
+        await connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+async def migrate_test(db):
     test_new_user = User(user_id = "TEST_NEW", group = "", platform = "YANDEX")
     db.add(test_new_user)
-    db.commit()
+    await db.commit()
     
     test_default_user = User(user_id = "TEST_DEFAULT", group = "ИКБО-01-20", platform = "YANDEX")
     db.add(test_default_user)
-    db.commit()
\ No newline at end of file
+    await db.commit()
@@ -0,0 +1,257 @@
+import asyncio
+import datetime
+import logging
+import time
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+import orjson
+
+from ..core.config import (FALLBACK_REPORT_SINK, FALLBACK_REPORT_INTERVAL, FALLBACK_REPORT_MAX_ENTRIES,
+                           FALLBACK_REPORT_TOP, FALLBACK_REPORT_FILE, DISCORD_WEBHOOK_URL)
+from ..core.session import get_session
+from ..crud.fallback import add_fallback_utterances
+from ..database.database import Session
+from ..utils.notifications_utils import DiscordLoggerUtils, DiscordRateLimitError
+from ..utils.task_utils import TaskUtils
+
+logger = logging.getLogger(__name__)
+
+MAX_UTTERANCE_LENGTH = 200
+
+
+class FallbackEntry:
+    """Нераспознанная фраза и сколько раз её сказали за период сводки"""
+
+    __slots__ = ('text', 'count', 'platforms', 'first_seen', 'last_seen')
+
+    def __init__(self, text: str, now: float) -> None:
+        self.text = text
+        self.count = 0
+        self.platforms: set[str] = set()
+        self.first_seen = now
+        self.last_seen = now
+
+    def merge(self, other: 'FallbackEntry') -> None:
+        self.count += other.count
+        self.platforms |= other.platforms
+        self.first_seen = min(self.first_seen, other.first_seen)
+        self.last_seen = max(self.last_seen, other.last_seen)
+
+    def line(self) -> str:
+        return f'{self.count}× «{self.text}» ({", ".join(sorted(self.platforms))})'
+
+
+class FallbackSink(ABC):
+    """Получатель сводки нераспознанных фраз"""
+
+    name = 'none'
+
+    @abstractmethod
+    async def send(self, entries: list[FallbackEntry], started: float, finished: float) -> None:
+        """Отправляет сводку, записи отсортированы по убыванию количества"""
+
+
+class LogSink(FallbackSink):
+    """Сводка одной строкой в лог приложения"""
+
+    name = 'log'
+
+    def __init__(self, top: int) -> None:
+        self.top = top
+
+    async def send(self, entries: list[FallbackEntry], started: float, finished: float) -> None:
+        total = sum(entry.count for entry in entries)
+        lines = '; '.join(entry.line() for entry in entries[:self.top])
+        logger.warning(f'incomprehensible intents: {total} utterances, {len(entries)} unique '
+                       f'in {finished - started:.0f}s: {lines}')
+
+
+class FileSink(FallbackSink):
+    """Сводка строкой JSON в конец файла, запись выполняется в пуле потоков"""
+
+    name = 'file'
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def send(self, entries: list[FallbackEntry], started: float, finished: float) -> None:
+        digest = orjson.dumps({
+            'started': datetime.datetime.fromtimestamp(started).isoformat(),
+            'finished': datetime.datetime.fromtimestamp(finished).isoformat(),
+            'utterances': [
+                {'text': entry.text, 'count': entry.count, 'platforms': sorted(entry.platforms)}
+                for entry in entries
+            ],
+        })
+        await asyncio.to_thread(self._append, digest + b'\n')
+
+    def _append(self, line: bytes) -> None:
+        with open(self.path, 'ab') as file:
+            file.write(line)
+
+
+class DiscordSink(FallbackSink):
+    """Сводка одним сообщением в вебхук Discord"""
+
+    name = 'discord'
+
+    def __init__(self, url: str, top: int) -> None:
+        self.url = url
+        self.top = top
+
+    async def send(self, entries: list[FallbackEntry], started: float, finished: float) -> None:
+        total = sum(entry.count for entry in entries)
+        lines = [entry.line() for entry in entries[:self.top]]
+        if len(entries) > self.top:
+            lines.append(f'и ещё {len(entries) - self.top} фраз')
+
+        footer = f'{total} фраз за {(finished - started) / 60:.0f} мин'
+        notification = DiscordLoggerUtils.make_digest(lines, footer)
+        await DiscordLoggerUtils.send_notification(await get_session(), self.url, notification)
+
+
+class DatabaseSink(FallbackSink):
+    """Сводка в таблицу fallback_utterance"""
+
+    name = 'db'
+
+    async def send(self, entries: list[FallbackEntry], started: float, finished: float) -> None:
+        async with Session() as db:
+            await add_fallback_utterances(db, entries)
+
+
+class FallbackReporter:
+    """Сбор нераспознанных фраз и периодическая отправка их сводки
+
+    report только обновляет счётчик в памяти воркера и не ждёт ввода-вывода, поэтому
+    не замедляет ответ пользователю. Раз в interval секунд накопленные фразы отправляются
+    одной сводкой. Если сводку отправить не удалось, фразы возвращаются в очередь
+    до следующей попытки, а при ограничении частоты отправка откладывается.
+
+    Args:
+        sink (Optional[FallbackSink]): Получатель сводки. None отключает сбор фраз.
+        interval (float): Период сводки в секундах.
+        max_entries (int): Сколько разных фраз хранить, новые фразы сверх лимита отбрасываются.
+        clock (Callable[[], float], optional): Источник времени, по умолчанию time.time.
+    """
+
+    def __init__(self, sink: Optional[FallbackSink], interval: float, max_entries: int,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.sink = sink
+        self.interval = interval
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._pending: dict[str, FallbackEntry] = {}
+        self._started = clock()
+        self._paused_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        self.reported = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+
+    def report(self, platform: str, text: Optional[str]) -> None:
+        if self.sink is None:
+            return
+
+        # Без текста приходят, например, нажатия кнопок и запросы Салюта без фразы
+        text = ' '.join((text or '').casefold().split())[:MAX_UTTERANCE_LENGTH]
+        if not text:
+            return
+
+        entry = self._pending.get(text)
+        if entry is None:
+            if len(self._pending) >= self.max_entries:
+                self.dropped += 1
+                return
+            entry = self._pending[text] = FallbackEntry(text, self.clock())
+
+        entry.count += 1
+        entry.platforms.add(platform)
+        entry.last_seen = self.clock()
+        self.reported += 1
+
+    async def flush(self) -> int:
+        """Отправляет накопленную сводку и возвращает количество фраз в ней"""
+        now = self.clock()
+        if self.sink is None or not self._pending or now < self._paused_until:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        started, self._started = self._started, now
+        entries = sorted(pending.values(), key=lambda entry: entry.count, reverse=True)
+
+        try:
+            await self.sink.send(entries, started, now)
+        except Exception as e:
+            self.failed += 1
+            self._started = started
+            self._restore(entries)
+
+            if isinstance(e, DiscordRateLimitError):
+                self._paused_until = now + e.retry_after
+            logger.warning(f'fallback report to {self.sink.name} failed: {e!r}')
+            return 0
+
+        self.sent += 1
+        return len(entries)
+
+    async def start(self) -> None:
+        if self.sink is not None and (self._task is None or self._task.done()):
+            self._task = TaskUtils.spawn(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'sink': self.sink.name if self.sink is not None else 'none',
+            'pending': len(self._pending),
+            'reported': self.reported,
+            'dropped': self.dropped,
+            'sent': self.sent,
+            'failed': self.failed,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def _restore(self, entries: list[FallbackEntry]) -> None:
+        for entry in entries:
+            current = self._pending.get(entry.text)
+
+            if current is not None:
+                current.merge(entry)
+            elif len(self._pending) < self.max_entries:
+                self._pending[entry.text] = entry
+            else:
+                self.dropped += entry.count
+
+
+def create_fallback_sink(name: str) -> Optional[FallbackSink]:
+    if name == 'log':
+        return LogSink(FALLBACK_REPORT_TOP)
+    if name == 'file':
+        return FileSink(FALLBACK_REPORT_FILE)
+    if name == 'discord' and DISCORD_WEBHOOK_URL:
+        return DiscordSink(DISCORD_WEBHOOK_URL, FALLBACK_REPORT_TOP)
+    if name == 'db':
+        return DatabaseSink()
+    return None
+
+
+fallback_reporter = FallbackReporter(
+    create_fallback_sink(FALLBACK_REPORT_SINK), interval=FALLBACK_REPORT_INTERVAL,
+    max_entries=FALLBACK_REPORT_MAX_ENTRIES)
@@ -6,14 +6,16 @@ from aiohttp import ClientSession
 from functools import lru_cache
 
 from fastapi import Depends
-from typing import Union, Any, Awaitable
+from typing import Union, Any, Awaitable, Optional
 from starlette.requests import Request
 
+from ...core.dialog import intents as dialog_intents
+from ...core.dialog.engine import dialog_engine
+from ...core.metrics import PHASE_SERIALIZATION, measure
 from ...core.session import get_session
+from ...core.sber.adapter import sber_adapter
+from ...core.sber.pending import pending_groups
 from ...assistants.sber.request import SberRequest
-from ...core.sber.scenes import Welcome, SCENES, WelcomeDefault
-from ...core.sber.state import STATE_REQUEST_KEY
-from ...crud.user import create_user, get_user
 from ...database.database import get_db, Session
 
 logger = logging.getLogger(__name__)
@@ -31,53 +33,24 @@ class SberVoiceAssistantService(VoiceAssistantServiceBase):
         self.session = session
         self.db = db
 
-    async def parse_request_and_routing(self, request: Request) -> dict[str, Any]:
+    async def parse_request_and_routing(self, request: Request, deadline: Optional[float] = None) -> Union[bytes, dict[str, Any]]:
 
         event = await request.json()
 
         request = SberRequest(request_body=event, session=self.session, db=self.db)
-        current_scene_id = event.get('payload', {}).get('intent')
-
-        if current_scene_id is None or current_scene_id == "run_app":
-
-            if request.sub != '':
-                user_id = request.sub
-
-                if await get_user(user_id, self.db) != None:
-                    return await WelcomeDefault().reply(request)
-                else:
-
-                    user = {
-                        "user_id": user_id, 
-                        "group": "",
-                        "platform": "SBER"
-                    }
-
-                    await create_user(user, self.db)
-                    return await Welcome().reply(request)
-
-            elif request.user_id != '':
-                user_id = request.user_id
-
-                if await get_user(user_id, self.db) != None:
-                    return await WelcomeDefault().reply(request)
-                else:
-                    user = {
-                        "user_id": user_id,
-                        "group": "",
-                        "platform": "SBER"
-                    }
-
-                    await create_user(user, self.db)
-                    return await Welcome().reply(request)
-                    
-        current_scene = SCENES.get(current_scene_id, Welcome)()
-        next_scene = current_scene.move(request)
-
-        if next_scene is not None:
-            return await next_scene.reply(request)
-        else:
-            return await current_scene.fallback(request)
+        dialog = sber_adapter.to_dialog(request)
+
+        # Салют не возвращает состояние сессии: группу для подтверждения берём из запомненной при её выборе
+        if dialog_intents.CONFIRM in dialog.intents:
+            dialog = dialog._replace(group=await pending_groups.get(dialog.user_id))
+
+        reply = await dialog_engine.handle_before(dialog, deadline)
+
+        if reply.group is not None:
+            await pending_groups.set(dialog.user_id, reply.group)
+
+        with measure(PHASE_SERIALIZATION):
+            return sber_adapter.respond(reply, request)
 
 
 @lru_cache()
@@ -0,0 +1,49 @@
+from typing import Hashable, NamedTuple, Optional
+
+from ...core.config import ANSWER_CACHE_SIZE
+from ...utils.cache_utils import TTLCache
+from ...utils.schedule_utils import ScheduleUtils
+from .timetable import Timetable
+
+ANSWER_COUNT = 'count'
+ANSWER_LIST = 'list'
+
+
+class RenderedAnswer(NamedTuple):
+    text: str
+    tts: str
+    version: int
+
+
+class AnswerCache:
+    """Кэш готовых ответов о расписании группы на конкретную дату
+
+    Ответ одинаков для всех студентов группы на любой платформе, поэтому ключ - (группа, дата, вид запроса, ...).
+    Ответ устаревает, когда меняется расписание группы или в Москве наступает полночь.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.cache = TTLCache(maxsize=maxsize, ttl=24 * 3600)
+        self.invalidations = 0
+
+    def get(self, key: Hashable, timetable: Timetable) -> Optional[RenderedAnswer]:
+        answer = self.cache.get(key)
+
+        if answer is not None and answer.version != timetable.version:
+            self.cache.pop(key)
+            self.invalidations += 1
+            return None
+
+        return answer
+
+    def set(self, key: Hashable, timetable: Timetable, text: str, tts: Optional[str] = None) -> RenderedAnswer:
+        answer = RenderedAnswer(text, text if tts is None else tts, timetable.version)
+        self.cache.set(key, answer, ttl=ScheduleUtils.seconds_until_midnight())
+        return answer
+
+    @property
+    def stats(self) -> dict:
+        return {**self.cache.stats, 'invalidations': self.invalidations}
+
+
+answer_cache = AnswerCache(maxsize=ANSWER_CACHE_SIZE)
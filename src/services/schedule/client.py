@@ -0,0 +1,384 @@
+import asyncio
+import hashlib
+import logging
+import time
+
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+import orjson
+
+from aiohttp import ClientResponseError, ClientSession
+
+from ...core.config import (SCHEDULE_API_URL, SCHEDULE_CACHE_TTL, SCHEDULE_CACHE_SIZE, SCHEDULE_STALE_TTL,
+                            SCHEDULE_BREAKER_FAILURES, SCHEDULE_BREAKER_RESET)
+from ...core.metrics import PHASE_UPSTREAM, measure
+from ...utils.breaker_utils import CircuitBreaker
+from ...utils.cache_utils import TTLCache, SingleFlight
+from ...utils.task_utils import TaskUtils
+from .shared import SharedCache, shared_cache
+from .snapshot import SnapshotStore, schedule_snapshots
+from .timetable import Timetable
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleUnavailableError(Exception):
+    """API расписания недоступно, а сохранённого расписания группы нет"""
+
+
+class UpstreamResponse(NamedTuple):
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class StoredResponse(NamedTuple):
+    """Ответ API из общего кэша воркеров или снимка на диске"""
+    payload: Any
+    age: float
+    validators: Optional[dict[str, Any]] = None
+
+
+class ScheduleApiClient:
+    """Клиент API расписания с общим для всех платформ кэшем расписаний групп
+
+    Расписание группы компилируется в Timetable один раз при загрузке.
+    При промахе кэша одновременные запросы расписания одной группы
+    объединяются в один запрос к API.
+    Клиент помнит недавно запрошенные группы, чтобы фоновое обновление начиналось с них.
+
+    Истёкшее расписание отдаётся сразу и обновляется в фоне, пока оно не старше stale_ttl кэша.
+    Обращения к API идут через размыкатель цепи: пока API недоступно, запросы без
+    сохранённого расписания сразу завершаются ScheduleUnavailableError, как и любая ошибка загрузки.
+
+    Загруженные ответы API сохраняются в снимки на диске. При промахе кэша сначала читается
+    снимок, поэтому только что запущенный воркер отвечает без обращения к API,
+    а устаревший снимок обновляется в фоне.
+
+    Ещё раньше снимков проверяется общий кэш воркеров: ответ, загруженный одним воркером,
+    сразу доступен остальным, в том числе при фоновом обновлении.
+
+    Расписание обновляется условным запросом с валидаторами прошлого ответа (ETag, Last-Modified).
+    Если API ответило 304 или прислало то же содержимое, что и раньше, прежний Timetable
+    остаётся в кэше без повторного разбора и компиляции, а вместе с ним и готовые ответы.
+    Валидаторы и хэш содержимого хранятся вместе с ответом в общем кэше и снимках, поэтому
+    расписание, восстановленное после перезапуска, тоже обновляется условным запросом.
+
+    Args:
+        base_url (str): Адрес API расписания.
+        cache (TTLCache): Кэш расписаний групп.
+        breaker (CircuitBreaker, optional): Размыкатель цепи для обращений к API.
+        snapshots (SnapshotStore, optional): Хранилище снимков ответов API.
+        shared (SharedCache, optional): Общий кэш воркеров.
+    """
+
+    def __init__(self, base_url: str, cache: TTLCache, breaker: Optional[CircuitBreaker] = None,
+                 snapshots: Optional[SnapshotStore] = None, shared: Optional[SharedCache] = None) -> None:
+        self.base_url = base_url
+        self.cache = cache
+        self.breaker = breaker or CircuitBreaker(SCHEDULE_BREAKER_FAILURES, SCHEDULE_BREAKER_RESET)
+        self.snapshots = snapshots
+        self.shared = shared
+        self.inflight = SingleFlight()
+        self.recent: OrderedDict[str, None] = OrderedDict()
+
+        self.stale_served = 0
+        self.revalidated = 0
+        self.restored = 0
+        self.shared_adopted = 0
+
+        self.revalidations = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.bytes_saved = 0
+
+    async def get_schedule(self, session: ClientSession, group: str) -> Timetable:
+        self._touch(group)
+        schedule = self.cache.get(group)
+
+        if schedule is not None:
+            return schedule
+
+        schedule = self.cache.get_stale(group)
+
+        if schedule is not None:
+            self.stale_served += 1
+            if group not in self.inflight:
+                TaskUtils.spawn(self._revalidate(session, group))
+            return schedule
+
+        try:
+            schedule = await self.inflight.do(group, lambda: self._restore_or_load(session, group))
+        except Exception as e:
+            raise ScheduleUnavailableError(group) from e
+
+        # Расписание из устаревшего снимка отдаётся сразу, а обновляется в фоне
+        if group not in self.cache and group not in self.inflight:
+            TaskUtils.spawn(self._revalidate(session, group))
+
+        return schedule
+
+    async def get_groups(self, session: ClientSession) -> dict[str, Any]:
+        groups = orjson.loads((await self._request(session, "groups")).body)
+        self._publish("groups", groups)
+        return groups
+
+    async def restore(self, key: str) -> Optional[StoredResponse]:
+        """Возвращает сохранённый ответ API, его возраст в секундах и валидаторы"""
+        shared = await self._load_shared(key)
+        if shared is not None:
+            return shared
+
+        if self.snapshots is None:
+            return None
+
+        snapshot = await self.snapshots.load(key)
+        if snapshot is None:
+            return None
+
+        return StoredResponse(snapshot.payload, self.snapshots.age(snapshot), snapshot.validators)
+
+    async def refresh(self, session: ClientSession, group: str) -> Timetable:
+        """Загружает расписание группы заново, даже если оно ещё есть в кэше"""
+        return await self.inflight.do(group, lambda: self._refresh_schedule(session, group))
+
+    def expires_in(self, group: str) -> Optional[float]:
+        return self.cache.expires_in(group)
+
+    def recent_groups(self) -> list[str]:
+        """Возвращает группы в порядке последнего обращения, начиная с самой свежей"""
+        return list(reversed(self.recent))
+
+    def invalidate(self, group: str) -> None:
+        self.cache.pop(group)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'cache': self.cache.stats,
+            'inflight': self.inflight.stats,
+            'breaker': self.breaker.stats,
+            'stale_served': self.stale_served,
+            'revalidated': self.revalidated,
+            'restored': self.restored,
+            'shared_adopted': self.shared_adopted,
+            'conditional': {
+                'revalidations': self.revalidations,
+                'not_modified': self.not_modified,
+                'unchanged': self.unchanged,
+                'bytes_saved': self.bytes_saved,
+                'hit_ratio': (self.not_modified + self.unchanged) / self.revalidations if self.revalidations else 0.0,
+            },
+            'snapshots': self.snapshots.stats if self.snapshots is not None else None,
+            'shared': self.shared.stats if self.shared is not None else None,
+        }
+
+    def _touch(self, group: str) -> None:
+        self.recent[group] = None
+        self.recent.move_to_end(group)
+
+        if len(self.recent) > self.cache.maxsize:
+            self.recent.popitem(last=False)
+
+    async def _revalidate(self, session: ClientSession, group: str) -> None:
+        try:
+            await self.refresh(session, group)
+            self.revalidated += 1
+        except Exception as e:
+            logger.warning(f'stale schedule refresh failed for {group}: {e!r}')
+
+    async def _restore_or_load(self, session: ClientSession, group: str) -> Timetable:
+        restored = await self.restore(group)
+
+        if restored is None:
+            return await self._load_schedule(session, group)
+
+        return self._adopt_restored(group, restored)
+
+    def _adopt_restored(self, group: str, restored: StoredResponse) -> Timetable:
+        schedule = self._compile(group, restored.payload, restored.validators)
+        self.cache.set(group, schedule, ttl=max(self.cache.ttl - restored.age, 0))
+        self.restored += 1
+
+        return schedule
+
+    async def _refresh_schedule(self, session: ClientSession, group: str) -> Timetable:
+        if self.cache.get_stale(group) is None:
+            return await self._restore_or_revalidate(session, group)
+
+        shared = await self._load_shared(group)
+
+        if shared is not None:
+            ttl = self.cache.ttl - shared.age
+
+            # Другой воркер уже обновил расписание: берём его ответ, не обращаясь к API
+            if ttl >= max(self.cache.expires_in(group) or 0, self.cache.ttl / 2):
+                schedule = self._compile(group, shared.payload, shared.validators)
+                self.cache.set(group, schedule, ttl=ttl)
+                self.shared_adopted += 1
+                return schedule
+
+        return await self._load_schedule(session, group)
+
+    async def _restore_or_revalidate(self, session: ClientSession, group: str) -> Timetable:
+        """Обновляет расписание группы, которой нет в кэше, например сразу после перезапуска воркера
+
+        Сначала расписание восстанавливается из общего кэша или снимка. Свежее восстановленное
+        расписание остаётся в кэше без обращения к API, а устаревшее обновляется условным запросом.
+        """
+        restored = await self.restore(group)
+
+        if restored is None:
+            return await self._load_schedule(session, group)
+
+        schedule = self._adopt_restored(group, restored)
+
+        if self.cache.expires_in(group) >= self.cache.ttl / 2:
+            return schedule
+
+        return await self._load_schedule(session, group, schedule)
+
+    async def _load_schedule(self, session: ClientSession, group: str, current: Optional[Timetable] = None) -> Timetable:
+        if current is None:
+            current = self.cache.get_stale(group)
+        headers = self._conditional_headers(current)
+
+        if headers:
+            self.revalidations += 1
+
+        response = await self._request(session, f"{group}/full_schedule", headers)
+
+        if current is not None and response.status == 304:
+            self.not_modified += 1
+            self.bytes_saved += current.size
+            return self._keep(current, response)
+
+        content_hash = hashlib.sha1(response.body).hexdigest()
+
+        if current is not None and current.content_hash == content_hash:
+            self.unchanged += 1
+            return self._keep(current, response)
+
+        payload = orjson.loads(response.body)
+        validators = {
+            'etag': response.etag,
+            'last_modified': response.last_modified,
+            'content_hash': content_hash,
+            'size': len(response.body),
+        }
+        schedule = self._compile(group, payload, validators)
+
+        self.cache.set(group, schedule)
+        self._publish(group, payload, validators)
+        return schedule
+
+    @staticmethod
+    def _compile(group: str, payload: Any, validators: Optional[dict[str, Any]] = None) -> Timetable:
+        schedule = Timetable(group, payload)
+
+        if validators:
+            schedule.etag = validators.get('etag')
+            schedule.last_modified = validators.get('last_modified')
+            schedule.content_hash = validators.get('content_hash')
+            schedule.size = validators.get('size') or 0
+
+        return schedule
+
+    def _keep(self, schedule: Timetable, response: UpstreamResponse) -> Timetable:
+        """Продлевает жизнь прежнего расписания, когда API подтвердило, что оно не изменилось"""
+        schedule.etag = response.etag or schedule.etag
+        schedule.last_modified = response.last_modified or schedule.last_modified
+
+        self.cache.set(schedule.group, schedule)
+        TaskUtils.spawn(self._republish(schedule))
+        return schedule
+
+    async def _republish(self, schedule: Timetable) -> None:
+        """Продлевает сохранённый ответ API в общем кэше и снимке, чтобы они не устарели раньше кэша воркера
+
+        Разобранный ответ в Timetable не хранится, поэтому он перечитывается из общего кэша или снимка
+        и сохраняется заново, только если там то же содержимое, что подтвердило API.
+        """
+        stored = await self.restore(schedule.group)
+
+        if stored is None or (stored.validators or {}).get('content_hash') != schedule.content_hash:
+            return
+
+        self._publish(schedule.group, stored.payload, {
+            'etag': schedule.etag,
+            'last_modified': schedule.last_modified,
+            'content_hash': schedule.content_hash,
+            'size': schedule.size,
+        })
+
+    @staticmethod
+    def _conditional_headers(schedule: Optional[Timetable]) -> dict[str, str]:
+        headers = {}
+
+        if schedule is not None and schedule.etag:
+            headers['If-None-Match'] = schedule.etag
+        if schedule is not None and schedule.last_modified:
+            headers['If-Modified-Since'] = schedule.last_modified
+
+        return headers
+
+    async def _load_shared(self, key: str) -> Optional[StoredResponse]:
+        if self.shared is None:
+            return None
+
+        value = await self.shared.get(key)
+        if value is None:
+            return None
+
+        entry = orjson.loads(value)
+        return StoredResponse(entry['payload'], max(time.time() - entry['fetched_at'], 0.0), entry.get('validators'))
+
+    def _publish(self, key: str, payload: Any, validators: Optional[dict[str, Any]] = None) -> None:
+        """Сохраняет ответ API в общий кэш воркеров и в снимок на диске, не задерживая ответ"""
+        if self.shared is not None:
+            value = orjson.dumps({'fetched_at': time.time(), 'payload': payload, 'validators': validators})
+            TaskUtils.spawn(self.shared.set(key, value, ttl=self.cache.ttl + self.cache.stale_ttl))
+
+        if self.snapshots is not None:
+            TaskUtils.spawn(self.snapshots.save(key, payload, validators))
+
+    async def _request(self, session: ClientSession, path: str, headers: Optional[dict[str, str]] = None) -> UpstreamResponse:
+        self.breaker.check()
+
+        try:
+            with measure(PHASE_UPSTREAM):
+                result = await self._fetch(session, path, headers)
+        except ClientResponseError as e:
+            # Ответ 4xx означает, что API работает, а запрос неверный
+            if e.status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Отмену по сроку ответа или при остановке воркера нельзя считать ошибкой API
+            self.breaker.release()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    async def _fetch(self, session: ClientSession, path: str, headers: Optional[dict[str, str]] = None) -> UpstreamResponse:
+        async with session.get(url=f"{self.base_url}/{path}", headers=headers) as response:
+            response.raise_for_status()
+
+            return UpstreamResponse(
+                response.status,
+                b'' if response.status == 304 else await response.read(),
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'))
+
+
+schedule_api = ScheduleApiClient(
+    SCHEDULE_API_URL, TTLCache(maxsize=SCHEDULE_CACHE_SIZE, ttl=SCHEDULE_CACHE_TTL, stale_ttl=SCHEDULE_STALE_TTL),
+    snapshots=schedule_snapshots, shared=shared_cache)
@@ -0,0 +1,183 @@
+import difflib
+import heapq
+import logging
+import re
+import time
+
+from collections import Counter
+from typing import Callable, Optional
+
+from aiohttp import ClientSession
+
+from ...core.config import GROUPS_REFRESH_INTERVAL
+from ...core.session import get_session
+from ...utils.cache_utils import SingleFlight
+from ...utils.task_utils import TaskUtils
+from .client import ScheduleApiClient, schedule_api
+
+logger = logging.getLogger(__name__)
+
+_NOT_ALNUM = re.compile(r'[^0-9A-ZА-ЯЁ]')
+_LONG_WORD = re.compile(r'[а-яА-ЯёЁa-zA-Z]{5,}')
+_GROUP_NAME = re.compile(r'^([А-ЯЁA-Z]+)-(\d\d)-(\d\d)$')
+_GROUP_NUMBER = re.compile(r'\d\d')
+
+_FUZZY_CANDIDATES = 5
+
+
+def normalize_group(group: str) -> str:
+    return _NOT_ALNUM.sub('', group.upper())
+
+
+def _trigrams(value: str) -> set[str]:
+    value = f'^{value}$'
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class _GroupIndex:
+    """Неизменяемый набор индексов по списку групп, строится один раз при загрузке"""
+
+    def __init__(self, groups: list[str]) -> None:
+        self.groups = groups
+        self.exact: dict[str, str] = {}
+        self.by_number: dict[str, list[tuple[str, str, str]]] = {}
+        self.by_trigram: dict[str, list[int]] = {}
+
+        for position, group in enumerate(groups):
+            normalized = normalize_group(group)
+            self.exact.setdefault(normalized, group)
+
+            match = _GROUP_NAME.match(group.upper())
+            if match:
+                letters, number, year = match.groups()
+                self.by_number.setdefault(number, []).append((letters, year, group))
+
+            for trigram in _trigrams(normalized):
+                self.by_trigram.setdefault(trigram, []).append(position)
+
+    def find_by_number(self, letters: str, number: str, year: str) -> Optional[str]:
+        for group_letters, group_year, group in self.by_number.get(number, ()):
+            if letters not in group_letters:
+                continue
+
+            if len(year) == 0:
+                return group
+            elif len(year) == 2 and group_year == year:
+                return group
+            elif len(year) == 1 and group_year[0] == year:
+                return group
+
+        return None
+
+    def find_fuzzy(self, user_group: str) -> Optional[str]:
+        counter = Counter()
+        for trigram in _trigrams(normalize_group(user_group)):
+            counter.update(self.by_trigram.get(trigram, ()))
+
+        if not counter:
+            return None
+
+        candidates = heapq.nlargest(_FUZZY_CANDIDATES, counter, key=counter.get)
+        user_group = user_group.lower()
+
+        return max(
+            (self.groups[position] for position in candidates),
+            key=lambda group: difflib.SequenceMatcher(None, user_group, group.lower()).ratio())
+
+
+class GroupDirectory:
+    """Справочник учебных групп
+
+    Список групп загружается один раз и обновляется в фоне, когда устаревает.
+    Поиск группы по словам пользователя не зависит от количества групп:
+    точное совпадение, индекс по номеру группы и триграммный индекс для нечёткого поиска.
+
+    Args:
+        api (ScheduleApiClient): Клиент API расписания.
+        refresh_interval (float): Через сколько секунд список групп считается устаревшим.
+    """
+
+    def __init__(self, api: ScheduleApiClient, refresh_interval: float, timer: Callable[[], float] = time.monotonic) -> None:
+        self.api = api
+        self.refresh_interval = refresh_interval
+        self.timer = timer
+
+        self.loaded_at: Optional[float] = None
+        self._index = _GroupIndex([])
+        self._flight = SingleFlight()
+
+    @property
+    def groups(self) -> list[str]:
+        return self._index.groups
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or self.timer() - self.loaded_at >= self.refresh_interval
+
+    def load(self, groups: list[str], age: float = 0) -> None:
+        self._index = _GroupIndex(list(groups))
+        self.loaded_at = self.timer() - age
+
+    async def refresh(self, session: ClientSession) -> None:
+        await self._flight.do('groups', lambda: self._download(session))
+
+    async def get(self, session: ClientSession) -> 'GroupDirectory':
+        if self.loaded_at is None:
+            await self.refresh(session)
+        elif self.is_stale and len(self._flight) == 0:
+            TaskUtils.spawn(self._refresh_quietly(session))
+
+        return self
+
+    async def warm_up(self) -> None:
+        """Загружает список групп из снимка и обновляет его в фоне, не задерживая старт приложения"""
+        restored = await self.api.restore('groups')
+
+        if restored is not None:
+            self.load(restored.payload['groups'], age=restored.age)
+            logger.info(f'groups directory restored from snapshot: {len(self.groups)} groups')
+
+        if self.is_stale:
+            TaskUtils.spawn(self._refresh_quietly(await get_session()))
+
+    def resolve(self, user_group: str) -> Optional[str]:
+        """Возвращает название группы по словам пользователя, например "икбо - 01 - 20"
+
+        Args:
+            user_group (str): Группа в том виде, в котором её назвал пользователь.
+        """
+        user_group = user_group.replace(' ', '')
+
+        if len(user_group) < 5 or len(user_group) > 10:
+            return None
+
+        if _LONG_WORD.search(user_group):
+            return None
+
+        index = self._index
+
+        group = index.exact.get(normalize_group(user_group))
+        if group is not None:
+            return group
+
+        number = _GROUP_NUMBER.search(user_group)
+        if number:
+            letters = normalize_group(user_group[:number.start()])
+            year = ''.join(re.findall(r'\d', user_group[number.end():]))
+            return index.find_by_number(letters, number.group(0), year)
+
+        return index.find_fuzzy(user_group)
+
+    async def _download(self, session: ClientSession) -> None:
+        groups_json = await self.api.get_groups(session)
+        self.load(groups_json['groups'])
+        logger.info(f'groups directory loaded: {len(self.groups)} groups')
+
+    async def _refresh_quietly(self, session: ClientSession) -> None:
+        try:
+            await self.refresh(session)
+        except Exception as e:
+            logger.error(f'groups directory refresh failed: {e!r}')
+
+
+group_directory = GroupDirectory(schedule_api, refresh_interval=GROUPS_REFRESH_INTERVAL)
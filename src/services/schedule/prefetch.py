@@ -0,0 +1,133 @@
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Optional
+
+from aiohttp import ClientSession
+
+from ...core.config import (PREFETCH_ENABLED, PREFETCH_INTERVAL, PREFETCH_CONCURRENCY, PREFETCH_PACE,
+                            PREFETCH_REFRESH_AHEAD, PREFETCH_GROUPS_LIMIT)
+from ...core.session import get_pool_stats, get_session
+from ...crud.user import get_active_groups
+from ...database.database import Session
+from ...utils.task_utils import TaskUtils
+from .client import ScheduleApiClient, schedule_api
+
+logger = logging.getLogger(__name__)
+
+
+async def load_active_groups() -> list[str]:
+    async with Session() as db:
+        return await get_active_groups(db, PREFETCH_GROUPS_LIMIT)
+
+
+class SchedulePrefetcher:
+    """Фоновый прогрев кэша расписаний групп пользователей
+
+    Раз в interval секунд берёт недавно запрошенные группы и группы пользователей из базы
+    и загружает расписания, которых нет в кэше или которые истекут в ближайшие refresh_ahead секунд.
+    Загрузка идёт не более чем в concurrency потоков с паузой pace после каждой группы
+    и приостанавливается, пока в пуле HTTP-соединений есть ожидающие запросы вебхуков.
+
+    Args:
+        api (ScheduleApiClient): Клиент API расписания.
+        load_groups (Callable[[], Awaitable[list[str]]]): Источник групп пользователей.
+        interval (float): Пауза между проходами в секундах.
+        concurrency (int): Количество одновременных загрузок.
+        pace (float): Пауза после каждой загрузки в секундах.
+        refresh_ahead (float): За сколько секунд до истечения записи её нужно обновить.
+    """
+
+    def __init__(self, api: ScheduleApiClient, load_groups: Callable[[], Awaitable[list[str]]],
+                 interval: float, concurrency: int, pace: float, refresh_ahead: float) -> None:
+        self.api = api
+        self.load_groups = load_groups
+        self.interval = interval
+        self.concurrency = concurrency
+        self.pace = pace
+        self.refresh_ahead = refresh_ahead
+
+        self._task: Optional[asyncio.Task] = None
+
+        self.cycles = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = TaskUtils.spawn(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def due_groups(self, groups: list[str]) -> list[str]:
+        """Возвращает группы без дубликатов, расписание которых отсутствует в кэше или скоро истечёт"""
+        due = []
+
+        for group in dict.fromkeys(groups):
+            expires_in = self.api.expires_in(group)
+            if expires_in is None or expires_in <= self.refresh_ahead:
+                due.append(group)
+
+        return due
+
+    async def prefetch(self, session: ClientSession) -> int:
+        """Выполняет один проход прогрева и возвращает количество обновлённых групп"""
+        groups = self.api.recent_groups() + await self.load_groups()
+        queue = iter(self.due_groups(groups))
+        refreshed = self.refreshed
+
+        async def worker():
+            for group in queue:
+                await self._wait_for_idle_pool()
+                await self._refresh(session, group)
+                await asyncio.sleep(self.pace)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self.cycles += 1
+
+        return self.refreshed - refreshed
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'cycles': self.cycles,
+            'refreshed': self.refreshed,
+            'failed': self.failed,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refreshed = await self.prefetch(await get_session())
+                logger.info(f'schedule prefetch: {refreshed} groups refreshed')
+            except Exception as e:
+                logger.error(f'schedule prefetch failed: {e!r}')
+
+            await asyncio.sleep(self.interval)
+
+    async def _wait_for_idle_pool(self) -> None:
+        while get_pool_stats()['waiting'] > 0:
+            await asyncio.sleep(self.pace)
+
+    async def _refresh(self, session: ClientSession, group: str) -> None:
+        try:
+            await self.api.refresh(session, group)
+            self.refreshed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f'schedule prefetch failed for {group}: {e!r}')
+
+
+schedule_prefetcher = SchedulePrefetcher(
+    schedule_api, load_active_groups, interval=PREFETCH_INTERVAL, concurrency=PREFETCH_CONCURRENCY,
+    pace=PREFETCH_PACE, refresh_ahead=PREFETCH_REFRESH_AHEAD)
+
+
+async def start_prefetcher() -> None:
+    if PREFETCH_ENABLED:
+        await schedule_prefetcher.start()
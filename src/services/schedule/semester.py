@@ -0,0 +1,97 @@
+import datetime
+
+from typing import Iterable, NamedTuple
+
+from ...core.config import CALENDAR_HOLIDAYS, SEMESTER_START_AUTUMN, SEMESTER_START_SPRING
+from .timetable import WEEKS_IN_SEMESTER
+
+
+class CalendarDay(NamedTuple):
+    date: datetime.date
+    week: int
+    parity: str
+    holiday: bool
+    session: bool
+
+
+def _month_day(value: str) -> tuple[int, int]:
+    month, day = value.split('-')
+    return int(month), int(day)
+
+
+class SemesterCalendar:
+    """Учебный календарь
+
+    Для каждого семестра один раз строится таблица дата -> (учебная неделя, чётность, праздник, сессия),
+    после чего любая дата семестра определяется одним обращением к словарю.
+    Семестр длится от своего начала до начала следующего, недели после учебных считаются сессией.
+
+    Args:
+        autumn_start (str): Начало осеннего семестра, MM-DD.
+        spring_start (str): Начало весеннего семестра, MM-DD.
+        holidays (Iterable[str]): Праздники: YYYY-MM-DD или ежегодные MM-DD.
+        study_weeks (int): Количество учебных недель в семестре.
+    """
+
+    def __init__(self, autumn_start: str, spring_start: str, holidays: Iterable[str] = (), study_weeks: int = WEEKS_IN_SEMESTER) -> None:
+        self.autumn_start = _month_day(autumn_start)
+        self.spring_start = _month_day(spring_start)
+        self.study_weeks = study_weeks
+
+        self.holidays: set[datetime.date] = set()
+        self.annual_holidays: set[tuple[int, int]] = set()
+
+        for holiday in holidays:
+            if holiday.count('-') == 2:
+                self.holidays.add(datetime.date.fromisoformat(holiday))
+            else:
+                self.annual_holidays.add(_month_day(holiday))
+
+        self._days: dict[datetime.date, CalendarDay] = {}
+
+    def day(self, date: datetime.date) -> CalendarDay:
+        """Возвращает учебную неделю и признаки дня
+
+        Args:
+            date (datetime.date): Дата по московскому времени.
+        """
+        if isinstance(date, datetime.datetime):
+            date = date.date()
+
+        calendar_day = self._days.get(date)
+        if calendar_day is None:
+            self._build(*self.semester_bounds(date))
+            calendar_day = self._days[date]
+
+        return calendar_day
+
+    def week(self, date: datetime.date) -> int:
+        return self.day(date).week
+
+    def semester_bounds(self, date: datetime.date) -> tuple[datetime.date, datetime.date]:
+        """Возвращает начало семестра, в который попадает дата, и начало следующего"""
+        starts = sorted(
+            datetime.date(year, *month_day)
+            for year in (date.year - 1, date.year, date.year + 1)
+            for month_day in (self.autumn_start, self.spring_start)
+        )
+
+        for start, next_start in zip(starts, starts[1:]):
+            if start <= date < next_start:
+                return start, next_start
+
+        raise ValueError(f'date out of calendar range: {date}')
+
+    def _build(self, start: datetime.date, end: datetime.date) -> None:
+        first_monday = start - datetime.timedelta(days=start.weekday())
+
+        date = start
+        while date < end:
+            week = (date - first_monday).days // 7 + 1
+            holiday = date in self.holidays or (date.month, date.day) in self.annual_holidays
+
+            self._days[date] = CalendarDay(date, week, 'odd' if week % 2 else 'even', holiday, week > self.study_weeks)
+            date += datetime.timedelta(days=1)
+
+
+semester_calendar = SemesterCalendar(SEMESTER_START_AUTUMN, SEMESTER_START_SPRING, CALENDAR_HOLIDAYS)
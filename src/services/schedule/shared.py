@@ -0,0 +1,386 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from contextlib import ExitStack
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+
+from ...core.config import (SHARED_CACHE_BACKEND, SHARED_CACHE_PATH, SHARED_CACHE_SLOTS, SHARED_CACHE_SLOT_SIZE,
+                            REDIS_URL, REDIS_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'voice-helper:'
+
+# Блокировки fcntl не разделяют потоки одного процесса, поэтому у каждого файла есть ещё и своя threading.Lock
+_file_locks: dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path: str) -> threading.Lock:
+    with _file_locks_guard:
+        return _file_locks.setdefault(os.path.realpath(path), threading.Lock())
+
+
+class SharedCache(ABC):
+    """Кэш, общий для всех воркеров: значения - байты, у каждой записи своё время жизни
+
+    Ошибки хранилища не прерывают запрос: чтение считается промахом, запись пропускается.
+    """
+
+    name = 'none'
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        self.hit_latency = 0.0
+        self.hit_latency_max = 0.0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        started = time.perf_counter()
+
+        try:
+            value = await self._get(KEY_PREFIX + key)
+        except Exception as e:
+            self._error('get', e)
+            return None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        latency = time.perf_counter() - started
+        self.hits += 1
+        self.hit_latency += latency
+        self.hit_latency_max = max(self.hit_latency_max, latency)
+
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self._set(KEY_PREFIX + key, value, ttl)
+            self.sets += 1
+        except Exception as e:
+            self._error('set', e)
+
+    async def close(self) -> None:
+        pass
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'backend': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'sets': self.sets,
+            'errors': self.errors,
+            'hit_latency_avg_ms': self.hit_latency / self.hits * 1000 if self.hits else 0.0,
+            'hit_latency_max_ms': self.hit_latency_max * 1000,
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+
+        # Пишем в лог только первые ошибки, чтобы недоступное хранилище не засыпало лог
+        if self.errors <= 3:
+            logger.warning(f'shared cache {self.name} {operation} failed: {error!r}')
+
+
+class NullCache(SharedCache):
+    """Общий кэш отключён: каждый воркер пользуется только своим кэшем"""
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def _set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+
+class MmapCache(SharedCache):
+    """Общий кэш воркеров одного сервера в отображённом в память файле
+
+    Файл разбит на слоты одинакового размера, слот выбирается по хэшу ключа
+    с проверкой нескольких соседних слотов. Слот блокируется на время чтения,
+    а при записи блокируются все проверяемые слоты, и слот выбирается уже под блокировкой,
+    поэтому воркеры не видят частично записанных значений и не перезаписывают друг друга.
+    Значения, которые не помещаются в слот, не сохраняются.
+
+    Блокировки ждут в пуле потоков, чтобы не останавливать цикл событий.
+
+    Args:
+        path (str): Путь к файлу, лучше на tmpfs, например в /dev/shm.
+        slots (int): Количество слотов.
+        slot_size (int): Размер слота в байтах вместе с заголовком.
+    """
+
+    name = 'mmap'
+
+    # Хэш ключа, время истечения по часам системы, длина ключа, длина значения
+    HEADER = struct.Struct('<QdHI')
+    PROBES = 4
+
+    def __init__(self, path: str, slots: int, slot_size: int) -> None:
+        super().__init__()
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+
+        self.too_large = 0
+
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._thread_lock = _file_lock(path)
+
+    async def close(self) -> None:
+        with self._thread_lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = None
+                self._fd = None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats, 'too_large': self.too_large}
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def _set(self, key: str, value: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        encoded = key.encode()
+        key_hash = self._hash(encoded)
+
+        with self._thread_lock:
+            for offset in self._probe(key_hash):
+                with self._locked(offset, fcntl.LOCK_SH):
+                    slot_hash, expires_at, key_length, length = self.HEADER.unpack_from(self._map, offset)
+
+                    if slot_hash != key_hash or expires_at <= time.time():
+                        continue
+
+                    start = offset + self.HEADER.size
+                    if self.HEADER.size + key_length + length > self.slot_size:
+                        continue
+
+                    if self._map[start:start + key_length] == encoded:
+                        return self._map[start + key_length:start + key_length + length]
+
+        return None
+
+    def _write(self, key: str, value: bytes, ttl: float) -> None:
+        encoded = key.encode()
+
+        if self.HEADER.size + len(encoded) + len(value) > self.slot_size:
+            self.too_large += 1
+            return
+
+        key_hash = self._hash(encoded)
+
+        with self._thread_lock, ExitStack() as stack:
+            probes = list(self._probe(key_hash))
+
+            # Слоты блокируются по возрастанию смещения, чтобы воркеры не ждали друг друга по кругу
+            for offset in sorted(probes):
+                stack.enter_context(self._locked(offset, fcntl.LOCK_EX))
+
+            now = time.time()
+            target = None
+
+            for offset in probes:
+                slot_hash, expires_at, _, _ = self.HEADER.unpack_from(self._map, offset)
+                if slot_hash == key_hash:
+                    target = offset
+                    break
+                if target is None and (slot_hash == 0 or expires_at <= now):
+                    target = offset
+
+            # Все слоты заняты живыми записями: вытесняем запись в первом слоте
+            target = probes[0] if target is None else target
+
+            start = target + self.HEADER.size
+            self._map[start:start + len(encoded) + len(value)] = encoded + value
+            self.HEADER.pack_into(self._map, target, key_hash, now + ttl, len(encoded), len(value))
+
+    def _open(self) -> mmap.mmap:
+        if self._map is None:
+            size = self.slots * self.slot_size
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, size)
+
+            self._map = mmap.mmap(self._fd, size)
+
+        return self._map
+
+    def _probe(self, key_hash: int):
+        self._open()
+        first = key_hash % self.slots
+
+        for step in range(min(self.PROBES, self.slots)):
+            yield (first + step) % self.slots * self.slot_size
+
+    def _locked(self, offset: int, operation: int):
+        return _SlotLock(self._fd, offset, self.slot_size, operation)
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        # Ноль означает пустой слот
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little') or 1
+
+
+class _SlotLock:
+
+    def __init__(self, fd: int, offset: int, length: int, operation: int) -> None:
+        self.fd = fd
+        self.offset = offset
+        self.length = length
+        self.operation = operation
+
+    def __enter__(self) -> None:
+        fcntl.lockf(self.fd, self.operation, self.length, self.offset)
+
+    def __exit__(self, *args) -> None:
+        fcntl.lockf(self.fd, fcntl.LOCK_UN, self.length, self.offset)
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisCache(SharedCache):
+    """Общий кэш воркеров нескольких серверов в Redis
+
+    Клиент протокола Redis с одним соединением на воркер: используются только GET и SET с PX.
+    Соединение открывается при первом обращении и переоткрывается после ошибки.
+
+    Args:
+        url (str): Адрес вида redis://[:password@]host[:port][/db].
+        timeout (float): Время ожидания ответа Redis в секундах.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str, timeout: float) -> None:
+        super().__init__()
+        parsed = urlparse(url)
+
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+        self._reader = self._writer = self._loop = self._lock = None
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        return await self._command(b'GET', key.encode())
+
+    async def _set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._command(b'SET', key.encode(), value, b'PX', str(max(int(ttl * 1000), 1)).encode())
+
+    async def _command(self, *args: bytes) -> Any:
+        # Соединение и блокировка привязаны к циклу событий, в котором созданы
+        if self._loop is not asyncio.get_running_loop():
+            await self.close()
+            self._loop = asyncio.get_running_loop()
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._execute(args), self.timeout)
+            except BaseException:
+                if self._writer is not None:
+                    self._writer.close()
+                self._reader = self._writer = None
+                raise
+
+    async def _execute(self, args: tuple[bytes, ...]) -> Any:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+            if self.password is not None:
+                await self._send(b'AUTH', self.password.encode())
+            if self.db:
+                await self._send(b'SELECT', str(self.db).encode())
+
+        return await self._send(*args)
+
+    async def _send(self, *args: bytes) -> Any:
+        self._writer.write(encode_command(args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+
+def encode_command(args: tuple[bytes, ...]) -> bytes:
+    parts = [b'*%d\r\n' % len(args)]
+
+    for arg in args:
+        parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+
+    return b''.join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b'\r\n')
+    kind, value = line[:1], line[1:-2]
+
+    if kind == b'+':
+        return value
+    if kind == b'-':
+        raise RedisError(value.decode())
+    if kind == b':':
+        return int(value)
+    if kind == b'$':
+        length = int(value)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b'*':
+        length = int(value)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+
+    raise RedisError(f'unexpected reply: {line!r}')
+
+
+def create_shared_cache(backend: str) -> SharedCache:
+    if backend == 'mmap':
+        return MmapCache(SHARED_CACHE_PATH, SHARED_CACHE_SLOTS, SHARED_CACHE_SLOT_SIZE)
+    if backend == 'redis':
+        return RedisCache(REDIS_URL, REDIS_TIMEOUT)
+    return NullCache()
+
+
+shared_cache = create_shared_cache(SHARED_CACHE_BACKEND)
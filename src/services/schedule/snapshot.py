@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+from typing import Any, Callable, NamedTuple, Optional
+
+import orjson
+
+from ...core.config import SNAPSHOT_DIR, SNAPSHOT_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(NamedTuple):
+    payload: Any
+    fetched_at: float
+    hash: str
+    # Валидаторы ответа API для условного запроса: etag, last_modified, content_hash, size
+    validators: Optional[dict[str, Any]] = None
+
+
+class SnapshotStore:
+    """Снимки ответов API расписания на диске
+
+    Каждый ответ хранится в отдельном файле: строка заголовка с временем загрузки, хэшем
+    содержимого и валидаторами ответа API, затем сам ответ. Файл заменяется атомарно, поэтому воркеры могут читать
+    снимки друг друга без блокировок. Чтение и запись выполняются в пуле потоков.
+
+    Args:
+        directory (str): Каталог снимков. Пустая строка отключает хранилище.
+        max_age (float): Снимки старше max_age секунд не используются.
+        clock (Callable[[], float], optional): Источник времени, по умолчанию time.time.
+    """
+
+    def __init__(self, directory: str, max_age: float, clock: Callable[[], float] = time.time) -> None:
+        self.directory = directory
+        self.max_age = max_age
+        self.clock = clock
+
+        self.loaded = 0
+        self.missing = 0
+        self.saved = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def age(self, snapshot: Snapshot) -> float:
+        return max(self.clock() - snapshot.fetched_at, 0.0)
+
+    async def load(self, key: str) -> Optional[Snapshot]:
+        if not self.enabled:
+            return None
+
+        try:
+            snapshot = await asyncio.to_thread(self._read, key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f'snapshot {key} is unreadable: {e!r}')
+            return None
+
+        if snapshot is None or self.age(snapshot) >= self.max_age:
+            self.missing += 1
+            return None
+
+        self.loaded += 1
+        return snapshot
+
+    async def save(self, key: str, payload: Any, validators: Optional[dict[str, Any]] = None) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            await asyncio.to_thread(self._write, key, payload, validators)
+            self.saved += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f'snapshot {key} is not saved: {e!r}')
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'loaded': self.loaded,
+            'missing': self.missing,
+            'saved': self.saved,
+            'errors': self.errors,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.snapshot')
+
+    def _read(self, key: str) -> Optional[Snapshot]:
+        try:
+            with open(self._path(key), 'rb') as file:
+                header, body = file.read().split(b'\n', 1)
+        except FileNotFoundError:
+            return None
+
+        header = orjson.loads(header)
+        if header['key'] != key or header['hash'] != hashlib.sha1(body).hexdigest():
+            raise ValueError('snapshot header does not match its content')
+
+        return Snapshot(orjson.loads(body), header['fetched_at'], header['hash'], header.get('validators'))
+
+    def _write(self, key: str, payload: Any, validators: Optional[dict[str, Any]] = None) -> None:
+        body = orjson.dumps(payload)
+        header = orjson.dumps({
+            'key': key,
+            'fetched_at': self.clock(),
+            'hash': hashlib.sha1(body).hexdigest(),
+            'validators': validators,
+        })
+
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(header + b'\n' + body)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+schedule_snapshots = SnapshotStore(SNAPSHOT_DIR, max_age=SNAPSHOT_MAX_AGE)
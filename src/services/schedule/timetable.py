@@ -0,0 +1,90 @@
+import itertools
+
+from typing import Any, NamedTuple, Optional
+
+# Количество учебных недель, на которые раскладываются занятия без явно указанных недель
+WEEKS_IN_SEMESTER = 18
+
+ODD_WEEKS = sum(1 << week for week in range(1, WEEKS_IN_SEMESTER + 1, 2))
+EVEN_WEEKS = sum(1 << week for week in range(2, WEEKS_IN_SEMESTER + 1, 2))
+ALL_WEEKS = ODD_WEEKS | EVEN_WEEKS
+
+_versions = itertools.count(1)
+
+
+class Lesson(NamedTuple):
+    number: int
+    name: str
+    types: str
+    weeks: int
+
+    @property
+    def parity(self) -> str:
+        """Возвращает "odd", "even" или "explicit" для занятий по отдельным неделям"""
+        if self.weeks & ALL_WEEKS == ODD_WEEKS:
+            return "odd"
+        if self.weeks & ALL_WEEKS == EVEN_WEEKS:
+            return "even"
+        return "explicit"
+
+
+def weeks_mask(weeks: list[int]) -> int:
+    if not weeks:
+        return ALL_WEEKS
+
+    mask = 0
+    for week in weeks:
+        mask |= 1 << week
+
+    return mask
+
+
+class Timetable:
+    """Скомпилированное расписание группы
+
+    Занятия раскладываются по дням недели и номерам учебных недель один раз при загрузке,
+    поэтому количество и список пар на конкретный день получаются одним обращением к словарю.
+
+    Args:
+        group (str): Название группы.
+        schedule (dict): Ответ API расписания /{group}/full_schedule.
+    """
+
+    def __init__(self, group: str, schedule: dict[str, Any]) -> None:
+        self.group = group
+        self.version = next(_versions)
+
+        # Валидаторы ответа API, по которым расписание обновляется условным запросом
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.content_hash: Optional[str] = None
+        self.size = 0
+        self._lessons: dict[tuple[str, int], tuple[Lesson, ...]] = {}
+        self._counts: dict[tuple[str, int], int] = {}
+
+        buckets: dict[tuple[str, int], list[Lesson]] = {}
+
+        for day, day_schedule in schedule.get('schedule', {}).items():
+            for number, slot in enumerate(day_schedule.get('lessons', []), start=1):
+                for lesson in slot:
+                    compiled = Lesson(number, lesson.get('name', ''), lesson.get('types', ''), weeks_mask(lesson.get('weeks', [])))
+
+                    mask = compiled.weeks
+                    week = 0
+                    while mask:
+                        if mask & 1:
+                            buckets.setdefault((str(day), week), []).append(compiled)
+                        mask >>= 1
+                        week += 1
+
+        for key, lessons in buckets.items():
+            self._lessons[key] = tuple(lessons)
+            self._counts[key] = len({lesson.number for lesson in lessons})
+
+    def lessons(self, day: str, week: int) -> tuple[Lesson, ...]:
+        """Возвращает занятия в день недели ("1" - понедельник) указанной учебной недели"""
+        return self._lessons.get((str(day), week), ())
+
+    def count(self, day: str, week: int) -> int:
+        """Возвращает количество пар в день недели ("1" - понедельник) указанной учебной недели"""
+        return self._counts.get((str(day), week), 0)
@@ -3,17 +3,16 @@ import logging
 
 from aiohttp import ClientSession
 from functools import lru_cache
-from typing import Any, Awaitable
+from typing import Any, Awaitable, Optional, Union
 
 from fastapi import Depends
 from starlette.requests import Request
 
 from ...assistants.vk.request import MarusiaRequest
+from ...core.dialog.engine import dialog_engine
+from ...core.metrics import PHASE_SERIALIZATION, measure
 from ...core.session import get_session
-from ...core.vk import intents 
-from ...core.vk.scenes import Schedule, Welcome, WelcomeDefault, SCENES
-from ...core.vk.state import STATE_REQUEST_KEY
-from ...crud.user import create_user, get_user
+from ...core.vk.adapter import marusia_adapter
 from ...database.database import get_db, Session
 from ...services.base.abc import VoiceAssistantServiceBase
 
@@ -25,54 +24,15 @@ class MarusaVoiceAssistantService(VoiceAssistantServiceBase):
         self.session = session
         self.db = db
 
-    async def parse_request_and_routing(self, request: Request) -> dict[str, Any]:
+    async def parse_request_and_routing(self, request: Request, deadline: Optional[float] = None) -> Union[bytes, dict[str, Any]]:
 
         event = await request.json()
 
         request = MarusiaRequest(request_body=event, session=self.session, db=self.db)
-        current_scene_id = event.get('state', {}).get(
-            STATE_REQUEST_KEY, {}).get('scene')
-        logger.info(current_scene_id)
+        reply = await dialog_engine.handle_before(marusia_adapter.to_dialog(request), deadline)
 
-        if current_scene_id is None:
-            if request.user_id != '':
-                user_id = request.user_id
-
-                if await get_user(user_id, self.db) != None:
-                    return await WelcomeDefault().reply(request)
-                else:
-
-                    user = {
-                        "user_id": user_id,
-                        "group": "",
-                        "platform": "VK"
-                    }
-
-                    await create_user(user, self.db)
-                    return await Welcome().reply(request)
-
-            elif request.application_id != '':
-                user_id = request.application_id
-
-                if await get_user(user_id, self.db) != None:
-                    return await WelcomeDefault().reply(request)
-                else:
-                    user = {
-                        "user_id": user_id,
-                        "group": "",
-                        "platform": "VK"
-                    }
-
-                    await create_user(user, self.db)
-                    return await Welcome().reply(request)
-                    
-        current_scene = SCENES.get(current_scene_id, Welcome)()
-        next_scene = current_scene.move(request)
-
-        if next_scene is not None:
-            return await next_scene.reply(request)
-        else:
-            return await current_scene.fallback(request)
+        with measure(PHASE_SERIALIZATION):
+            return marusia_adapter.respond(reply, request)
 
 
 @lru_cache()
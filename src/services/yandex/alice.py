@@ -5,15 +5,14 @@ from aiohttp import ClientSession
 from functools import lru_cache
 
 from fastapi import Depends
-from typing import Any, Awaitable
+from typing import Any, Awaitable, Optional, Union
 from starlette.requests import Request
 
 from ...assistants.yandex.request import AliceRequest
+from ...core.dialog.engine import dialog_engine
+from ...core.metrics import PHASE_SERIALIZATION, measure
 from ...core.session import get_session
-from ...core.yandex import intents 
-from ...core.yandex.scenes import Welcome, SCENES, WelcomeDefault, Schedule
-from ...core.yandex.state import STATE_REQUEST_KEY
-from ...crud.user import create_user, get_user
+from ...core.yandex.adapter import alice_adapter
 from ...database.database import get_db, Session
 from ...services.base.abc import VoiceAssistantServiceBase
 
@@ -25,66 +24,15 @@ class AliceVoiceAssistantService(VoiceAssistantServiceBase):
         self.session = session
         self.db = db
 
-    async def parse_request_and_routing(self, request: Request) -> dict[str, Any]:
+    async def parse_request_and_routing(self, request: Request, deadline: Optional[float] = None) -> Union[bytes, dict[str, Any]]:
 
         event = await request.json()
 
         request = AliceRequest(request_body=event, session=self.session, db=self.db)
-        current_scene_id = event.get('state', {}).get(
-            STATE_REQUEST_KEY, {}).get('scene')
+        reply = await dialog_engine.handle_before(alice_adapter.to_dialog(request), deadline)
 
-        if current_scene_id is None:
-
-            if request.user_id != '':
-                user_id = request.user_id
-                user = await get_user(user_id, self.db)
-
-                if user != None:
-                    if request.new and (set(intents.SCHEDULE_INTENTS) & set(request.intents)):
-                        return await Schedule().reply(request)
-                    elif len(user.group) == 0:
-                        return await Welcome().reply(request)
-                    else:
-                        return await WelcomeDefault().reply(request)
-                else:
-
-                    user = {
-                        "user_id": user_id,
-                        "group": "",
-                        "platform": "YANDEX"
-                    }
-
-                    await create_user(user, self.db)
-                    return await Welcome().reply(request)
-
-            elif request.application_id != '':
-                user_id = request.application_id
-                user = await get_user(user_id, self.db)
-
-                if user != None:
-                    if request.new and (set(intents.SCHEDULE_INTENTS) & set(request.intents)):
-                        return await Schedule().reply(request)
-                    elif len(user.group) == 0:
-                        return await Welcome().reply(request)
-                    else:
-                        return await WelcomeDefault().reply(request)
-                else:
-                    user = {
-                        "user_id": user_id,
-                        "group": "",
-                        "platform": "YANDEX"
-                    }
-
-                    await create_user(user, self.db)
-                    return await Welcome().reply(request)
-                    
-        current_scene = SCENES.get(current_scene_id, Welcome)()
-        next_scene = current_scene.move(request)
-
-        if next_scene is not None:
-            return await next_scene.reply(request)
-        else:
-            return await current_scene.fallback(request)
+        with measure(PHASE_SERIALIZATION):
+            return alice_adapter.respond(reply, request)
 
 
 @lru_cache()
@@ -0,0 +1,91 @@
+import time
+
+from typing import Any, Callable, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Размыкатель цепи для обращений к внешнему сервису
+
+    После failure_threshold ошибок подряд цепь размыкается, и обращения сразу отклоняются.
+    Через reset_timeout секунд пропускается одно пробное обращение: успех замыкает цепь,
+    ошибка снова размыкает её.
+
+    Args:
+        failure_threshold (int): Количество ошибок подряд, после которого цепь размыкается.
+        reset_timeout (float): Через сколько секунд после размыкания пропустить пробное обращение.
+        timer (Callable[[], float], optional): Источник времени, по умолчанию time.monotonic.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, timer: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timer = timer
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+        self.transitions = {OPEN: 0, HALF_OPEN: 0, CLOSED: 0}
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Возвращает, можно ли сейчас обратиться к сервису"""
+        if self.state == OPEN and self.timer() - self.opened_at >= self.reset_timeout:
+            self._move(HALF_OPEN)
+
+        if self.state == CLOSED:
+            return True
+
+        if self.state == HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def check(self) -> None:
+        if not self.allow():
+            raise CircuitOpenError()
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+        if self.state != CLOSED:
+            self._move(CLOSED)
+
+    def release(self) -> None:
+        """Обращение отменено и ничего не сказало о сервисе: пробное обращение снова доступно"""
+        if self.state == HALF_OPEN:
+            self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.opened_at = self.timer()
+            self._move(OPEN)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened': self.transitions[OPEN],
+            'half_opened': self.transitions[HALF_OPEN],
+            'closed': self.transitions[CLOSED],
+            'rejected': self.rejected,
+        }
+
+    def _move(self, state: str) -> None:
+        self.state = state
+        self._trial = False
+        self.transitions[state] += 1
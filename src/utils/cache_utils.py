@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Ограниченный по размеру LRU-кэш с временем жизни записей
+
+    Args:
+        maxsize (int): Максимальное количество записей. При переполнении вытесняется давно не использованная запись.
+        ttl (float): Время жизни записи в секундах.
+        timer (Callable[[], float], optional): Источник времени, по умолчанию time.monotonic.
+        stale_ttl (float, optional): Сколько секунд после истечения запись ещё доступна через get_stale.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic, stale_ttl: float = 0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.stale_ttl = stale_ttl
+
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > self.timer()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        now = self.timer()
+
+        if expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Возвращает запись, даже если она истекла, но ещё не старше stale_ttl"""
+        entry = self._data.get(key)
+
+        if entry is None or entry[0] + self.stale_ttl <= self.timer():
+            return default
+
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+
+        self._data[key] = (self.timer() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Возвращает, через сколько секунд истечёт запись, не учитывая обращение в статистике"""
+        entry = self._data.get(key)
+
+        if entry is None:
+            return None
+
+        return max(entry[0] - self.timer(), 0.0)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        requests = self.hits + self.misses
+
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_ratio': self.hits / requests if requests else 0.0,
+        }
+
+
+class SingleFlight:
+    """Объединяет одновременные запросы с одинаковым ключом в один
+
+    Первый вызов для ключа запускает загрузку, остальные ожидают тот же результат.
+    Отмена одного из ожидающих не прерывает загрузку для остальных.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+        self.executed = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._inflight[key] = task
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Помечаем исключение как полученное, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            'inflight': len(self._inflight),
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+        }
@@ -0,0 +1,147 @@
+import logging
+import logging.handlers
+import os
+import queue
+import random
+
+from typing import Optional
+
+import orjson
+
+from ..core.config import (LOG_FILE, LOG_FORMAT, LOG_LEVEL, LOG_ROTATION, LOG_ROTATE_BYTES, LOG_ROTATE_WHEN,
+                           LOG_BACKUP_COUNT, LOG_SAMPLING, LOG_QUEUE_SIZE)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(threadName)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON, удобно для сборщиков логов"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+
+        return orjson.dumps(entry).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает только долю записей модулей с заданной частотой
+
+    Args:
+        rates (dict[str, float]): Доля записей для логгера и его потомков, например {"httpx": 0.1}.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+        self._cache: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self._cache.get(record.name)
+
+        if rate is None:
+            rate = self._cache[record.name] = self._rate(record.name)
+
+        return rate >= 1 or random.random() < rate
+
+    def _rate(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+
+        return 1.0
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Кладёт записи в ограниченную очередь и отбрасывает их, если писатель не успевает"""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_rates(value: str) -> dict[str, float]:
+    """Разбирает строку вида "httpx=0.1,src.core.dialog=0.5" """
+    rates = {}
+
+    for item in value.split(','):
+        if '=' in item:
+            name, rate = item.split('=', 1)
+            rates[name.strip()] = float(rate)
+
+    return rates
+
+
+class LoggingUtils:
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _queue_handler: Optional[DroppingQueueHandler] = None
+
+    @staticmethod
+    def setup() -> None:
+        """Настраивает корневой логгер: запись в файл и консоль выполняет отдельный поток
+
+        В цикле событий запись только кладётся в очередь, поэтому логирование не блокирует
+        обработку запросов. При переполнении очереди записи отбрасываются и подсчитываются.
+        """
+        LoggingUtils.shutdown()
+
+        # Каждый воркер может писать в свой файл, тогда ротация файлов не пересекается
+        path = LOG_FILE.format(pid=os.getpid())
+
+        if LOG_ROTATION == 'time':
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='UTF-8')
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=LOG_ROTATE_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='UTF-8')
+
+        formatter = JsonFormatter() if LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+        handlers = (file_handler, logging.StreamHandler())
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        rates = parse_rates(LOG_SAMPLING)
+        if rates:
+            queue_handler.addFilter(SamplingFilter(rates))
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(queue_handler)
+
+        LoggingUtils._queue_handler = queue_handler
+        LoggingUtils._listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        LoggingUtils._listener.start()
+
+    @staticmethod
+    def shutdown() -> None:
+        """Дописывает записи из очереди и останавливает поток записи"""
+        if LoggingUtils._listener is not None:
+            LoggingUtils._listener.stop()
+
+            for handler in LoggingUtils._listener.handlers:
+                handler.close()
+
+            LoggingUtils._listener = None
+
+    @staticmethod
+    def dropped() -> int:
+        return LoggingUtils._queue_handler.dropped if LoggingUtils._queue_handler is not None else 0
@@ -1,17 +1,27 @@
 import logging
 
-from aiohttp import ClientSession
-from pydantic import Json
+from typing import Iterable
 
-from ..core.config import DISCORD_WEBHOOK_URL
+from aiohttp import ClientSession
 
 logger = logging.getLogger(__name__)
 
+# Ограничения Discord на одно сообщение вебхука
+MAX_DESCRIPTION_LENGTH = 4096
+MAX_LINE_LENGTH = 200
+
+
+class DiscordRateLimitError(Exception):
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f'discord rate limit, retry after {retry_after}s')
+        self.retry_after = retry_after
+
 
 class DiscordLoggerUtils:
 
     _color = 15548997
-    _title = "Incomprehensible intent"
+    _title = "Incomprehensible intents"
     _author = "MIREA NINJA | DISCORD NOTIFICATIONS"
     _author_icon = "https://cdn.discordapp.com/attachments/903611347370127360/946040378010779678/logo.png"
     _author_url = "https://mirea.ninja/"
@@ -19,39 +29,52 @@ class DiscordLoggerUtils:
     _footer_icon = "https://cdn.discordapp.com/attachments/903611347370127360/946040378010779678/logo.png"
 
     @staticmethod
-    async def send_notification(session: ClientSession, intent: str) -> None:
-        headers = {
-            'accept': '*/*',
-            'content-type': 'application/json'
-        }
+    def make_digest(lines: Iterable[str], footer: str) -> dict:
+        """Собирает одно сообщение вебхука из строк сводки, не выходя за ограничения Discord
 
-        notification_data = {
+        Args:
+            lines (Iterable[str]): Строки сводки в порядке важности.
+            footer (str): Подпись к сводке, например период и количество фраз.
+        """
+        description = ''
+
+        for line in lines:
+            line = line[:MAX_LINE_LENGTH]
+            if len(description) + len(line) + 1 > MAX_DESCRIPTION_LENGTH:
+                break
+            description += line + '\n'
+
+        return {
             "embeds": [
                 {
                     "author": {
-                        "name": f"{DiscordLoggerUtils._author}",
-                        "icon_url": f"{DiscordLoggerUtils._author_icon}",
-                        "url": f"{DiscordLoggerUtils._author_url}"
+                        "name": DiscordLoggerUtils._author,
+                        "icon_url": DiscordLoggerUtils._author_icon,
+                        "url": DiscordLoggerUtils._author_url
                     },
                     "color": DiscordLoggerUtils._color,
-                    "title": f"{DiscordLoggerUtils._title}",
+                    "title": DiscordLoggerUtils._title,
+                    "description": description,
                     "footer": {
-                        "text": f"{DiscordLoggerUtils._footer}",
-                        "icon_url": f"{DiscordLoggerUtils._footer_icon}"
-                    },
-                    "fields": [
-                        {
-                            "name": "original_utterance",
-                            "value": f"{intent}",
-                            "inline": False
-                        }
-                    ]   
+                        "text": f"{DiscordLoggerUtils._footer} | {footer}",
+                        "icon_url": DiscordLoggerUtils._footer_icon
+                    }
                 }
             ]
         }
-        async with session.post(url=f'{DISCORD_WEBHOOK_URL}', data=notification_data, headers=headers) as request:
-            logger.info(await request.read())
-            # response = await request.json()
-            # if request.status == 400:
-            #     logger.error(
-            #         f"400 bad request(Discord notifications). Result - {response}")
+
+    @staticmethod
+    async def send_notification(session: ClientSession, url: str, notification: dict) -> None:
+        """Отправляет сообщение в вебхук Discord
+
+        Raises:
+            DiscordRateLimitError: Discord ограничил частоту сообщений.
+        """
+        async with session.post(url=url, json=notification) as response:
+            if response.status == 429:
+                retry_after = float((await response.json(content_type=None)).get('retry_after', 60))
+                raise DiscordRateLimitError(retry_after)
+
+            if response.status >= 400:
+                logger.error(f"{response.status} discord notification failed: {await response.text()}")
+                response.raise_for_status()
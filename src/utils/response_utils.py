@@ -1,3 +1,6 @@
+import orjson
+
+
 class ReponseUtils:
     @staticmethod
     def button_alice(title: str, payload: str=None, url: str=None, hide: bool=False):
@@ -43,3 +46,22 @@ class ReponseUtils:
             ]
 
         return button
+
+    @staticmethod
+    def splice_json(body: bytes, fields: dict, raw: dict = None) -> bytes:
+        """Добавляет поля запроса в заранее сериализованный JSON-объект
+
+        Args:
+            body (bytes): Сериализованный объект без добавляемых полей.
+            fields (dict): Поля, которые нужно сериализовать и добавить.
+            raw (dict, optional): Уже сериализованные поля.
+        """
+        parts = [orjson.dumps(key) + b':' + orjson.dumps(value) for key, value in fields.items()]
+
+        if raw is not None:
+            parts += [orjson.dumps(key) + b':' + value for key, value in raw.items()]
+
+        if body == b'{}':
+            return b'{' + b','.join(parts) + b'}'
+
+        return b'{' + b','.join(parts) + b',' + body[1:]
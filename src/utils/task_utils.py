@@ -0,0 +1,29 @@
+import asyncio
+import logging
+
+from typing import Any, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class TaskUtils:
+    _background_tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def spawn(coroutine: Awaitable[Any]) -> asyncio.Task:
+        """Запускает корутину в фоне, сохраняя ссылку на задачу до её завершения
+
+        Args:
+            coroutine (Awaitable): Корутина или уже запущенная задача, которую нужно выполнить в фоне.
+        """
+        task = asyncio.ensure_future(coroutine)
+        TaskUtils._background_tasks.add(task)
+        task.add_done_callback(TaskUtils._on_done)
+        return task
+
+    @staticmethod
+    def _on_done(task: asyncio.Task) -> None:
+        TaskUtils._background_tasks.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f'background task failed: {task.exception()!r}')
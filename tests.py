@@ -1,4 +1,32 @@
 import unittest
-from tests import alice_tests
+from tests import alice_tests, cache_tests, client_tests, deadline_tests, fallback_tests, groups_tests, intents_tests, loadtest_tests, logging_tests, metrics_tests, prefetch_tests, sber_tests, schedule_api_tests, semester_tests, shared_cache_tests, timetable_tests, users_tests
 
-unittest.main(alice_tests)
+TEST_MODULES = [
+    alice_tests,
+    cache_tests,
+    client_tests,
+    deadline_tests,
+    fallback_tests,
+    groups_tests,
+    intents_tests,
+    loadtest_tests,
+    logging_tests,
+    metrics_tests,
+    prefetch_tests,
+    sber_tests,
+    schedule_api_tests,
+    semester_tests,
+    shared_cache_tests,
+    timetable_tests,
+    users_tests,
+]
+
+
+def load_tests(loader, tests, pattern):
+    suite = unittest.TestSuite()
+    for module in TEST_MODULES:
+        suite.addTests(loader.loadTestsFromModule(module))
+    return suite
+
+
+unittest.main()
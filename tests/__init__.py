@@ -0,0 +1,5 @@
+import os
+
+# Тесты не должны зависеть от прошлых запусков: снимки ответов API расписания на диске отключены.
+# Окружение задаётся до импорта src, который читает настройки при импорте.
+os.environ['SNAPSHOT_DIR'] = ''
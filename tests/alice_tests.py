@@ -1,32 +1,45 @@
+import asyncio
 import unittest
 import sys
 import random
 import string
 
 from fastapi_alice_tests import Interface, Skill
-from sqlalchemy import create_engine
+from loadtest.schedule_api import ScheduleApiStandIn
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from src.app import app
 from src.database.database import Base, get_db
 from src.database.migrate import migrate_test
 from src.core.config import SKILL_ID
+from src.core.dialog import intents
+from src.core.dialog.scenes import GLOBAL_TRANSITIONS, SCENES
+from src.services.schedule.client import schedule_api
 
-engine = create_engine("sqlite:///./tests/test.db",
-                       connect_args={"check_same_thread": False})
-Base.metadata.create_all(bind=engine)
-TestingSessionLocal = sessionmaker(bind=engine)
+engine = create_async_engine("sqlite+aiosqlite:///./tests/test.db", poolclass=NullPool)
+TestingSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def init_test_db():
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with TestingSessionLocal() as db:
+        await migrate_test(db)
 
 
 app.dependency_overrides[get_db] = override_get_db
-migrate_test(TestingSessionLocal())
+asyncio.run(init_test_db())
+
+# Тесты не зависят от сети: API расписания заменяется локальным сервером
+schedule_api.base_url = ScheduleApiStandIn(groups=50).start_in_thread()
 
 
 class TestYandexSkill(unittest.TestCase):
@@ -173,8 +186,16 @@ class TestYandexSkill(unittest.TestCase):
         )
 
         self.assertTrue(session.contain(
-            'Отлично, я запомнила, что вы из ИКБО-01-20. Для просмотра расписания скажите "Расписание на сегодня" или "Раписание на понедельник"\nДля просмотра помощи скажите "Помощь".\nЧтобы изменить группу скажите "Изменить группу'))
+            'Отлично, я запомнила, что вы из ИКБО-01-20. Для просмотра расписания скажите "Расписание на сегодня" или "Расписание на понедельник"\nДля просмотра помощи скажите "Помощь".\nЧтобы изменить группу скажите "Изменить группу'))
         self.assertEqual(len(session.buttons), 6)
 
+    def test_scene_registry(self):
+        for scene_id, scene in SCENES.items():
+            self.assertEqual(scene.id(), scene_id)
+
+        self.assertIs(GLOBAL_TRANSITIONS[intents.HELP].scene, SCENES['Helper'])
+        self.assertIs(GLOBAL_TRANSITIONS[intents.CONFIRM].scene, SCENES['GroupManager'])
+        self.assertLess(GLOBAL_TRANSITIONS[intents.SCHEDULE_LIST].rank, GLOBAL_TRANSITIONS[intents.EXIT].rank)
+
 
 sys.path.append(".")
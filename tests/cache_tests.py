@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+import sys
+
+from src.services.schedule.answers import AnswerCache, ANSWER_COUNT
+from src.services.schedule.timetable import Timetable
+from src.utils.cache_utils import TTLCache, SingleFlight
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timer = FakeTimer()
+        self.cache = TTLCache(maxsize=2, ttl=10, timer=self.timer)
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get("ИКБО-01-20"))
+        self.cache.set("ИКБО-01-20", {"schedule": {}})
+        self.assertEqual(self.cache.get("ИКБО-01-20"), {"schedule": {}})
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    def test_expiration(self):
+        self.cache.set("ИКБО-01-20", 1)
+        self.timer.now = 10
+        self.assertIsNone(self.cache.get("ИКБО-01-20"))
+        self.assertEqual(self.cache.stats['expirations'], 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.cache.stats['evictions'], 1)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_are_coalesced(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"groups": []}
+
+        async def burst():
+            return await asyncio.gather(*[flight.do("ИКБО-01-20", fetch) for _ in range(10)])
+
+        results = asyncio.run(burst())
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats['coalesced'], 9)
+        self.assertEqual(len(flight), 0)
+
+    def test_error_is_shared(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError()
+
+        async def burst():
+            return await asyncio.gather(*[flight.do("key", fetch) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(burst())
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(flight.stats['executed'], 1)
+
+
+class TestAnswerCache(unittest.TestCase):
+
+    def test_answer_invalidated_by_new_timetable(self):
+        answers = AnswerCache(maxsize=10)
+        timetable = Timetable("ИКБО-01-20", {"schedule": {}})
+        key = ("YANDEX", "ИКБО-01-20", "01.09.2022", ANSWER_COUNT, "Сегодня")
+
+        answers.set(key, timetable, "Сегодня у вас нет пар! Отдыхайте!")
+        self.assertEqual(answers.get(key, timetable).text, "Сегодня у вас нет пар! Отдыхайте!")
+
+        self.assertIsNone(answers.get(key, Timetable("ИКБО-01-20", {"schedule": {}})))
+        self.assertEqual(answers.stats['invalidations'], 1)
+
+
+sys.path.append(".")
@@ -0,0 +1,323 @@
+import asyncio
+import tempfile
+import unittest
+import sys
+
+from src.core import session as http_session
+from src.services.schedule.client import ScheduleApiClient, ScheduleUnavailableError, UpstreamResponse
+from src.services.schedule.snapshot import SnapshotStore
+from src.utils.breaker_utils import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN, OPEN
+from src.utils.cache_utils import TTLCache
+from tests.cache_tests import FakeTimer
+
+
+class FlakyScheduleApi(ScheduleApiClient):
+
+    def __init__(self, cache: TTLCache, breaker: CircuitBreaker, snapshots: SnapshotStore = None) -> None:
+        super().__init__("http://schedule.test", cache, breaker, snapshots)
+        self.down = False
+        self.calls = 0
+        self.body = b'{"schedule": {}}'
+        self.etag = None
+        self.delay = 0
+
+    async def _fetch(self, session, path, headers=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+        if self.down:
+            raise ConnectionError(path)
+
+        if self.etag is not None and (headers or {}).get('If-None-Match') == self.etag:
+            return UpstreamResponse(304, b'', self.etag)
+
+        return UpstreamResponse(200, self.body, self.etag)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timer = FakeTimer()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, timer=self.timer)
+
+    def test_opens_after_failures(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertRaises(CircuitOpenError, self.breaker.check)
+        self.assertEqual(self.breaker.stats['rejected'], 1)
+
+    def test_half_open_allows_single_trial(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.timer.now = 30
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats['half_opened'], 1)
+        self.assertEqual(self.breaker.stats['closed'], 1)
+
+    def test_released_trial_can_be_retried(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.timer.now = 30
+
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.timer.now = 30
+
+        self.breaker.allow()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.stats['opened'], 2)
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timer = FakeTimer()
+        self.api = FlakyScheduleApi(
+            TTLCache(maxsize=10, ttl=60, timer=self.timer, stale_ttl=600),
+            CircuitBreaker(failure_threshold=1, reset_timeout=30, timer=self.timer))
+
+    def test_stale_schedule_served_and_refreshed(self):
+        async def scenario():
+            first = await self.api.get_schedule(None, "ИКБО-01-20")
+            self.timer.now = 100
+            self.api.body = b'{"schedule": {"1": {"lessons": []}}}'
+
+            stale = await self.api.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            return first, stale, await self.api.get_schedule(None, "ИКБО-01-20")
+
+        first, stale, fresh = asyncio.run(scenario())
+
+        self.assertIs(stale, first)
+        self.assertIsNot(fresh, first)
+        self.assertEqual(self.api.stats['stale_served'], 1)
+        self.assertEqual(self.api.stats['revalidated'], 1)
+
+    def test_stale_schedule_served_while_api_down(self):
+        async def scenario():
+            first = await self.api.get_schedule(None, "ИКБО-01-20")
+            self.api.down = True
+            self.timer.now = 100
+
+            stale = await self.api.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            return first, stale
+
+        first, stale = asyncio.run(scenario())
+
+        self.assertIs(stale, first)
+        self.assertEqual(self.api.breaker.state, OPEN)
+
+    def test_fails_fast_without_cached_schedule(self):
+        self.api.down = True
+
+        async def scenario():
+            for _ in range(2):
+                with self.assertRaises(ScheduleUnavailableError):
+                    await self.api.get_schedule(None, "ИКБО-01-20")
+
+        asyncio.run(scenario())
+
+        self.assertEqual(self.api.calls, 1)
+        self.assertEqual(self.api.breaker.stats['rejected'], 1)
+
+    def test_cancelled_request_is_not_a_failure(self):
+        self.api.delay = 1
+
+        async def scenario():
+            for _ in range(2):
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.api.get_groups(None), 0.01)
+
+        asyncio.run(scenario())
+
+        self.assertEqual(self.api.calls, 2)
+        self.assertEqual(self.api.breaker.state, CLOSED)
+        self.assertEqual(self.api.breaker.failures, 0)
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timer = FakeTimer()
+        self.api = FlakyScheduleApi(
+            TTLCache(maxsize=10, ttl=60, timer=self.timer),
+            CircuitBreaker(failure_threshold=1, reset_timeout=30, timer=self.timer))
+
+    def refresh_twice(self):
+        async def scenario():
+            first = await self.api.get_schedule(None, "ИКБО-01-20")
+            return first, await self.api.refresh(None, "ИКБО-01-20")
+
+        return asyncio.run(scenario())
+
+    def test_not_modified_keeps_timetable(self):
+        self.api.etag = '"v1"'
+
+        first, second = self.refresh_twice()
+
+        self.assertIs(second, first)
+        self.assertEqual(self.api.stats['conditional']['not_modified'], 1)
+        self.assertEqual(self.api.stats['conditional']['bytes_saved'], len(self.api.body))
+        self.assertEqual(self.api.stats['conditional']['hit_ratio'], 1.0)
+
+    def test_same_content_keeps_timetable(self):
+        first, second = self.refresh_twice()
+
+        self.assertIs(second, first)
+        self.assertEqual(self.api.stats['conditional']['unchanged'], 1)
+
+    def test_changed_content_recompiles(self):
+        async def scenario():
+            first = await self.api.get_schedule(None, "ИКБО-01-20")
+            self.api.body = b'{"schedule": {"1": {"lessons": []}}}'
+            return first, await self.api.refresh(None, "ИКБО-01-20")
+
+        first, second = asyncio.run(scenario())
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second.size, len(self.api.body))
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.timer = FakeTimer()
+        self.clock = FakeTimer()
+        self.snapshots = SnapshotStore(self.directory.name, max_age=3600, clock=self.clock)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def make_api(self) -> FlakyScheduleApi:
+        return FlakyScheduleApi(
+            TTLCache(maxsize=10, ttl=60, timer=self.timer, stale_ttl=600),
+            CircuitBreaker(failure_threshold=1, reset_timeout=30, timer=self.timer),
+            self.snapshots)
+
+    def test_round_trip(self):
+        async def scenario():
+            await self.snapshots.save("ИКБО-01-20", {"schedule": {"1": {"lessons": []}}})
+            return await self.snapshots.load("ИКБО-01-20"), await self.snapshots.load("ИКБО-02-20")
+
+        snapshot, missing = asyncio.run(scenario())
+
+        self.assertEqual(snapshot.payload, {"schedule": {"1": {"lessons": []}}})
+        self.assertIsNone(missing)
+
+        self.clock.now = 3600
+        self.assertIsNone(asyncio.run(self.snapshots.load("ИКБО-01-20")))
+
+    def test_new_worker_answers_from_snapshot(self):
+        async def scenario():
+            await self.make_api().get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            restarted = self.make_api()
+            restarted.down = True
+            self.clock.now = 30
+            self.assertIsNotNone(await restarted.get_schedule(None, "ИКБО-01-20"))
+            return restarted
+
+        restarted = asyncio.run(scenario())
+
+        self.assertEqual(restarted.calls, 0)
+        self.assertEqual(restarted.stats['restored'], 1)
+        self.assertAlmostEqual(restarted.expires_in("ИКБО-01-20"), 30)
+
+    def test_expired_snapshot_is_revalidated(self):
+        async def scenario():
+            await self.make_api().get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            restarted = self.make_api()
+            self.clock.now = 120
+            await restarted.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+            return restarted
+
+        restarted = asyncio.run(scenario())
+
+        self.assertEqual(restarted.calls, 1)
+        self.assertEqual(restarted.stats['revalidated'], 1)
+        self.assertIn("ИКБО-01-20", restarted.cache)
+
+    def test_restored_schedule_keeps_validators(self):
+        async def scenario():
+            api = self.make_api()
+            api.etag = '"v1"'
+            await api.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            restarted = self.make_api()
+            restarted.etag = '"v1"'
+            self.clock.now = 120
+            restored = await restarted.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+            return restarted, restored
+
+        restarted, restored = asyncio.run(scenario())
+
+        self.assertEqual(restored.etag, '"v1"')
+        self.assertEqual(restored.size, len(restarted.body))
+        self.assertEqual(restarted.stats['conditional']['not_modified'], 1)
+        self.assertIs(restarted.cache.get("ИКБО-01-20"), restored)
+
+    def test_not_modified_renews_snapshot(self):
+        async def scenario():
+            api = self.make_api()
+            api.etag = '"v1"'
+            await api.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            self.timer.now = 120
+            self.clock.now = 3000
+            await api.refresh(None, "ИКБО-01-20")
+            await asyncio.sleep(0.01)
+
+            self.clock.now = 3500
+            return api, await self.snapshots.load("ИКБО-01-20")
+
+        api, snapshot = asyncio.run(scenario())
+
+        self.assertEqual(api.stats['conditional']['not_modified'], 1)
+        self.assertIsNotNone(snapshot)
+        self.assertAlmostEqual(self.snapshots.age(snapshot), 500)
+        self.assertEqual(snapshot.validators['etag'], '"v1"')
+
+
+class TestSharedSession(unittest.TestCase):
+
+    def test_session_from_previous_loop_is_closed(self):
+        first = asyncio.run(http_session.get_session())
+        second = asyncio.run(http_session.get_session())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+
+        asyncio.run(http_session.close_session())
+
+
+sys.path.append(".")
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import time
+import unittest
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.dialog.engine import DialogEngine
+from src.core.dialog.request import DialogRequest
+from src.core.dialog.scenes import LOADING_REPLIES, Schedule
+from src.database.database import Base, User
+from src.utils.schedule_utils import ScheduleUtils
+
+
+DATABASE_PATH = "./tests/test_deadline.db"
+
+
+def make_request(platform: str, db=None, group: str = None) -> DialogRequest:
+    return DialogRequest(
+        platform=platform, user_id='TEST', command='сколько пар сегодня', original_text='Сколько пар сегодня',
+        intents=('schedule_count',), slots={'day': 0}, scene=Schedule.id(), group=group, new=False,
+        now=ScheduleUtils.now_date(), session=None, db=db)
+
+
+REPLY = Schedule.make_reply('Сегодня у вас 2 пары')
+
+
+class SlowEngine(DialogEngine):
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.finished = 0
+
+    async def handle(self, request):
+        await asyncio.sleep(self.delay)
+        self.finished += 1
+        return REPLY
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_reply_in_time(self):
+        engine = SlowEngine(0)
+
+        reply = asyncio.run(engine.handle_before(make_request('YANDEX'), time.monotonic() + 1))
+
+        self.assertIs(reply, REPLY)
+        self.assertEqual(engine.stats['deadline_misses'], {})
+
+    def test_loading_reply_after_deadline(self):
+        engine = SlowEngine(0.05)
+
+        async def scenario():
+            reply = await engine.handle_before(make_request('VK'), time.monotonic() + 0.01)
+            finished_before = engine.finished
+            await asyncio.sleep(0.1)
+            return reply, finished_before
+
+        reply, finished_before = asyncio.run(scenario())
+
+        self.assertIs(reply, LOADING_REPLIES[Schedule.id()])
+        self.assertEqual(finished_before, 0)
+        self.assertEqual(engine.finished, 1)
+        self.assertEqual(engine.stats['deadline_misses'], {'VK': 1})
+        self.assertEqual(engine.stats['late_completed'], 1)
+
+    def test_loading_reply_keeps_session_group(self):
+        engine = SlowEngine(0.05)
+
+        async def scenario():
+            reply = await engine.handle_before(make_request('YANDEX', group='ИКБО-01-20'), time.monotonic() + 0.01)
+            await asyncio.sleep(0.1)
+            return reply
+
+        reply = asyncio.run(scenario())
+
+        self.assertEqual(reply.group, 'ИКБО-01-20')
+        self.assertEqual(reply.text, LOADING_REPLIES[Schedule.id()].text)
+
+    def test_own_timeout_is_not_a_miss(self):
+        class FailingEngine(DialogEngine):
+            async def handle(self, request):
+                raise asyncio.TimeoutError()
+
+        engine = FailingEngine()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(engine.handle_before(make_request('SBER'), time.monotonic() + 1))
+
+        self.assertEqual(engine.stats['deadline_misses'], {})
+
+    def test_late_handler_does_not_use_request_session(self):
+        class QueryingEngine(SlowEngine):
+            async def handle(self, request):
+                await asyncio.sleep(self.delay)
+                self.db = request.db
+                await request.db.execute(select(User.user_id))
+                self.finished += 1
+                return REPLY
+
+        db_engine = create_async_engine(f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=AsyncAdaptedQueuePool)
+        session_factory = sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+        engine = QueryingEngine(0.05)
+
+        async def scenario():
+            async with db_engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+
+            # Сессия запроса закрывается сразу после ответа, как в Depends(get_db)
+            async with session_factory() as db:
+                reply = await engine.handle_before(make_request('YANDEX', db), time.monotonic() + 0.01)
+
+            await asyncio.sleep(0.1)
+            checked_out = db_engine.pool.checkedout()
+            await db_engine.dispose()
+            return reply, db, checked_out
+
+        try:
+            reply, request_db, checked_out = asyncio.run(scenario())
+        finally:
+            os.remove(DATABASE_PATH)
+
+        self.assertIs(reply, LOADING_REPLIES[Schedule.id()])
+        self.assertEqual(engine.stats['late_completed'], 1)
+        self.assertIsNot(engine.db, request_db)
+        self.assertEqual(checked_out, 0)
+
+
+sys.path.append(".")
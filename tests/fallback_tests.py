@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+import sys
+
+from src.services.fallback import FallbackReporter, FallbackSink
+from src.utils.notifications_utils import DiscordLoggerUtils, DiscordRateLimitError, MAX_DESCRIPTION_LENGTH
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSink(FallbackSink):
+
+    name = 'fake'
+
+    def __init__(self) -> None:
+        self.digests = []
+        self.error = None
+
+    async def send(self, entries, started, finished) -> None:
+        if self.error is not None:
+            raise self.error
+        self.digests.append([(entry.text, entry.count, sorted(entry.platforms)) for entry in entries])
+
+
+class TestFallbackReporter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sink = FakeSink()
+        self.reporter = FallbackReporter(self.sink, interval=60, max_entries=2, clock=self.clock)
+
+    def test_digest_is_deduplicated(self):
+        self.reporter.report('YANDEX', 'Абракадабра')
+        self.reporter.report('VK', '  абракадабра ')
+        self.reporter.report('SBER', 'что')
+        self.reporter.report('SBER', 'новая фраза')
+
+        self.assertEqual(asyncio.run(self.reporter.flush()), 2)
+        self.assertEqual(self.sink.digests, [[('абракадабра', 2, ['VK', 'YANDEX']), ('что', 1, ['SBER'])]])
+        self.assertEqual(self.reporter.stats['dropped'], 1)
+        self.assertEqual(asyncio.run(self.reporter.flush()), 0)
+
+    def test_failed_digest_is_kept(self):
+        self.reporter.report('YANDEX', 'что')
+        self.sink.error = DiscordRateLimitError(30)
+
+        self.assertEqual(asyncio.run(self.reporter.flush()), 0)
+        self.reporter.report('VK', 'что')
+
+        self.sink.error = None
+        self.clock.now += 10
+        self.assertEqual(asyncio.run(self.reporter.flush()), 0)
+
+        self.clock.now += 30
+        self.assertEqual(asyncio.run(self.reporter.flush()), 1)
+        self.assertEqual(self.sink.digests, [[('что', 2, ['VK', 'YANDEX'])]])
+        self.assertEqual(self.reporter.stats['failed'], 1)
+
+    def test_empty_utterance_is_skipped(self):
+        self.reporter.report('SBER', None)
+        self.reporter.report('YANDEX', '  ')
+
+        self.assertEqual(self.reporter.stats['pending'], 0)
+        self.assertEqual(self.reporter.stats['reported'], 0)
+
+    def test_disabled(self):
+        reporter = FallbackReporter(None, interval=60, max_entries=2)
+        reporter.report('YANDEX', 'что')
+
+        self.assertEqual(reporter.stats['pending'], 0)
+
+
+class TestDiscordDigest(unittest.TestCase):
+
+    def test_description_limit(self):
+        notification = DiscordLoggerUtils.make_digest(['x' * 150] * 100, 'footer')
+        description = notification['embeds'][0]['description']
+
+        self.assertLessEqual(len(description), MAX_DESCRIPTION_LENGTH)
+        self.assertTrue(description.startswith('x' * 150 + '\n'))
+
+
+sys.path.append(".")
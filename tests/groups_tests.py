@@ -0,0 +1,43 @@
+import unittest
+import sys
+
+from src.services.schedule.client import schedule_api
+from src.services.schedule.groups import GroupDirectory
+
+GROUPS = [
+    "ИКБО-01-20",
+    "ИКБО-02-20",
+    "ИКБО-01-21",
+    "ИВБО-01-20",
+    "КМБО-05-19",
+]
+
+
+class TestGroupDirectory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = GroupDirectory(schedule_api, refresh_interval=60)
+        self.directory.load(GROUPS)
+
+    def test_exact_match(self):
+        self.assertEqual(self.directory.resolve("икбо - 01 - 20"), "ИКБО-01-20")
+        self.assertEqual(self.directory.resolve("ИКБО0121"), "ИКБО-01-21")
+
+    def test_number_and_year(self):
+        self.assertEqual(self.directory.resolve("ивбо 01"), "ИВБО-01-20")
+        self.assertEqual(self.directory.resolve("икбо-02-2"), "ИКБО-02-20")
+        self.assertIsNone(self.directory.resolve("икбо-03-20"))
+
+    def test_fuzzy_match(self):
+        self.assertEqual(self.directory.resolve("кмбо-о5"), "КМБО-05-19")
+
+    def test_rejects_words(self):
+        self.assertIsNone(self.directory.resolve("расписание"))
+        self.assertIsNone(self.directory.resolve("икб"))
+
+    def test_is_stale(self):
+        self.assertFalse(self.directory.is_stale)
+        self.assertTrue(GroupDirectory(schedule_api, refresh_interval=60).is_stale)
+
+
+sys.path.append(".")
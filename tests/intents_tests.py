@@ -0,0 +1,26 @@
+import unittest
+import sys
+
+from src.core.vk import intents
+from src.core.vk.matcher import IntentMatch, matcher
+
+
+class TestMarusiaIntentMatcher(unittest.TestCase):
+
+    def test_phrase_slots(self):
+        self.assertEqual(matcher.match("Сколько пар в среду?"), IntentMatch(intents.SCHEDULE_COUNT, {'when': 'Wednesday'}))
+        self.assertEqual(matcher.match("расписание на завтра"), IntentMatch(intents.SCHEDULE_LIST, {'day': 1}))
+        self.assertEqual(matcher.match("Что ты умеешь"), IntentMatch(intents.HELP, {}))
+
+    def test_group_prefix(self):
+        self.assertEqual(matcher.match("икбо-01-20").intent, intents.USER_STUDY_GROUP_SET)
+        self.assertEqual(matcher.match("ИКБО 01 20").intent, intents.USER_STUDY_GROUP_SET)
+        self.assertEqual(matcher.match("кмбо05").intent, intents.USER_STUDY_GROUP_SET)
+
+    def test_no_substring_match(self):
+        self.assertIsNone(matcher.match("сколько пар"))
+        self.assertIsNone(matcher.match("да нет"))
+        self.assertIsNone(matcher.match(None))
+
+
+sys.path.append(".")
@@ -0,0 +1,122 @@
+import unittest
+import sys
+
+from loadtest.conversations import (GROUP_SET, SCHEDULE_COUNT, SCHEDULE_LIST, PAYLOADS, Step, failed_reply, generate,
+                                    schedule_step)
+from loadtest.report import Recorder, percentile
+from loadtest.schedule_api import make_groups, make_schedule
+from src.assistants.sber.request import SberRequest
+from src.assistants.vk.request import MarusiaRequest
+from src.assistants.yandex.request import AliceRequest
+from src.core.dialog import intents
+from src.core.dialog.scenes import LOADING_REPLIES, SCHEDULE_UNAVAILABLE_REPLY, Schedule
+from src.core.sber.adapter import sber_adapter
+from src.core.vk.adapter import marusia_adapter
+from src.core.yandex.adapter import alice_adapter
+from src.services.schedule.timetable import Timetable
+
+ADAPTERS = {
+    'alice': (AliceRequest, alice_adapter),
+    'marusia': (MarusiaRequest, marusia_adapter),
+    'sber': (SberRequest, sber_adapter),
+}
+
+
+class TestConversations(unittest.TestCase):
+
+    def setUp(self):
+        self.groups = make_groups(50)
+
+    def test_generate_is_reproducible(self):
+        self.assertEqual(generate(100, 7, self.groups), generate(100, 7, self.groups))
+        self.assertNotEqual(generate(100, 7, self.groups), generate(100, 8, self.groups))
+        self.assertEqual(self.groups[0], 'ИКБО-01-20')
+
+    def test_payloads_reach_dialog_intents(self):
+        conversation = generate(1, 1, self.groups)[0]
+        steps = (
+            (Step(GROUP_SET, 'икбо - 01 - 20'), intents.USER_STUDY_GROUP_SET, {}),
+            (schedule_step(SCHEDULE_COUNT, 0), intents.SCHEDULE_COUNT, {'day': 0}),
+            (schedule_step(SCHEDULE_LIST, 'Friday'), intents.SCHEDULE_LIST, {'when': 'Friday'}),
+        )
+
+        for platform, (request_class, adapter) in ADAPTERS.items():
+            for step, intent, slots in steps:
+                with self.subTest(platform=platform, step=step.text):
+                    body = PAYLOADS[platform](conversation, 1, step, {})
+                    dialog = adapter.to_dialog(request_class(request_body=body, session=None, db=None))
+
+                    self.assertEqual(dialog.intents, (intent,))
+                    self.assertEqual(dialog.slots, slots)
+                    self.assertEqual(dialog.user_id, conversation.user_id)
+
+    def test_failed_replies_are_tagged(self):
+        replies = (
+            (LOADING_REPLIES[Schedule.id()], 'loading'),
+            (SCHEDULE_UNAVAILABLE_REPLY, 'unavailable'),
+            (Schedule.make_reply('Сегодня у вас 2 пары'), None),
+        )
+
+        for platform, (_, adapter) in ADAPTERS.items():
+            for reply, tag in replies:
+                with self.subTest(platform=platform, tag=tag):
+                    body = adapter.render_body(reply)
+                    if platform == 'sber':
+                        body = {'payload': body}
+
+                    self.assertEqual(failed_reply(platform, body), tag)
+
+    def test_schedule_compiles(self):
+        timetable = Timetable('ИКБО-01-20', make_schedule('ИКБО-01-20'))
+
+        self.assertEqual(make_schedule('ИКБО-01-20'), make_schedule('ИКБО-01-20'))
+        self.assertGreater(sum(timetable.count(str(day), 1) for day in range(1, 7)), 0)
+
+
+class TestReport(unittest.TestCase):
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0)
+
+    def test_report(self):
+        recorder = Recorder()
+        recorder.record('alice', SCHEDULE_COUNT, 0.01, 'Schedule', True)
+        recorder.record('sber', SCHEDULE_COUNT, 0.03, None, False)
+
+        report = recorder.report(duration=2)
+
+        self.assertEqual(report['total']['requests'], 2)
+        self.assertEqual(report['total']['rps'], 1)
+        self.assertEqual(report['scenes'][SCHEDULE_COUNT]['error_rate'], 0.5)
+        self.assertEqual(report['scenes'][SCHEDULE_COUNT]['responses'], {'Schedule': 1, 'error': 1})
+        self.assertEqual(report['platforms']['sber']['latency_ms']['p99'], 30)
+
+    def test_unexpected_scene(self):
+        recorder = Recorder()
+        recorder.record('alice', SCHEDULE_COUNT, 0.01, 'Schedule', True, 'Schedule')
+        recorder.record('sber', SCHEDULE_COUNT, 0.01, 'Welcome', True, 'Schedule')
+
+        report = recorder.report(duration=1)
+
+        self.assertEqual(report['scenes'][SCHEDULE_COUNT]['errors'], 0)
+        self.assertEqual(report['scenes'][SCHEDULE_COUNT]['unexpected'], 1)
+        self.assertEqual(report['platforms']['sber']['unexpected_rate'], 1)
+        self.assertEqual(report['platforms']['alice']['unexpected_rate'], 0)
+
+    def test_failed_reply_is_an_error(self):
+        recorder = Recorder()
+        recorder.record('alice', SCHEDULE_COUNT, 0.01, 'Schedule', True, 'Schedule')
+        recorder.record('alice', SCHEDULE_COUNT, 0.01, 'loading', False, 'Schedule')
+
+        report = recorder.report(duration=1)
+
+        self.assertEqual(report['total']['errors'], 1)
+        self.assertEqual(report['total']['unexpected'], 0)
+        self.assertEqual(report['total']['responses'], {'Schedule': 1, 'loading': 1})
+
+
+sys.path.append(".")
@@ -0,0 +1,52 @@
+import logging
+import queue
+import unittest
+import sys
+
+import orjson
+
+from src.utils.logging_utils import DroppingQueueHandler, JsonFormatter, SamplingFilter, parse_rates
+
+
+def make_record(name: str, message: str = 'test', level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+
+class TestJsonFormatter(unittest.TestCase):
+
+    def test_format(self):
+        entry = orjson.loads(JsonFormatter().format(make_record('src.app', 'группа %s')))
+
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['logger'], 'src.app')
+        self.assertEqual(entry['message'], 'группа %s')
+        self.assertNotIn('exception', entry)
+
+
+class TestSamplingFilter(unittest.TestCase):
+
+    def test_parse_rates(self):
+        self.assertEqual(parse_rates('httpx=0.1, src.core=0'), {'httpx': 0.1, 'src.core': 0.0})
+        self.assertEqual(parse_rates(''), {})
+
+    def test_rates_apply_to_children(self):
+        sampling = SamplingFilter({'src.core': 0.0, 'src.core.dialog': 1.0})
+
+        self.assertFalse(sampling.filter(make_record('src.core.session')))
+        self.assertTrue(sampling.filter(make_record('src.core.dialog.engine')))
+        self.assertTrue(sampling.filter(make_record('src.app')))
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+
+    def test_drops_when_full(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+
+        for _ in range(5):
+            handler.handle(make_record('src.app'))
+
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+
+sys.path.append(".")
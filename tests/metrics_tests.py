@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+import sys
+
+from fastapi.testclient import TestClient
+
+from src.app import app
+from src.core.config import API_V1_PREFIX
+from src.core.metrics import (Histogram, MetricsMiddleware, PHASE_DB, PHASE_ROUTING, REQUEST_DURATION, REQUEST_PHASE,
+                              measure, measure_exclusive, set_scene)
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_render(self):
+        histogram = Histogram('test_seconds', 'Тест', ('platform',), buckets=(0.1, 1))
+        histogram.observe(0.05, 'alice')
+        histogram.observe(0.5, 'alice')
+        histogram.observe(5, 'alice')
+
+        lines = list(histogram.render())
+
+        self.assertIn('test_seconds_bucket{platform="alice",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{platform="alice",le="1"} 2', lines)
+        self.assertIn('test_seconds_bucket{platform="alice",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{platform="alice"} 3', lines)
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+
+    def test_phases_recorded_per_platform_and_scene(self):
+        async def webhook(scope, receive, send):
+            with measure_exclusive(PHASE_ROUTING):
+                with measure(PHASE_DB):
+                    await asyncio.sleep(0.01)
+            set_scene('Schedule')
+
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'{}'})
+
+        async def send(message):
+            pass
+
+        middleware = MetricsMiddleware(webhook)
+        asyncio.run(middleware({'type': 'http', 'path': f'{API_V1_PREFIX}/marusia'}, None, send))
+
+        duration = '\n'.join(REQUEST_DURATION.render())
+        phases = '\n'.join(REQUEST_PHASE.render())
+
+        self.assertIn('voice_request_duration_seconds_count{platform="marusia",scene="Schedule"} 1', duration)
+        self.assertIn('voice_request_phase_seconds_count{platform="marusia",scene="Schedule",phase="db"} 1', phases)
+        self.assertIn('voice_request_phase_seconds_count{platform="marusia",scene="Schedule",phase="routing"} 1', phases)
+
+    def test_metrics_endpoint(self):
+        response = TestClient(app).get(f'{API_V1_PREFIX}/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['content-type'].startswith('text/plain'))
+        self.assertIn('voice_cache_hit_ratio{cache="schedule"}', response.text)
+        self.assertIn('voice_schedule_breaker_state{state="closed"} 1.0', response.text)
+
+
+sys.path.append(".")
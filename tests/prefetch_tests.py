@@ -0,0 +1,117 @@
+import asyncio
+import tempfile
+import unittest
+import sys
+
+from src.services.schedule.client import ScheduleApiClient, UpstreamResponse
+from src.services.schedule.prefetch import SchedulePrefetcher
+from src.services.schedule.snapshot import SnapshotStore
+from src.utils.cache_utils import TTLCache
+from tests.cache_tests import FakeTimer
+
+
+class FakeScheduleApi(ScheduleApiClient):
+
+    def __init__(self, cache: TTLCache, snapshots: SnapshotStore = None) -> None:
+        super().__init__("http://schedule.test", cache, snapshots=snapshots)
+        self.fetched = []
+        self.full_fetched = []
+
+    async def _fetch(self, session, path, headers=None):
+        self.fetched.append(path)
+        await asyncio.sleep(0)
+
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return UpstreamResponse(304, b'', '"v1"')
+
+        self.full_fetched.append(path)
+        return UpstreamResponse(200, b'{"schedule": {}}', '"v1"')
+
+
+class TestSchedulePrefetcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timer = FakeTimer()
+        self.api = FakeScheduleApi(TTLCache(maxsize=10, ttl=3600, timer=self.timer))
+
+        async def load_groups():
+            return ["ИКБО-01-20", "ИКБО-02-20", "ИКБО-01-20"]
+
+        self.prefetcher = SchedulePrefetcher(
+            self.api, load_groups, interval=60, concurrency=2, pace=0, refresh_ahead=600)
+
+    def test_warms_missing_groups(self):
+        refreshed = asyncio.run(self.prefetcher.prefetch(None))
+
+        self.assertEqual(refreshed, 2)
+        self.assertEqual(sorted(self.api.fetched), ["ИКБО-01-20/full_schedule", "ИКБО-02-20/full_schedule"])
+        self.assertIn("ИКБО-02-20", self.api.cache)
+
+    def test_refreshes_only_expiring_entries(self):
+        asyncio.run(self.prefetcher.prefetch(None))
+        self.api.fetched.clear()
+
+        self.timer.now = 1000
+        self.assertEqual(asyncio.run(self.prefetcher.prefetch(None)), 0)
+
+        self.timer.now = 3100
+        self.assertEqual(asyncio.run(self.prefetcher.prefetch(None)), 2)
+
+    def test_recent_groups_go_first(self):
+        asyncio.run(self.api.get_schedule(None, "ИКБО-03-20"))
+        self.api.cache.clear()
+        self.api.fetched.clear()
+
+        self.prefetcher.concurrency = 1
+        asyncio.run(self.prefetcher.prefetch(None))
+
+        self.assertEqual(self.api.fetched[0], "ИКБО-03-20/full_schedule")
+
+
+class TestPrefetchAfterRestart(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.timer = FakeTimer()
+        self.clock = FakeTimer()
+        self.snapshots = SnapshotStore(self.directory.name, max_age=86400, clock=self.clock)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def make_prefetcher(self) -> SchedulePrefetcher:
+        api = FakeScheduleApi(TTLCache(maxsize=10, ttl=3600, timer=self.timer), self.snapshots)
+
+        async def load_groups():
+            return ["ИКБО-01-20", "ИКБО-02-20"]
+
+        return SchedulePrefetcher(api, load_groups, interval=60, concurrency=2, pace=0, refresh_ahead=600)
+
+    def restart(self, after: float) -> SchedulePrefetcher:
+        async def scenario():
+            await self.make_prefetcher().prefetch(None)
+            await asyncio.sleep(0.01)
+
+            self.clock.now = after
+            restarted = self.make_prefetcher()
+            await restarted.prefetch(None)
+            return restarted
+
+        return asyncio.run(scenario())
+
+    def test_restart_restores_fresh_snapshots(self):
+        restarted = self.restart(after=60)
+
+        self.assertEqual(restarted.api.fetched, [])
+        self.assertEqual(restarted.api.stats['restored'], 2)
+        self.assertIn("ИКБО-02-20", restarted.api.cache)
+
+    def test_restart_revalidates_old_snapshots(self):
+        restarted = self.restart(after=3000)
+
+        self.assertEqual(restarted.api.full_fetched, [])
+        self.assertEqual(restarted.api.stats['conditional']['not_modified'], 2)
+        self.assertAlmostEqual(restarted.api.expires_in("ИКБО-02-20"), 3600)
+
+
+sys.path.append(".")
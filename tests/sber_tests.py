@@ -0,0 +1,109 @@
+import asyncio
+import os
+import unittest
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from loadtest.conversations import GROUP_CONFIRM, GROUP_SET, HELP, WELCOME, Conversation, Step, schedule_step, sber_payload
+from loadtest.schedule_api import ScheduleApiStandIn
+from src.app import app
+from src.core.sber import intents
+from src.crud.user import get_user, user_cache
+from src.database.database import Base, User, get_db
+from src.services.schedule.client import schedule_api
+
+DATABASE_PATH = "./tests/test_sber.db"
+
+
+class TestSberRouting(unittest.TestCase):
+    """Салют не хранит сцену, поэтому каждый интент разбирается от приветствия"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.engine = create_async_engine(f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=NullPool)
+        session_factory = sessionmaker(bind=cls.engine, class_=AsyncSession, expire_on_commit=False)
+
+        cls.api = ScheduleApiStandIn(groups=10)
+        cls.base_url = schedule_api.base_url
+        schedule_api.base_url = cls.api.start_in_thread()
+        cls.group = cls.api.groups[0]
+
+        async def init_db():
+            async with cls.engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+
+            async with session_factory() as db:
+                db.add(User(user_id="SBER_RETURNING", group=cls.group, platform="SBER"))
+                await db.commit()
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        cls.session_factory = session_factory
+        asyncio.run(init_db())
+        user_cache.clear()
+
+        cls.previous_get_db = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = override_get_db
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls.previous_get_db is not None:
+            app.dependency_overrides[get_db] = cls.previous_get_db
+        else:
+            app.dependency_overrides.pop(get_db, None)
+
+        schedule_api.base_url = cls.base_url
+        cls.api.stop_thread()
+        asyncio.run(cls.engine.dispose())
+        os.remove(DATABASE_PATH)
+
+    def send(self, user_id: str, step: Step, intent: str = None) -> str:
+        conversation = Conversation('sber', user_id, self.group, True, (step,))
+        body = sber_payload(conversation, 1, step, {})
+        if intent is not None:
+            body['payload']['intent'] = intent
+
+        response = self.client.post('/api/v1/sber', json=body)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['payload']['intent']
+
+    def stored_group(self, user_id: str) -> str:
+        async def read():
+            user_cache.clear()
+            async with self.session_factory() as db:
+                return (await get_user(user_id, "SBER", db)).group
+
+        return asyncio.run(read())
+
+    def test_run_app_greets(self):
+        self.assertEqual(self.send("SBER_RETURNING", Step(WELCOME, ''), intents.RUN_APP), 'WelcomeDefault')
+        self.assertEqual(self.send("SBER_NEW", Step(WELCOME, '')), 'Welcome')
+
+    def test_schedule_intents(self):
+        for step in (schedule_step('schedule_count', 0), schedule_step('schedule_list', 'Monday')):
+            with self.subTest(step=step.name):
+                self.assertEqual(self.send("SBER_RETURNING", step), 'Schedule')
+
+    def test_help_intent(self):
+        self.assertEqual(self.send("SBER_RETURNING", Step(HELP, 'помощь')), 'Helper')
+
+    def test_group_intents(self):
+        self.assertEqual(self.send("SBER_GROUP", Step(WELCOME, ''), intents.RUN_APP), 'Welcome')
+        self.assertEqual(self.send("SBER_GROUP", Step(GROUP_SET, 'икбо - 01 - 20')), 'GroupManager')
+        self.assertEqual(self.send("SBER_GROUP", Step(GROUP_CONFIRM, 'да')), 'GroupManager')
+        self.assertEqual(self.stored_group("SBER_GROUP"), 'ИКБО-01-20')
+
+    def test_confirm_without_named_group_keeps_saved_group(self):
+        self.assertEqual(self.send("SBER_RETURNING", Step(GROUP_CONFIRM, 'да')), 'GroupManager')
+        self.assertEqual(self.stored_group("SBER_RETURNING"), self.group)
+
+
+sys.path.append(".")
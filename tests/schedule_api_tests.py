@@ -0,0 +1,100 @@
+import asyncio
+import random
+import unittest
+import sys
+
+from aiohttp import ClientSession, ClientTimeout
+
+from loadtest.schedule_api import Faults, Latency, ScheduleApiStandIn, make_schedule
+from src.services.schedule.client import ScheduleApiClient
+from src.utils.cache_utils import TTLCache
+
+GROUP = 'ИКБО-01-20'
+
+
+async def fetch(stand_in: ScheduleApiStandIn, paths: list[str], timeout: float = 5) -> list[tuple[int, bytes]]:
+    url = await stand_in.start()
+
+    try:
+        async with ClientSession(timeout=ClientTimeout(total=timeout)) as session:
+            results = []
+            for path in paths:
+                async with session.get(f'{url}/{path}') as response:
+                    results.append((response.status, await response.read()))
+            return results
+    finally:
+        await stand_in.stop()
+
+
+class TestLatency(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(str(Latency.parse('')), 'fixed:0')
+        self.assertEqual(str(Latency.parse('50')), 'fixed:50')
+        self.assertEqual(str(Latency.parse('lognormal:40:0.6')), 'lognormal:40:0.6')
+        self.assertRaises(ValueError, Latency.parse, 'pareto:1')
+
+    def test_sample(self):
+        rng = random.Random(1)
+
+        self.assertEqual(Latency.parse('fixed:50').sample(rng), 0.05)
+        for _ in range(100):
+            self.assertTrue(0.01 <= Latency.parse('uniform:10:20').sample(rng) <= 0.02)
+            self.assertGreaterEqual(Latency.parse('normal:1:50').sample(rng), 0)
+
+
+class TestScheduleApiStandIn(unittest.TestCase):
+
+    def test_serves_groups_and_schedules(self):
+        stand_in = ScheduleApiStandIn(groups=20)
+        results = asyncio.run(fetch(stand_in, ['groups', f'{GROUP}/full_schedule', 'НЕТ-00-00/full_schedule']))
+
+        self.assertEqual(results[0][0], 200)
+        self.assertIn(GROUP, results[0][1].decode())
+        self.assertEqual(results[1][0], 200)
+        self.assertEqual(results[2][0], 404)
+
+    def test_faults_are_reproducible(self):
+        faults = Faults(error_rate=0.5, seed=3)
+        paths = ['groups'] * 20
+
+        first = [status for status, _ in asyncio.run(fetch(ScheduleApiStandIn(5, faults=faults), paths))]
+        second = [status for status, _ in asyncio.run(fetch(ScheduleApiStandIn(5, faults=faults), paths))]
+
+        self.assertEqual(first, second)
+        self.assertEqual(set(first), {200, 500})
+
+    def test_slow_drip(self):
+        stand_in = ScheduleApiStandIn(5, faults=Faults(drip_rate=1, drip_chunk=100, drip_delay=0.001))
+        status, body = asyncio.run(fetch(stand_in, [f'{GROUP}/full_schedule']))[0]
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body, stand_in.body(GROUP)[0])
+        self.assertEqual(stand_in.stats['dripped'], 1)
+
+    def test_timeout(self):
+        stand_in = ScheduleApiStandIn(5, faults=Faults(timeout_rate=1, timeout=0.5))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(fetch(stand_in, ['groups'], timeout=0.1))
+        self.assertEqual(stand_in.stats['timeouts'], 1)
+
+    def test_client_coalesces_slow_upstream(self):
+        stand_in = ScheduleApiStandIn(5, faults=Faults(latency=Latency('fixed', 50)))
+
+        async def run():
+            client = ScheduleApiClient(await stand_in.start(), TTLCache(maxsize=10, ttl=60))
+            try:
+                async with ClientSession() as session:
+                    return await asyncio.gather(*(client.get_schedule(session, GROUP) for _ in range(10)))
+            finally:
+                await stand_in.stop()
+
+        timetables = asyncio.run(run())
+
+        self.assertEqual(len({id(timetable) for timetable in timetables}), 1)
+        self.assertEqual(stand_in.stats['requests'], 1)
+        self.assertEqual(make_schedule(GROUP)['group'], GROUP)
+
+
+sys.path.append(".")
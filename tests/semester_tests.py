@@ -0,0 +1,48 @@
+import datetime
+import unittest
+import sys
+
+from src.services.schedule.semester import SemesterCalendar
+
+
+class SemesterCalendarTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calendar = SemesterCalendar('09-01', '02-09', holidays=['11-04', '2024-12-31'])
+
+    def test_week_numbers(self):
+        # 1 сентября 2024 - воскресенье, первая неделя начинается с понедельника 26 августа
+        self.assertEqual(self.calendar.week(datetime.date(2024, 9, 1)), 1)
+        self.assertEqual(self.calendar.week(datetime.date(2024, 9, 2)), 2)
+        self.assertEqual(self.calendar.day(datetime.date(2024, 9, 2)).parity, 'even')
+        self.assertEqual(self.calendar.week(datetime.date(2025, 2, 9)), 1)
+        self.assertEqual(self.calendar.day(datetime.date(2025, 2, 9)).parity, 'odd')
+        self.assertEqual(self.calendar.week(datetime.date(2025, 2, 10)), 2)
+
+    def test_holidays(self):
+        self.assertTrue(self.calendar.day(datetime.date(2024, 11, 4)).holiday)
+        self.assertTrue(self.calendar.day(datetime.date(2025, 11, 4)).holiday)
+        self.assertTrue(self.calendar.day(datetime.date(2024, 12, 31)).holiday)
+        self.assertFalse(self.calendar.day(datetime.date(2025, 12, 31)).holiday)
+
+    def test_session_after_study_weeks(self):
+        self.assertFalse(self.calendar.day(datetime.date(2024, 12, 20)).session)
+        self.assertTrue(self.calendar.day(datetime.date(2025, 1, 15)).session)
+
+    def test_semester_bounds(self):
+        self.assertEqual(
+            self.calendar.semester_bounds(datetime.date(2025, 1, 15)),
+            (datetime.date(2024, 9, 1), datetime.date(2025, 2, 9)),
+        )
+        self.assertEqual(
+            self.calendar.semester_bounds(datetime.date(2025, 6, 30)),
+            (datetime.date(2025, 2, 9), datetime.date(2025, 9, 1)),
+        )
+
+    def test_accepts_datetime(self):
+        moscow = datetime.timezone(datetime.timedelta(hours=3))
+        now = datetime.datetime(2024, 9, 2, 23, 30, tzinfo=moscow)
+        self.assertEqual(self.calendar.day(now).date, datetime.date(2024, 9, 2))
+
+
+sys.path.append(".")
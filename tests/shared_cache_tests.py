@@ -0,0 +1,175 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+import sys
+
+from src.services.schedule.client import ScheduleApiClient, UpstreamResponse
+from src.services.schedule.shared import MmapCache, RedisCache
+from src.utils.cache_utils import TTLCache
+
+
+class FakeRedisServer:
+    """Сервер протокола Redis в памяти: GET, SET с PX и PING"""
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                count = int((await reader.readline())[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+
+                writer.write(self.execute(args))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ValueError, ConnectionError):
+            writer.close()
+
+    def execute(self, args):
+        command = args[0].upper()
+
+        if command == b'PING':
+            return b'+PONG\r\n'
+        if command == b'SET':
+            expires_at = time.time() + int(args[4]) / 1000 if len(args) > 4 else None
+            self.data[args[1]] = (args[2], expires_at)
+            return b'+OK\r\n'
+        if command == b'GET':
+            value, expires_at = self.data.get(args[1], (None, None))
+            if value is None or (expires_at is not None and expires_at <= time.time()):
+                return b'$-1\r\n'
+            return b'$%d\r\n%s\r\n' % (len(value), value)
+
+        return b'-ERR unknown command\r\n'
+
+
+class FakeScheduleApi(ScheduleApiClient):
+
+    def __init__(self, shared) -> None:
+        super().__init__("http://schedule.test", TTLCache(maxsize=10, ttl=60, stale_ttl=600), shared=shared)
+        self.calls = 0
+
+    async def _fetch(self, session, path, headers=None):
+        self.calls += 1
+        return UpstreamResponse(200, '{"schedule": {"1": {"lessons": [[{"name": "Физика", "types": "лк", "weeks": []}]]}}}'.encode())
+
+
+class TestMmapCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def make_cache(self) -> MmapCache:
+        return MmapCache(self.path, slots=8, slot_size=256)
+
+    def test_workers_share_values(self):
+        first, second = self.make_cache(), self.make_cache()
+
+        async def scenario():
+            await first.set("ИКБО-01-20", b"schedule", ttl=60)
+            return await second.get("ИКБО-01-20"), await second.get("ИКБО-02-20")
+
+        self.assertEqual(asyncio.run(scenario()), (b"schedule", None))
+        self.assertEqual(second.stats['hits'], 1)
+        self.assertEqual(second.stats['misses'], 1)
+
+    def test_expiration_and_overwrite(self):
+        cache = self.make_cache()
+
+        async def scenario():
+            await cache.set("a", b"old", ttl=60)
+            await cache.set("a", b"new", ttl=60)
+            await cache.set("b", b"gone", ttl=-1)
+            return await cache.get("a"), await cache.get("b")
+
+        self.assertEqual(asyncio.run(scenario()), (b"new", None))
+
+    def test_concurrent_writers_keep_their_slots(self):
+        # Четыре слота и четыре пробы: все ключи претендуют на одни и те же слоты
+        caches = [MmapCache(self.path, slots=4, slot_size=256) for _ in range(2)]
+        keys = ["ИКБО-01-20", "ИКБО-02-20", "ИКБО-03-20", "ИКБО-04-20"]
+
+        async def scenario():
+            await asyncio.gather(*(caches[index % 2].set(key, key.encode(), ttl=60) for index, key in enumerate(keys)))
+            return [await caches[0].get(key) for key in keys]
+
+        self.assertEqual(asyncio.run(scenario()), [key.encode() for key in keys])
+
+    def test_too_large_value_is_skipped(self):
+        cache = self.make_cache()
+
+        asyncio.run(cache.set("a", b"x" * 1024, ttl=60))
+
+        self.assertEqual(cache.stats['too_large'], 1)
+        self.assertIsNone(asyncio.run(cache.get("a")))
+
+
+class TestRedisCache(unittest.TestCase):
+
+    def test_get_and_set(self):
+        async def scenario():
+            server = FakeRedisServer()
+            cache = RedisCache(f'redis://127.0.0.1:{await server.start()}/0', timeout=1)
+
+            await cache.set("ИКБО-01-20", b"schedule", ttl=60)
+            result = await cache.get("ИКБО-01-20"), await cache.get("ИКБО-02-20")
+
+            await cache.close()
+            await server.stop()
+            return result, cache
+
+        result, cache = asyncio.run(scenario())
+
+        self.assertEqual(result, (b"schedule", None))
+        self.assertEqual(cache.stats['backend'], 'redis')
+        self.assertEqual(cache.stats['hits'], 1)
+
+    def test_unavailable_server_is_a_miss(self):
+        cache = RedisCache('redis://127.0.0.1:1/0', timeout=0.5)
+
+        self.assertIsNone(asyncio.run(cache.get("ИКБО-01-20")))
+        self.assertEqual(cache.stats['errors'], 1)
+
+    def test_second_worker_skips_upstream(self):
+        async def scenario():
+            server = FakeRedisServer()
+            url = f'redis://127.0.0.1:{await server.start()}/0'
+            first, second = FakeScheduleApi(RedisCache(url, timeout=1)), FakeScheduleApi(RedisCache(url, timeout=1))
+
+            await first.get_schedule(None, "ИКБО-01-20")
+            await asyncio.sleep(0.05)
+            schedule = await second.get_schedule(None, "ИКБО-01-20")
+
+            await first.shared.close()
+            await second.shared.close()
+            await server.stop()
+            return first, second, schedule
+
+        first, second, schedule = asyncio.run(scenario())
+
+        self.assertEqual((first.calls, second.calls), (1, 0))
+        self.assertEqual(schedule.count("1", 1), 1)
+        self.assertIn("ИКБО-01-20", second.cache)
+        self.assertIsNotNone(schedule.content_hash)
+        self.assertEqual(schedule.content_hash, first.cache.get("ИКБО-01-20").content_hash)
+
+
+sys.path.append(".")
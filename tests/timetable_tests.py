@@ -0,0 +1,60 @@
+import unittest
+import sys
+
+from src.services.schedule.timetable import Timetable
+
+SCHEDULE = {
+    "schedule": {
+        "1": {
+            "lessons": [
+                [
+                    {"name": "Математический анализ", "types": "лк", "weeks": [1, 3, 5, 7]},
+                    {"name": "Физика", "types": "пр", "weeks": [2, 4, 6, 8]},
+                ],
+                [],
+                [
+                    {"name": "Программирование", "types": "лаб", "weeks": [3, 7]},
+                ],
+            ]
+        },
+        "2": {
+            "lessons": [
+                [
+                    {"name": "Английский язык", "types": "пр", "weeks": []},
+                ],
+            ]
+        },
+    }
+}
+
+
+class TestTimetable(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.timetable = Timetable("ИКБО-01-20", SCHEDULE)
+
+    def test_count_by_week(self):
+        self.assertEqual(self.timetable.count("1", 1), 1)
+        self.assertEqual(self.timetable.count("1", 3), 2)
+        self.assertEqual(self.timetable.count("1", 9), 0)
+        self.assertEqual(self.timetable.count("2", 12), 1)
+        self.assertEqual(self.timetable.count("6", 1), 0)
+
+    def test_lessons_by_week(self):
+        lessons = self.timetable.lessons("1", 7)
+        self.assertEqual([lesson.number for lesson in lessons], [1, 3])
+        self.assertEqual(lessons[0].name, "Математический анализ")
+        self.assertEqual(self.timetable.lessons("1", 4)[0].name, "Физика")
+
+    def test_parity(self):
+        timetable = Timetable("ИКБО-01-20", {"schedule": {"3": {"lessons": [[
+            {"name": "Физика", "types": "лк", "weeks": list(range(1, 19, 2))},
+            {"name": "Химия", "types": "лк", "weeks": list(range(2, 19, 2))},
+        ]]}}})
+
+        self.assertEqual(timetable.lessons("3", 1)[0].parity, "odd")
+        self.assertEqual(timetable.lessons("3", 2)[0].parity, "even")
+        self.assertEqual(self.timetable.lessons("1", 3)[1].parity, "explicit")
+
+
+sys.path.append(".")
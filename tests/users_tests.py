@@ -0,0 +1,133 @@
+import asyncio
+import os
+import unittest
+import sys
+import tempfile
+
+from types import SimpleNamespace
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.crud import user as crud_user
+from src.crud.user import UserProfile, create_user, get_or_create_user, get_user, upsert_user, invalidate_user, user_cache
+from src.database.database import Base, User
+from src.database.migrate import upgrade_schema
+from src.services.schedule.shared import MmapCache
+
+DATABASE_PATH = "./tests/test_users.db"
+
+
+class TestUserCrud(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=NullPool)
+        self.session_factory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        user_cache.clear()
+
+        async def create_tables():
+            async with self.engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+
+        asyncio.run(create_tables())
+
+    def tearDown(self) -> None:
+        asyncio.run(self.engine.dispose())
+        os.remove(DATABASE_PATH)
+
+    def run_with_db(self, func):
+        async def runner():
+            async with self.session_factory() as db:
+                return await func(db)
+
+        return asyncio.run(runner())
+
+    def test_get_or_create_user(self):
+        user = {"user_id": "TEST_CRUD", "group": "", "platform": "YANDEX"}
+
+        _, created = self.run_with_db(lambda db: get_or_create_user(user, db))
+        self.assertTrue(created)
+
+        profile, created = self.run_with_db(lambda db: get_or_create_user(user, db))
+        self.assertFalse(created)
+        self.assertEqual(profile.group, "")
+
+        self.assertFalse(self.run_with_db(lambda db: create_user(user, db)))
+
+    def test_upgrade_schema_is_idempotent(self):
+        async def upgrade_twice():
+            for _ in range(2):
+                async with self.engine.begin() as connection:
+                    await upgrade_schema(connection)
+
+        asyncio.run(upgrade_twice())
+
+        user = {"user_id": "TEST_SCHEMA", "group": "", "platform": "YANDEX"}
+        self.assertTrue(self.run_with_db(lambda db: create_user(user, db)))
+        self.assertFalse(self.run_with_db(lambda db: create_user(user, db)))
+
+    def test_write_through_cache(self):
+        user = {"user_id": "TEST_CACHE", "group": "ИКБО-01-20", "platform": "VK"}
+        self.run_with_db(lambda db: upsert_user(user, db))
+
+        hits = user_cache.hits
+        profile = self.run_with_db(lambda db: get_user("TEST_CACHE", "VK", db))
+        self.assertEqual(profile.group, "ИКБО-01-20")
+        self.assertEqual(user_cache.hits, hits + 1)
+
+        self.run_with_db(lambda db: upsert_user({**user, "group": "ИКБО-02-20"}, db))
+        self.assertEqual(self.run_with_db(lambda db: get_user("TEST_CACHE", "VK", db)).group, "ИКБО-02-20")
+
+        invalidate_user("TEST_CACHE", "VK")
+        self.assertEqual(self.run_with_db(lambda db: get_user("TEST_CACHE", "VK", db)).group, "ИКБО-02-20")
+        self.assertIsNone(self.run_with_db(lambda db: get_user("TEST_CACHE", "YANDEX", db)))
+
+    def test_group_change_on_another_worker(self):
+        directory = tempfile.TemporaryDirectory()
+        previous = crud_user.user_versions
+        crud_user.user_versions = MmapCache(f"{directory.name}/cache", slots=16, slot_size=256)
+
+        user = {"user_id": "TEST_VERSION", "group": "ИКБО-01-20", "platform": "VK"}
+
+        async def other_worker_changes_group(db):
+            # Другой воркер меняет группу в базе и версию в общем кэше, но не в кэше этого воркера
+            await db.execute(update(User).where(User.user_id == "TEST_VERSION").values(group="ИКБО-02-20"))
+            await db.commit()
+            await crud_user.user_versions.set("user:VK:TEST_VERSION", b"other", ttl=60)
+
+        try:
+            self.run_with_db(lambda db: upsert_user(user, db))
+            self.assertEqual(self.run_with_db(lambda db: get_user("TEST_VERSION", "VK", db)).group, "ИКБО-01-20")
+
+            self.run_with_db(other_worker_changes_group)
+            self.assertEqual(self.run_with_db(lambda db: get_user("TEST_VERSION", "VK", db)).group, "ИКБО-02-20")
+        finally:
+            asyncio.run(crud_user.user_versions.close())
+            crud_user.user_versions = previous
+            directory.cleanup()
+
+    def test_get_or_create_user_lost_insert_race(self):
+        class LosingPostgresSession:
+            """Первый запрос не видит строку, вставленную одновременно другой транзакцией"""
+            bind = SimpleNamespace(dialect=SimpleNamespace(name='postgresql'))
+
+            def __init__(self) -> None:
+                self.rows = [None, UserProfile("TEST_RACE", "ИКБО-01-20", "SBER")]
+
+            async def execute(self, statement):
+                return SimpleNamespace(first=lambda row=self.rows.pop(0): row)
+
+            async def commit(self):
+                pass
+
+        user = {"user_id": "TEST_RACE", "group": "", "platform": "SBER"}
+        profile, created = asyncio.run(get_or_create_user(user, LosingPostgresSession()))
+
+        self.assertFalse(created)
+        self.assertEqual(profile.group, "ИКБО-01-20")
+
+
+sys.path.append(".")